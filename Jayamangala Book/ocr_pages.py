@@ -9,6 +9,7 @@ import os
 import sys
 import json
 import time
+import socket
 from pathlib import Path
 from datetime import datetime
 
@@ -21,14 +22,22 @@ except ImportError as e:
     print("  pip3 install google-generativeai pillow")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from ocr_quality import score_text, load_lexicon, STRONG_MODELS
+from ocr_queue import OcrQueue, DEFAULT_LEASE
+from batch_write import atomic_write
+import instrument
+
 
 class PageOCR:
     """OCR processor for individual pages"""
 
-    def __init__(self, api_key, model="gemini-2.5-flash"):
+    def __init__(self, api_key, model="gemini-2.5-flash", strong_model=None):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model)
         self.model_name = model
+        self.strong_model = genai.GenerativeModel(strong_model) if strong_model else None
+        self.strong_model_name = strong_model
 
     def create_prompt(self, typeface=None, context=None):
         """Create OCR prompt"""
@@ -52,14 +61,20 @@ This is a Sanskrit text in Devanagari script. Please:
         prompt += "\n\nReturn ONLY the extracted text, nothing else."
         return prompt
 
-    def ocr_image(self, image_path, typeface=None, context=None, retry_count=3):
-        """Perform OCR on single image"""
-        image = Image.open(image_path)
+    def ocr_image(self, image_path, typeface=None, context=None, retry_count=3, strong=False):
+        """Perform OCR on single image (with the strong model if strong=True)"""
+        with instrument.span('read', file=Path(image_path).name):
+            image = Image.open(image_path)
+            image.load()
         prompt = self.create_prompt(typeface, context)
+        model = self.strong_model if strong else self.model
+        model_name = self.strong_model_name if strong else self.model_name
 
         for attempt in range(retry_count):
             try:
-                response = self.model.generate_content([prompt, image])
+                instrument.count(f'api_calls.{model_name}')
+                with instrument.span('network', model=model_name, attempt=attempt + 1):
+                    response = model.generate_content([prompt, image])
 
                 if not response.text:
                     return {
@@ -70,20 +85,23 @@ This is a Sanskrit text in Devanagari script. Please:
 
                 return {
                     'text': response.text.strip(),
-                    'model': self.model_name,
+                    'model': model_name,
                     'success': True,
                     'attempt': attempt + 1
                 }
 
             except Exception as e:
                 error_str = str(e)
+                instrument.count('api_errors')
 
                 # Check for rate limit
                 if '429' in error_str or 'quota' in error_str.lower():
                     if attempt < retry_count - 1:
                         wait_time = 60  # Wait 1 minute for rate limit
                         print(f"  ⚠️  Rate limit hit. Waiting {wait_time}s...")
-                        time.sleep(wait_time)
+                        instrument.count('rate_limits')
+                        with instrument.span('sleep', reason='rate_limit'):
+                            time.sleep(wait_time)
                         continue
                     else:
                         return {
@@ -97,7 +115,8 @@ This is a Sanskrit text in Devanagari script. Please:
                     wait_time = 2 ** attempt
                     print(f"  ⚠️  Attempt {attempt + 1} failed: {e}")
                     print(f"  Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+                    with instrument.span('sleep', reason='retry'):
+                        time.sleep(wait_time)
                 else:
                     return {
                         'text': '',
@@ -109,7 +128,8 @@ This is a Sanskrit text in Devanagari script. Please:
 
 
 def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
-                  typeface=None, context=None, model="gemini-2.5-flash", delay=4):
+                  typeface=None, context=None, model="gemini-2.5-flash", delay=4,
+                  strong_model=None, threshold=0.8, lexicon=None):
     """
     Process page images with OCR
 
@@ -123,6 +143,9 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
         context: Context about text (optional)
         model: Gemini model to use
         delay: Delay between requests in seconds (default 4)
+        strong_model: Model for re-OCRing low-confidence pages (optional)
+        threshold: Quality score below which a page is re-OCRed (default 0.8)
+        lexicon: Word-list files/directories for the out-of-lexicon signal (optional)
     """
     images_dir = Path(images_dir)
     text_dir = Path(text_dir)
@@ -151,16 +174,22 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
     print(f"📁 Images: {images_dir}")
     print(f"📁 Output: {text_dir}")
     print(f"🔍 Model: {model}")
+    if strong_model:
+        print(f"🔁 Strong model: {strong_model} (pages scoring below {threshold})")
     print(f"📄 Pages to process: {len(page_files)}")
     print(f"⏱️  Delay between requests: {delay}s")
     print()
 
     # Initialize OCR
-    ocr = PageOCR(api_key, model)
+    ocr = PageOCR(api_key, model, strong_model)
+    lexicon_words = load_lexicon(lexicon) if lexicon else None
 
     # Track progress
     successful = 0
     failed = []
+    quality = {}
+    weak = []
+    rate_limited = False
 
     # Process each page
     for i, page_file in enumerate(page_files, start=1):
@@ -180,13 +209,19 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
 
         if result['success']:
             # Save text file with just the text content, no extra formatting
-            with open(txt_file, 'w', encoding='utf-8') as f:
+            with instrument.span('write', file=txt_file.name), open(txt_file, 'w', encoding='utf-8') as f:
                 f.write(result['text'])
 
             char_count = len(result['text'])
-            print(f"✅ {char_count} characters")
+            with instrument.span('score'):
+                page_quality = score_text(result['text'], lexicon_words, str(page_file))
+            quality[page_num] = {'score': page_quality['score'], 'model': model}
+            print(f"✅ {char_count} characters (score {page_quality['score']:.2f})")
             successful += 1
 
+            if strong_model and page_quality['score'] < threshold:
+                weak.append((page_num, page_file, txt_file))
+
         else:
             print(f"❌ {result.get('error', 'Unknown error')}")
             failed.append({
@@ -200,11 +235,48 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
                 print()
                 print("⚠️  Rate limit reached. Stopping here.")
                 print("You can resume later by running the same command.")
+                rate_limited = True
                 break
 
         # Delay to respect rate limits
         if i < len(page_files):
-            time.sleep(delay)
+            with instrument.span('sleep', reason='delay'):
+                time.sleep(delay)
+
+    # Second tier: re-OCR only the low-confidence pages with the strong model
+    escalated = 0
+    if weak and not rate_limited:
+        print()
+        print(f"🔁 Re-running {len(weak)} low-confidence page(s) with {strong_model}")
+        print()
+
+        for i, (page_num, page_file, txt_file) in enumerate(weak, start=1):
+            print(f"Page {page_num} ({i}/{len(weak)}): ", end='', flush=True)
+            with instrument.span('sleep', reason='delay'):
+                time.sleep(delay)
+
+            result = ocr.ocr_image(str(page_file), typeface, context, strong=True)
+
+            if not result['success']:
+                print(f"❌ {result.get('error', 'Unknown error')} (keeping {model} text)")
+                if result.get('retry_later'):
+                    break
+                continue
+
+            with instrument.span('score'):
+                page_quality = score_text(result['text'], lexicon_words, str(page_file))
+            first_score = quality[page_num]['score']
+
+            with instrument.span('write', file=txt_file.name), open(txt_file, 'w', encoding='utf-8') as f:
+                f.write(result['text'])
+
+            quality[page_num] = {
+                'score': page_quality['score'],
+                'model': strong_model,
+                'first_pass_score': first_score
+            }
+            escalated += 1
+            print(f"✅ score {first_score:.2f} → {page_quality['score']:.2f}")
 
     # Summary
     print()
@@ -215,6 +287,8 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
     print(f"📊 Summary:")
     print(f"  • Successful: {successful}/{len(page_files)}")
     print(f"  • Failed: {len(failed)}")
+    if strong_model:
+        print(f"  • Re-OCRed with {strong_model}: {escalated}/{len(weak)}")
     print(f"  • Text files: {text_dir}")
     print()
 
@@ -231,7 +305,10 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
         'model': model,
         'total_pages': len(page_files),
         'successful': successful,
-        'failed': failed
+        'failed': failed,
+        'strong_model': strong_model,
+        'threshold': threshold if strong_model else None,
+        'quality': {str(page): item for page, item in quality.items()}
     }
 
     with open(log_file, 'w', encoding='utf-8') as f:
@@ -241,6 +318,145 @@ def process_pages(images_dir, text_dir, api_key, start_page=None, end_page=None,
     print()
 
 
+def process_queue(queue_path, worker, api_key=None, typeface=None, context=None,
+                  model="gemini-2.5-flash", delay=4, strong_model=None, threshold=0.8,
+                  lexicon=None, lease_seconds=DEFAULT_LEASE):
+    """
+    Work through pages of a shared queue (see tools/ocr_queue.py)
+
+    Any number of workers, on this or other machines sharing the files, can
+    run this at once; each page is leased to one worker at a time. The
+    worker's API key and model come from its queue assignment when it has
+    one. Low-confidence pages are re-OCRed with the strong model right away,
+    since no single worker sees the whole book.
+
+    Args:
+        queue_path: Queue database made with 'ocr_queue.py init'
+        worker: This worker's name
+        api_key: Gemini API key, unless the worker is assigned one
+        lease_seconds: Time a page may be held before another worker takes it
+        (other arguments as for process_pages)
+    """
+    queue = OcrQueue(queue_path, lease_seconds=lease_seconds)
+    try:
+        api_key, model = queue.credentials(worker, api_key, model)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return
+    if not api_key:
+        print(f"❌ No API key: pass --api-key or assign one with "
+              f"'ocr_queue.py {queue_path} assign {worker} --key-env VAR'")
+        return
+    if strong_model == model:
+        print(f"⚠️  Worker is assigned {model}, the same as --strong-model; not escalating")
+        strong_model = None
+
+    print("━" * 80)
+    print(f"Sanskrit OCR with Google Gemini (queue worker {worker})")
+    print("━" * 80)
+    print()
+    print(f"📋 Queue: {queue_path} ({queue.remaining()} page(s) left)")
+    print(f"🔍 Model: {model}")
+    if strong_model:
+        print(f"🔁 Strong model: {strong_model} (pages scoring below {threshold})")
+    print()
+
+    ocr = PageOCR(api_key, model, strong_model)
+    lexicon_words = load_lexicon(lexicon) if lexicon else None
+    successful = 0
+    failed = 0
+    lost = 0
+
+    try:
+        while True:
+            jobs = queue.lease(worker)
+            if not jobs:
+                break
+            job = jobs[0]
+            page_num, page_file, txt_file = job['page'], job['source'], Path(job['output'])
+
+            # Done by an earlier run without the queue
+            if txt_file.exists():
+                print(f"Page {page_num}: ⏭️  Already exists, skipping")
+                queue.complete(worker, page_num)
+                continue
+
+            print(f"Page {page_num} (attempt {job['attempts']}): ", end='', flush=True)
+            result = ocr.ocr_image(page_file, typeface, context)
+
+            if not result['success']:
+                print(f"❌ {result.get('error', 'Unknown error')}")
+                if result.get('retry_later'):
+                    queue.release(worker, page_num)
+                    print()
+                    print("⚠️  Rate limit reached. Stopping this worker; the page is back in the queue.")
+                    break
+                if queue.fail(worker, page_num, result.get('error') or 'Unknown error') == 'failed':
+                    failed += 1
+                continue
+
+            with instrument.span('score'):
+                score = score_text(result['text'], lexicon_words, page_file)['score']
+            text, used_model, first_score = result['text'], model, None
+
+            if strong_model and score < threshold and queue.renew(worker, page_num):
+                print(f"score {score:.2f}, re-running with {strong_model}... ", end='', flush=True)
+                with instrument.span('sleep', reason='delay'):
+                    time.sleep(delay)
+                strong = ocr.ocr_image(page_file, typeface, context, strong=True)
+                if strong['success']:
+                    with instrument.span('score'):
+                        strong_score = score_text(strong['text'], lexicon_words, page_file)['score']
+                    text, used_model, first_score, score = strong['text'], strong_model, score, strong_score
+
+            txt_file.parent.mkdir(parents=True, exist_ok=True)
+            with instrument.span('write', file=txt_file.name):
+                atomic_write(txt_file, text)
+            if not queue.complete(worker, page_num, used_model, score, first_score):
+                print(f"⚠️  lease expired; page {page_num} was taken over by another worker")
+                lost += 1
+                continue
+            successful += 1
+            print(f"✅ {len(text)} characters (score {score:.2f}, {used_model})")
+
+            with instrument.span('sleep', reason='delay'):
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted; returning leased pages to the queue")
+    finally:
+        queue.release(worker)
+        write_queue_log(queue)
+        queue.close()
+
+    print()
+    print("━" * 80)
+    print(f"✅ Worker {worker} finished: {successful} page(s) done, {failed} failed")
+    if lost:
+        print(f"⚠️  {lost} page(s) were taken over after the lease expired (try a longer --lease)")
+    print("━" * 80)
+    print(f"Progress of all workers: python3 tools/ocr_queue.py {queue_path} status")
+
+
+def write_queue_log(queue):
+    """Rewrite ocr_log.json in each text directory of the queue from its done pages"""
+    jobs = queue.jobs()
+    quality = queue.quality_log()
+    for text_dir in sorted({Path(job['output']).parent for job in jobs}):
+        if not text_dir.is_dir():
+            continue
+        pages = {str(job['page']) for job in jobs if Path(job['output']).parent == text_dir}
+        log_data = {
+            'timestamp': datetime.now().isoformat(),
+            'queue': str(queue.path),
+            'total_pages': len(pages),
+            'successful': sum(1 for job in jobs if job['state'] == 'done' and str(job['page']) in pages),
+            'failed': [{'page': job['page'], 'file': job['source'], 'error': job['error']}
+                       for job in jobs if job['state'] == 'failed' and str(job['page']) in pages],
+            'quality': {page: item for page, item in quality.items() if page in pages}
+        }
+        atomic_write(text_dir / 'ocr_log.json', json.dumps(log_data, ensure_ascii=False, indent=2))
+
+
 def main():
     import argparse
 
@@ -262,12 +478,20 @@ Examples:
   python ocr_pages.py --api-key YOUR_API_KEY \\
       --typeface "Clear Devanagari print"
 
+  # Two-tier: flash for every page, pro only for low-confidence pages
+  python ocr_pages.py --api-key YOUR_API_KEY \\
+      --strong-model gemini-2.5-pro --lexicon ../Data/SoubhagyaBhaskara
+
+  # Several workers (any machines sharing these folders) on one queue
+  python ../tools/ocr_queue.py ../ocr.sqlite init --images-dir . --text-dir "../Jayamangala Text"
+  python ocr_pages.py --queue ../ocr.sqlite --worker laptop --api-key YOUR_API_KEY
+
 API Key: Get from https://aistudio.google.com/apikey
         '''
     )
 
-    parser.add_argument('--api-key', required=True,
-                       help='Google AI Studio API key')
+    parser.add_argument('--api-key',
+                       help='Google AI Studio API key (optional with --queue if the worker is assigned one)')
     parser.add_argument('--images-dir', default='.',
                        help='Directory with page images (default: current dir)')
     parser.add_argument('--text-dir', default='../Jayamangala Text',
@@ -285,20 +509,59 @@ API Key: Get from https://aistudio.google.com/apikey
                        help='Context about the text')
     parser.add_argument('--delay', type=int, default=4,
                        help='Delay between requests in seconds (default: 4)')
+    parser.add_argument('--strong-model', choices=STRONG_MODELS,
+                       help='Re-OCR low-confidence pages with this model (e.g. gemini-2.5-pro)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                       help='Quality score below which pages go to --strong-model (default: 0.8)')
+    parser.add_argument('--lexicon', nargs='+',
+                       help='Word lists or text directories for the out-of-lexicon check '
+                            '(e.g. ../Data/SoubhagyaBhaskara)')
+    parser.add_argument('--queue',
+                       help='Pull pages from this shared queue (tools/ocr_queue.py) instead of the images dir')
+    parser.add_argument('--worker', default=f"{socket.gethostname()}-{os.getpid()}",
+                       help='Worker name in the queue (default: host-pid)')
+    parser.add_argument('--lease', type=int, default=DEFAULT_LEASE,
+                       help=f'Seconds a leased page is held before other workers may take it (default: {DEFAULT_LEASE})')
+    instrument.add_arguments(parser)
 
     args = parser.parse_args()
 
-    process_pages(
-        images_dir=args.images_dir,
-        text_dir=args.text_dir,
-        api_key=args.api_key,
-        start_page=args.start_page,
-        end_page=args.end_page,
-        typeface=args.typeface,
-        context=args.context,
-        model=args.model,
-        delay=args.delay
-    )
+    if not args.api_key and not args.queue:
+        parser.error('--api-key is required (or use --queue with an assigned key)')
+    if args.strong_model == args.model:
+        parser.error('--strong-model must differ from --model')
+
+    with instrument.session(args):
+        if args.queue:
+            process_queue(
+                queue_path=args.queue,
+                worker=args.worker,
+                api_key=args.api_key,
+                typeface=args.typeface,
+                context=args.context,
+                model=args.model,
+                delay=args.delay,
+                strong_model=args.strong_model,
+                threshold=args.threshold,
+                lexicon=args.lexicon,
+                lease_seconds=args.lease
+            )
+            return
+
+        process_pages(
+            images_dir=args.images_dir,
+            text_dir=args.text_dir,
+            api_key=args.api_key,
+            start_page=args.start_page,
+            end_page=args.end_page,
+            typeface=args.typeface,
+            context=args.context,
+            model=args.model,
+            delay=args.delay,
+            strong_model=args.strong_model,
+            threshold=args.threshold,
+            lexicon=args.lexicon
+        )
 
 
 if __name__ == '__main__':
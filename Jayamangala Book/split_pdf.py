@@ -16,6 +16,9 @@ except ImportError:
     print("  pip3 install pdf2image")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+import instrument
+
 
 def split_pdf(pdf_path, output_dir=None, dpi=300):
     """
@@ -47,7 +50,8 @@ def split_pdf(pdf_path, output_dir=None, dpi=300):
 
     # Convert PDF to images
     print("Converting pages...")
-    pages = convert_from_path(str(pdf_path), dpi=dpi, fmt='png')
+    with instrument.span('transform', step='pdf_to_images'):
+        pages = convert_from_path(str(pdf_path), dpi=dpi, fmt='png')
 
     print(f"✅ Total pages: {len(pages)}")
     print()
@@ -57,11 +61,10 @@ def split_pdf(pdf_path, output_dir=None, dpi=300):
         output_filename = f"page_{i:03d}.png"
         output_path = output_dir / output_filename
 
-        page.save(output_path, 'PNG')
+        with instrument.span('write', file=output_filename):
+            page.save(output_path, 'PNG')
 
-        # Show progress every 10 pages
-        if i % 10 == 0:
-            print(f"  Saved {i}/{len(pages)} pages...")
+        instrument.progress(every=10, saved=i)
 
     print()
     print(f"✅ All {len(pages)} pages saved!")
@@ -82,7 +85,9 @@ if __name__ == '__main__':
     parser.add_argument('pdf_file', help='Path to PDF file')
     parser.add_argument('--output-dir', help='Output directory (default: script directory)')
     parser.add_argument('--dpi', type=int, default=300, help='DPI (default: 300)')
+    instrument.add_arguments(parser)
 
     args = parser.parse_args()
 
-    split_pdf(args.pdf_file, args.output_dir, args.dpi)
+    with instrument.session(args):
+        split_pdf(args.pdf_file, args.output_dir, args.dpi)
@@ -0,0 +1,86 @@
+        let allSlokas = [];
+
+        // Convert to Devanagari numerals
+        function toDevanagari(num) {
+            const devanagariDigits = ['०', '१', '२', '३', '४', '५', '६', '७', '८', '९'];
+            return String(num).split('').map(d => devanagariDigits[parseInt(d)]).join('');
+        }
+
+        // Load sloka text from file
+        async function loadSloka(num) {
+            try {
+                const paddedNum = String(num).padStart(4, '0');
+                const response = await fetch(`${paddedNum}.txt`);
+                const text = await response.text();
+                return text.trim();
+            } catch (error) {
+                console.error(`Error loading sloka ${num}:`, error);
+                return 'Error loading sloka';
+            }
+        }
+
+        // Search functionality
+        function searchSlokas(query) {
+            const searchTerm = query.toLowerCase().trim();
+            let visibleCount = 0;
+
+            allSlokas.forEach(sloka => {
+                const slokaText = sloka.text.toLowerCase();
+                const shouldShow = !searchTerm || slokaText.includes(searchTerm);
+
+                if (shouldShow) {
+                    sloka.element.classList.remove('hidden');
+                    sloka.element.classList.toggle('highlight', searchTerm && slokaText.includes(searchTerm));
+                    visibleCount++;
+                } else {
+                    sloka.element.classList.add('hidden');
+                    sloka.element.classList.remove('highlight');
+                }
+            });
+
+            const searchInfo = document.getElementById('searchInfo');
+            if (searchTerm) {
+                searchInfo.textContent = `Found ${visibleCount} sloka${visibleCount !== 1 ? 's' : ''}`;
+            } else {
+                searchInfo.textContent = `Showing all ${toDevanagari(totalSlokas)} slokas`;
+            }
+        }
+
+        // Load all slokas
+        async function loadAllSlokas() {
+            const list = document.getElementById('slokas-list');
+
+            for (let i = 1; i <= totalSlokas; i++) {
+                const slokaText = await loadSloka(i);
+
+                const item = document.createElement('a');
+                item.className = 'sloka-item';
+                item.href = `${i}/`;
+
+                item.innerHTML = `
+                    <div class="sloka-content">
+                        <div class="sloka-number">${toDevanagari(i)}</div>
+                        <div class="sloka-text">${slokaText}</div>
+                    </div>
+                `;
+
+                list.appendChild(item);
+
+                // Store sloka data for searching
+                allSlokas.push({
+                    number: i,
+                    text: slokaText,
+                    element: item
+                });
+            }
+
+            // Setup search after loading
+            const searchBox = document.getElementById('searchBox');
+            searchBox.addEventListener('input', (e) => {
+                searchSlokas(e.target.value);
+            });
+        }
+
+        // Initialize
+        loadAllSlokas();
+    
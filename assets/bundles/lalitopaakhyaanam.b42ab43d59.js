@@ -0,0 +1,57 @@
+        // Load sloka text
+        async function loadSloka() {
+            try {
+                const localSlokaFile = String(currentSlokaNumber).padStart(4, '0');
+                const response = await fetch(`../../${localSlokaFile}.txt`);
+                const text = await response.text();
+                document.getElementById('sloka-text').textContent = text.trim();
+            } catch (error) {
+                console.error('Error loading sloka:', error);
+                document.getElementById('sloka-text').textContent = 'Error loading sloka';
+            }
+        }
+
+        // Load commentary
+        async function loadCommentary() {
+            try {
+                const response = await fetch(`../../../Data/LalitopaakhyaanamTeeka/${chapterFolder}/${globalSlokaNumber}.txt`);
+                const text = await response.text();
+                const contentDiv = document.getElementById('commentary-content');
+
+                if (text.trim()) {
+                    contentDiv.innerHTML = text.trim()
+                        .split('\n\n')
+                        .map(para => `<p>${para.replace(/\n/g, '<br>')}</p>`)
+                        .join('');
+                    contentDiv.classList.remove('empty');
+                } else {
+                    contentDiv.textContent = 'टीका उपलब्धा नास्ति';
+                    contentDiv.classList.add('empty');
+                }
+            } catch (error) {
+                document.getElementById('commentary-content').textContent = 'टीका उपलब्धा नास्ति';
+                document.getElementById('commentary-content').classList.add('empty');
+            }
+        }
+
+        // Navigate between slokas of this chapter
+        function navigate(direction) {
+            const newNumber = currentSlokaNumber + direction;
+            if (newNumber >= 1 && newNumber <= totalSlokas) {
+                window.location.href = `../${newNumber}/`;
+            }
+        }
+
+        // Keyboard navigation
+        document.addEventListener('keydown', (e) => {
+            if (e.target.tagName === 'TEXTAREA' || e.target.tagName === 'INPUT') {
+                return;
+            }
+            if (e.key === 'ArrowLeft') navigate(-1);
+            if (e.key === 'ArrowRight') navigate(1);
+        });
+
+        // Initialize
+        loadSloka();
+        loadCommentary();
+    
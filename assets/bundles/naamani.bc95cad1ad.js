@@ -0,0 +1,358 @@
+        // Get number from URL path (/naamani/123/)
+        function getNumberFromURL() {
+            const pathParts = window.location.pathname.split('/').filter(p => p);
+            const nameIndex = pathParts.indexOf('naamani');
+            if (nameIndex >= 0 && nameIndex < pathParts.length - 1) {
+                const number = parseInt(pathParts[nameIndex + 1]);
+                if (number >= 1 && number <= totalNames) return number;
+            }
+            return 1;
+        }
+
+        // Format number to 4 digits (e.g., 1 -> 0001)
+        function formatNumber(num) {
+            return String(num).padStart(4, '0');
+        }
+
+        // Convert Arabic numerals to Sanskrit (Devanagari) numerals
+        function toSanskritNumber(num) {
+            const sanskritDigits = ['०', '१', '२', '३', '४', '५', '६', '७', '८', '९'];
+            return String(num).split('').map(d => sanskritDigits[parseInt(d)]).join('');
+        }
+
+        // Fetch file with error handling
+        async function fetchFile(url) {
+            try {
+                // Add cache-busting timestamp to prevent browser caching
+                const cacheBuster = '?t=' + new Date().getTime();
+                const response = await fetch(url + cacheBuster, {
+                    cache: 'no-store'
+                });
+                if (!response.ok) return null;
+                return await response.text();
+            } catch (error) {
+                return null;
+            }
+        }
+
+        // Fetch JSON file with error handling
+        async function fetchJSON(url) {
+            try {
+                // Add cache-busting timestamp to prevent browser caching
+                const cacheBuster = '?t=' + new Date().getTime();
+                const response = await fetch(url + cacheBuster, {
+                    cache: 'no-store'
+                });
+                if (!response.ok) return null;
+                return await response.json();
+            } catch (error) {
+                return null;
+            }
+        }
+
+        // Load name data from individual files
+        async function loadNameData(number) {
+            const numStr = formatNumber(number);
+
+            // Load name from Naamavali
+            const nameText = await fetchFile(`../../Data/Naamavali/${numStr}.txt`);
+
+            // Load Datta commentary
+            const dattaData = await fetchJSON(`../../Data/DattaCommentary/${numStr}.json`);
+
+            // Load Mantra
+            const mantraTxt = await fetchFile(`../../Data/Mantra/${numStr}.txt`);
+
+            // Load Balatapa commentary (one-line commentary)
+            const balatapaTxt = await fetchFile(`../../Data/Balatapa/${numStr}.txt`);
+
+            // Load Soubhagya commentary
+            const soubhagyaMarkdown = await fetchFile(`../../Data/SoubhagyaBhaskara/${numStr}.md`);
+
+            // Load Jayamangala commentary (if exists)
+            const jayamangalaMarkdown = await fetchFile(`../../Data/Jayamangala/${numStr}.md`);
+
+            return {
+                number: number,
+                name: nameText ? nameText.trim() : `Name ${number}`,
+                mantra: mantraTxt || "",
+                datta_commentary: dattaData || { meaning: "", commentary: "" },
+                balatapa_commentary: balatapaTxt || "",
+                soubhagya_commentary: soubhagyaMarkdown || "",
+                jayamangala_commentary: jayamangalaMarkdown || ""
+            };
+        }
+
+        // Format text with paragraph breaks and Sanskrit highlighting
+        function formatText(text) {
+            if (!text) return '';
+
+            const paragraphs = text.split('\n\n');
+
+            return paragraphs.map(para => {
+                para = para.trim();
+                if (!para) return '';
+
+                // Check if paragraph is Sanskrit (contains Devanagari)
+                if (/[\u0900-\u097F]/.test(para) && para.length < 200) {
+                    return `<div class="sanskrit-quote">${para}</div>`;
+                }
+
+                return `<p>${para}</p>`;
+            }).join('');
+        }
+
+        // Load name and commentaries
+        async function loadName(number) {
+            if (!number) number = currentNumber;
+            currentNumber = parseInt(number);
+
+            try {
+                if (currentNumber < 1 || currentNumber > totalNames) {
+                    throw new Error('Invalid name number');
+                }
+
+                // Load data from individual files
+                const nameData = await loadNameData(currentNumber);
+
+                // Display number and name in navigation center
+                document.getElementById('nameNumber').textContent = toSanskritNumber(currentNumber);
+                document.querySelector('.name-title').textContent = nameData.name;
+
+                // Display mantra section (always show, use "-" if not available)
+                const mantraContent = (nameData.mantra && nameData.mantra.trim().length > 0)
+                    ? nameData.mantra.trim()
+                    : '-';
+                document.getElementById('mantra-section').innerHTML =
+                    `<span class="label">नाममन्त्रः »</span>${mantraContent}`;
+                document.getElementById('mantra-section').style.display = 'block';
+
+                // Display balatapa section (always show, use "-" if not available)
+                const balatapContent = (nameData.balatapa_commentary && nameData.balatapa_commentary.trim().length > 0)
+                    ? nameData.balatapa_commentary.trim()
+                    : '-';
+                document.getElementById('balatapa-section').innerHTML =
+                    `<span class="label">बालातपा »</span>${balatapContent}`;
+                document.getElementById('balatapa-section').style.display = 'block';
+
+                // Tabs in order: जयमङ्गला, सौभाग्यभास्कर (removed नाममन्त्रम् and बालातपा tabs)
+                const tabs = [];
+                const panels = [];
+
+                // 3. जयमङ्गला tab
+                let jayamangalaMarkdown = nameData.jayamangala_commentary || '';
+                jayamangalaMarkdown = jayamangalaMarkdown.replace(/^#\s+.+$/m, '').trim();
+
+                let jayamangalaHTML = '';
+                if (jayamangalaMarkdown && jayamangalaMarkdown.length > 0) {
+                    jayamangalaHTML = `<div class="commentary-text">${marked.parse(jayamangalaMarkdown)}</div>`;
+                } else {
+                    jayamangalaHTML = '<div class="no-commentary">जयमङ्गला commentary not yet available for this name.</div>';
+                }
+                tabs.push({id: 'jayamangala', label: 'जयमङ्गला'});
+                panels.push({
+                    id: 'jayamangala',
+                    html: jayamangalaHTML
+                });
+
+                // 4. सौभाग्यभास्कर tab
+                let soubhagyaMarkdown = nameData.soubhagya_commentary || '';
+                soubhagyaMarkdown = soubhagyaMarkdown.replace(/^#\s+.+$/m, '').trim();
+
+                let soubhagyaHTML = '';
+                if (soubhagyaMarkdown && soubhagyaMarkdown.length > 0) {
+                    soubhagyaHTML = `<div class="commentary-text">${marked.parse(soubhagyaMarkdown)}</div>`;
+                } else {
+                    soubhagyaHTML = '<div class="no-commentary">सौभाग्यभास्कर commentary not yet available for this name.</div>';
+                }
+                tabs.push({id: 'soubhagya', label: 'सौभाग्यभास्कर'});
+                panels.push({
+                    id: 'soubhagya',
+                    html: soubhagyaHTML
+                });
+
+                // Hide tabs section since we have no tabs now
+                document.getElementById('commentaryTabs').style.display = 'none';
+
+                // Build collapsible commentaries (जयमङ्गला and सौभाग्यभास्कर)
+                let panelsHTML = `
+                    <div class="collapsible-commentary-wrapper">
+                        <div class="collapsible-commentary-header jayamangala collapsed" onclick="toggleCommentary('jayamangala')">
+                            <span class="commentary-name">जयमङ्गला</span>
+                            <span class="toggle-hint">»&nbsp;&nbsp; click to toggle</span>
+                        </div>
+                        <div class="collapsible-commentary-content" id="jayamangala-collapsible">
+                            <div class="commentary-section">
+                                ${panels[0].html}
+                            </div>
+                        </div>
+                    </div>
+
+                    <div class="collapsible-commentary-wrapper">
+                        <div class="collapsible-commentary-header soubhagya collapsed" onclick="toggleCommentary('soubhagya')">
+                            <span class="commentary-name">सौभाग्यभास्कर</span>
+                            <span class="toggle-hint">»&nbsp;&nbsp; click to toggle</span>
+                        </div>
+                        <div class="collapsible-commentary-content" id="soubhagya-collapsible">
+                            <div class="commentary-section">
+                                ${panels[1].html}
+                            </div>
+                        </div>
+                    </div>
+                `;
+
+                // Update content
+                document.getElementById('content').innerHTML = panelsHTML;
+
+                // Setup tab switching
+                setupTabs();
+
+                // Setup collapsible personal notes sections
+                setupPersonalNotes();
+
+                // Merge blockquotes inline with preceding paragraph
+                mergeBlockquotesInline();
+
+                // Update button states
+                document.getElementById('prevBtn').disabled = (currentNumber === 1);
+                document.getElementById('nextBtn').disabled = (currentNumber === totalNames);
+
+                // Update page title with the name
+                document.title = `${nameData.name} - Lalita Sahasranama`;
+
+                // Update URL without reloading page (keep clean URL)
+                const newUrl = `${window.location.pathname}${window.location.hash}`;
+                window.history.replaceState({number: currentNumber}, '', newUrl);
+
+            } catch (error) {
+                document.getElementById('content').innerHTML =
+                    `<div class="loading">Error loading name ${currentNumber}: ${error.message}</div>`;
+            }
+        }
+
+        // Setup tab switching
+        function setupTabs() {
+            const tabButtons = document.querySelectorAll('.tab-button');
+            tabButtons.forEach(button => {
+                button.addEventListener('click', () => {
+                    // Remove active class from all tabs and panels
+                    tabButtons.forEach(btn => btn.classList.remove('active'));
+                    document.querySelectorAll('.tab-panel').forEach(panel => panel.classList.remove('active'));
+
+                    // Add active class to clicked tab
+                    button.classList.add('active');
+
+                    // Show corresponding panel
+                    const tabName = button.dataset.tab;
+                    document.getElementById(`${tabName}-panel`).classList.add('active');
+
+                    // Update URL hash to remember active tab
+                    window.location.hash = tabName;
+                });
+            });
+
+            // Restore active tab from URL hash if present
+            const hash = window.location.hash.slice(1);
+            if (hash) {
+                const targetButton = document.querySelector(`[data-tab="${hash}"]`);
+                if (targetButton) {
+                    targetButton.click();
+                }
+            }
+        }
+
+        // Setup collapsible personal notes sections
+        function setupPersonalNotes() {
+            // Find all h3 elements (मम टिप्पणी sections) in commentary-text divs
+            document.querySelectorAll('.commentary-text h3').forEach(heading => {
+                // Start collapsed
+                heading.classList.add('collapsed');
+
+                // Find the next element (which should be the paragraph with notes)
+                let nextElem = heading.nextElementSibling;
+                if (nextElem && nextElem.tagName === 'P') {
+                    nextElem.classList.add('personal-notes');
+
+                    // Hide if it contains placeholder text
+                    if (nextElem.textContent.includes('अत्र स्वकीयं टिप्पणी लिख्यताम्')) {
+                        heading.style.display = 'none';
+                        nextElem.style.display = 'none';
+                    } else {
+                        // Add click handler to toggle
+                        heading.addEventListener('click', () => {
+                            heading.classList.toggle('collapsed');
+                            nextElem.classList.toggle('expanded');
+                        });
+                    }
+                }
+            });
+        }
+
+        // Merge blockquotes (slokas) inline with preceding paragraph
+        function mergeBlockquotesInline() {
+            document.querySelectorAll('.commentary-text blockquote').forEach(blockquote => {
+                let prevElem = blockquote.previousElementSibling;
+
+                // Find the previous paragraph (skip over other elements)
+                while (prevElem && prevElem.tagName !== 'P') {
+                    prevElem = prevElem.previousElementSibling;
+                }
+
+                if (prevElem && prevElem.tagName === 'P') {
+                    // Get sloka text
+                    const slokaText = blockquote.textContent.trim();
+
+                    // Create span for sloka
+                    const slokaSpan = document.createElement('span');
+                    slokaSpan.style.color = '#7b2cbf';
+                    slokaSpan.style.fontWeight = '500';
+                    slokaSpan.textContent = ' ' + slokaText;
+
+                    // Append to previous paragraph
+                    prevElem.appendChild(slokaSpan);
+
+                    // Remove blockquote
+                    blockquote.remove();
+                }
+            });
+        }
+
+        // Toggle collapsible commentary sections
+        function toggleCommentary(id) {
+            const header = event.currentTarget;
+            const content = document.getElementById(`${id}-collapsible`);
+
+            header.classList.toggle('collapsed');
+            content.classList.toggle('expanded');
+
+            // Re-run personal notes and blockquote merging for newly expanded content
+            if (content.classList.contains('expanded')) {
+                setTimeout(() => {
+                    setupPersonalNotes();
+                    mergeBlockquotesInline();
+                }, 100);
+            }
+        }
+
+        // Navigate between names
+        function navigate(direction) {
+            const newNumber = currentNumber + direction;
+            if (newNumber >= 1 && newNumber <= totalNames) {
+                window.location.href = `../${newNumber}/`;
+            }
+        }
+
+        // Keyboard navigation
+        document.addEventListener('keydown', (e) => {
+            // Don't navigate if user is typing in a textarea or input
+            if (e.target.tagName === 'TEXTAREA' || e.target.tagName === 'INPUT') {
+                return;
+            }
+            if (e.key === 'ArrowLeft') navigate(-1);
+            if (e.key === 'ArrowRight') navigate(1);
+        });
+
+        // Initialize
+        currentNumber = getNumberFromURL();
+        loadName(currentNumber);
+    
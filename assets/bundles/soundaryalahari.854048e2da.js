@@ -0,0 +1,82 @@
+        // Format number to 4 digits
+        function formatNumber(num) {
+            return String(num).padStart(4, '0');
+        }
+
+        // Load sloka text
+        async function loadSloka() {
+            try {
+                const response = await fetch(`../../soundaryalahari/${formatNumber(currentNumber)}.txt`);
+                const text = await response.text();
+                document.getElementById('sloka-text').innerHTML = text.trim().replace(/\n/g, '<br>');
+            } catch (error) {
+                document.getElementById('sloka-text').innerHTML = 'Error loading sloka';
+                console.error('Error loading sloka:', error);
+            }
+        }
+
+        // Load commentary
+        async function loadCommentary(type) {
+            try {
+                const folder = type === 'lakshmidhara' ? 'LakshmidharaSoundaryaLahari' : 'KaivalyaSoundaryaLahari';
+                const response = await fetch(`../../Data/${folder}/${formatNumber(currentNumber)}.txt`);
+                const text = await response.text();
+                const contentDiv = document.getElementById(`${type}-content`);
+                
+                if (text.trim()) {
+                    contentDiv.innerHTML = text.trim()
+                        .split('\n\n')
+                        .map(para => `<p>${para.replace(/\n/g, '<br>')}</p>`)
+                        .join('');
+                } else {
+                    contentDiv.innerHTML = '<p style="color: #999; font-style: italic;">Commentary is not available</p>';
+                }
+            } catch (error) {
+                document.getElementById(`${type}-content`).innerHTML = '<p style="color: #999; font-style: italic;">Commentary is not available</p>';
+                console.error(`Error loading ${type} commentary:`, error);
+            }
+        }
+
+        // Switch tabs
+        function switchTab(event, tabName) {
+            // Hide all tab panels
+            document.querySelectorAll('.tab-panel').forEach(panel => {
+                panel.classList.remove('active');
+            });
+
+            // Remove active class from all buttons
+            document.querySelectorAll('.tab-button').forEach(btn => {
+                btn.classList.remove('active');
+            });
+
+            // Show selected tab panel
+            document.getElementById(tabName).classList.add('active');
+            event.target.classList.add('active');
+        }
+
+        // Navigate between slokas
+        function navigate(direction) {
+            const newNumber = currentNumber + direction;
+            if (newNumber >= 1 && newNumber <= totalSlokas) {
+                window.location.href = `../${newNumber}/`;
+            }
+        }
+
+        // Keyboard navigation
+        document.addEventListener('keydown', (e) => {
+            if (e.target.tagName === 'TEXTAREA' || e.target.tagName === 'INPUT') {
+                return;
+            }
+            if (e.key === 'ArrowLeft') navigate(-1);
+            if (e.key === 'ArrowRight') navigate(1);
+        });
+
+        // Update button states
+        document.getElementById('prevBtn').disabled = (currentNumber === 1);
+        document.getElementById('nextBtn').disabled = (currentNumber === totalSlokas);
+
+        // Initialize
+        loadSloka();
+        loadCommentary('lakshmidhara');
+        loadCommentary('kaivalyashrama');
+    
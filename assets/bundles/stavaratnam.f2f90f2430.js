@@ -0,0 +1,64 @@
+        // Format number to 4 digits
+        function formatNumber(num) {
+            return String(num).padStart(4, '0');
+        }
+
+        // Load sloka text
+        async function loadSloka() {
+            try {
+                const response = await fetch(`../../lalitastavaratnam/${formatNumber(currentNumber)}.txt`);
+                const text = await response.text();
+                document.getElementById('sloka-text').innerHTML = text.trim().replace(/\n/g, '<br>');
+            } catch (error) {
+                document.getElementById('sloka-text').innerHTML = 'Error loading sloka';
+                console.error('Error loading sloka:', error);
+            }
+        }
+
+        // Load teeka
+        async function loadTeeka() {
+            try {
+                const response = await fetch(`../../StavaratnaTeeka/${formatNumber(currentNumber)}.md`);
+                const text = await response.text();
+                const teekaContent = document.getElementById('teeka-content');
+                
+                if (text.trim()) {
+                    // Simple markdown-like rendering
+                    teekaContent.innerHTML = text.trim()
+                        .split('\n\n')
+                        .map(para => `<p>${para.replace(/\n/g, '<br>')}</p>`)
+                        .join('');
+                } else {
+                    teekaContent.innerHTML = '<p style="color: #999; font-style: italic;">Commentary is not available</p>';
+                }
+            } catch (error) {
+                document.getElementById('teeka-content').innerHTML = '<p style="color: #999; font-style: italic;">Commentary is not available</p>';
+                console.error('Error loading teeka:', error);
+            }
+        }
+
+        // Navigate between slokas
+        function navigate(direction) {
+            const newNumber = currentNumber + direction;
+            if (newNumber >= 1 && newNumber <= totalSlokas) {
+                window.location.href = `../${newNumber}/`;
+            }
+        }
+
+        // Keyboard navigation
+        document.addEventListener('keydown', (e) => {
+            if (e.target.tagName === 'TEXTAREA' || e.target.tagName === 'INPUT') {
+                return;
+            }
+            if (e.key === 'ArrowLeft') navigate(-1);
+            if (e.key === 'ArrowRight') navigate(1);
+        });
+
+        // Update button states
+        document.getElementById('prevBtn').disabled = (currentNumber === 1);
+        document.getElementById('nextBtn').disabled = (currentNumber === totalSlokas);
+
+        // Initialize
+        loadSloka();
+        loadTeeka();
+    
@@ -0,0 +1,28 @@
+        async function loadCommentary() {
+            try {
+                const response = await fetch(`../../../../Data/UmaSahasranamaTeeka/shataka-${String(shatakaNum).padStart(2, '0')}/stabaka-${String(stabakaNum).padStart(2, '0')}/${String(slokaNum).padStart(4, '0')}.txt`);
+                if (!response.ok) throw new Error('Commentary not found');
+                
+                const text = await response.text();
+                const contentDiv = document.getElementById('commentary-content');
+                
+                if (text.trim()) {
+                    contentDiv.innerHTML = text.trim()
+                        .split('\n\n')
+                        .map(para => `<p>${para.replace(/\n/g, '<br>')}</p>`)
+                        .join('');
+                    contentDiv.classList.remove('empty');
+                } else {
+                    contentDiv.textContent = 'टीका उपलब्धः नास्ति। कृपया सम्पादनं कुर्वन्तु।';
+                    contentDiv.classList.add('empty');
+                }
+            } catch (error) {
+                // Commentary file doesn't exist yet - leave empty message
+                const contentDiv = document.getElementById('commentary-content');
+                contentDiv.textContent = 'टीका उपलब्धः नास्ति। कृपया सम्पादनं कुर्वन्तु।';
+                contentDiv.classList.add('empty');
+            }
+        }
+
+        window.addEventListener('load', loadCommentary);
+    
@@ -0,0 +1,171 @@
+// Type-ahead over names and sloka openings in every collection, attached to
+// the page's #searchBox. The index (assets/autocomplete/, built by
+// tools/autocomplete.py) is sharded by first letter: index.json is fetched on
+// first focus and each shard only when a query starts with its letter.
+(function () {
+    const input = document.getElementById('searchBox');
+    if (!input || !document.currentScript) return;
+
+    const ROOT = new URL('../../', document.currentScript.src);
+    const BASE = new URL('assets/autocomplete/', ROOT);
+    const LIMIT = 8;
+    const TITLES = {
+        naamani: 'नामानि',
+        stavaratnam: 'स्तवरत्नम्',
+        soundaryalahari: 'सौन्दर्यलहरी',
+        lalitopaakhyaanam: 'ललितोपाख्यानम्',
+        umasahasranama: 'उमासहस्रनाम',
+        mookapanchasati: 'मूकपञ्चशती'
+    };
+
+    let index = null;
+    const shards = new Map();
+    let items = [];
+    let selected = -1;
+
+    // Same rules as devanagari_key / latin_key in tools/autocomplete.py
+    function queryKey(text, maxKey) {
+        if (/[ऀ-ॿ]/.test(text)) {
+            return text.normalize('NFC').replace(/[^ँ-ःअ-हा-्ॠ-ॣ]/g, '').slice(0, maxKey);
+        }
+        return text.toLowerCase().normalize('NFD').replace(/[^a-z]/g, '').slice(0, maxKey);
+    }
+
+    async function fetchJSON(url) {
+        try {
+            const response = await fetch(url);
+            return response.ok ? await response.json() : null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    async function loadIndex() {
+        if (!index) index = fetchJSON(new URL('index.json', BASE));
+        return index;
+    }
+
+    async function loadShard(char) {
+        const meta = (await loadIndex()).shards[char];
+        if (!meta) return null;
+        if (!shards.has(char)) {
+            shards.set(char, fetchJSON(new URL(meta.file, BASE)).then(data => {
+                if (data) data.counts = new Array(data.nodes.length);
+                return data;
+            }));
+        }
+        return shards.get(char);
+    }
+
+    // Keys reachable from a node (memoized); gives each key its rank
+    function count(shard, node) {
+        if (shard.counts[node] === undefined) {
+            const row = shard.nodes[node];
+            let total = row[0];
+            for (let e = 1; e < row.length; e += 2) total += count(shard, row[e + 1]);
+            shard.counts[node] = total;
+        }
+        return shard.counts[node];
+    }
+
+    // Nodes are [final, label, child, label, child, ...] with labels sorted
+    function complete(shard, key) {
+        let node = 0, rank = 0, i = 0, tail = '';
+        while (i < key.length) {
+            const row = shard.nodes[node];
+            rank += row[0];
+            let next = -1;
+            for (let e = 1; e < row.length; e += 2) {
+                const label = row[e];
+                if (label[0] === key[i]) {
+                    const n = Math.min(label.length, key.length - i);
+                    if (label.slice(0, n) !== key.slice(i, i + n)) return [];
+                    i += n;
+                    tail = label.slice(n);
+                    next = row[e + 1];
+                    break;
+                }
+                rank += count(shard, row[e + 1]);
+            }
+            if (next < 0) return [];
+            node = next;
+        }
+
+        const results = [];
+        const stack = [[node, key + tail]];
+        while (stack.length && results.length < LIMIT) {
+            const [current, text] = stack.pop();
+            const row = shard.nodes[current];
+            if (row[0]) results.push(shard.values[rank++]);
+            for (let e = row.length - 2; e >= 1; e -= 2) stack.push([row[e + 1], text + row[e]]);
+        }
+        return results;
+    }
+
+    const list = document.createElement('div');
+    list.className = 'autocomplete-list';
+    list.hidden = true;
+    input.parentNode.style.position = 'relative';
+    input.insertAdjacentElement('afterend', list);
+
+    const style = document.createElement('style');
+    style.textContent = `
+        .autocomplete-list { position: absolute; left: 0; right: 0; z-index: 100; background: white;
+            border: 1px solid #DAA520; border-radius: 6px; box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            max-width: 600px; margin: 2px auto 0 auto; text-align: left; }
+        .autocomplete-list a { display: flex; justify-content: space-between; gap: 12px; padding: 8px 12px;
+            color: #333; border-bottom: none; }
+        .autocomplete-list a.selected, .autocomplete-list a:hover { background: #fff8dc; color: #8B0000; }
+        .autocomplete-list .collection { color: #8B4513; font-size: 0.85em; white-space: nowrap; }`;
+    document.head.appendChild(style);
+
+    function render(results, collections) {
+        items = [];
+        results.forEach(targets => targets.forEach(([c, path, label]) => {
+            items.push({ href: new URL(`${collections[c]}/${path}/`, ROOT).href, label, collection: collections[c] });
+        }));
+        items = items.slice(0, LIMIT);
+        selected = -1;
+        list.innerHTML = items.map(item =>
+            `<a href="${item.href}"><span>${item.label}</span>` +
+            `<span class="collection">${TITLES[item.collection] || item.collection}</span></a>`
+        ).join('');
+        list.hidden = items.length === 0;
+    }
+
+    function highlight(i) {
+        selected = Math.max(-1, Math.min(i, items.length - 1));
+        [...list.children].forEach((a, j) => a.classList.toggle('selected', j === selected));
+    }
+
+    async function update() {
+        const meta = await loadIndex();
+        if (!meta) return;
+        const key = queryKey(input.value, meta.max_key);
+        const shard = key ? await loadShard(key[0]) : null;
+        // Ignore responses that arrive after the query changed
+        if (key !== queryKey(input.value, meta.max_key)) return;
+        render(shard ? complete(shard, key) : [], meta.collections);
+    }
+
+    input.addEventListener('focus', loadIndex, { once: true });
+    input.addEventListener('input', update);
+    input.addEventListener('keydown', e => {
+        if (list.hidden) return;
+        if (e.key === 'ArrowDown') {
+            e.preventDefault();
+            highlight(selected + 1);
+        } else if (e.key === 'ArrowUp') {
+            e.preventDefault();
+            highlight(selected - 1);
+        } else if (e.key === 'Enter' && selected >= 0) {
+            e.preventDefault();
+            window.location.href = items[selected].href;
+        } else if (e.key === 'Escape') {
+            list.hidden = true;
+        }
+    });
+    document.addEventListener('click', e => {
+        if (e.target !== input && !list.contains(e.target)) list.hidden = true;
+    });
+})();
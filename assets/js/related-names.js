@@ -0,0 +1,40 @@
+// Related names on the name pages (naamani/<n>/). Neighbours come from
+// Data/naamani-related.json, built by tools/related_names.py; the names
+// themselves from Data/naamani-index.json.
+(function () {
+    const section = document.getElementById('related-section');
+    if (!section || typeof getNumberFromURL !== 'function') return;
+
+    async function fetchJSON(url) {
+        try {
+            const response = await fetch(url);
+            return response.ok ? await response.json() : null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    async function showRelated() {
+        const [related, index] = await Promise.all([
+            fetchJSON('../../Data/naamani-related.json'),
+            fetchJSON('../../Data/naamani-index.json')
+        ]);
+        if (!related || !index) return;
+
+        const number = getNumberFromURL();
+        const row = related.numbers.indexOf(number);
+        if (row < 0 || !related.related[row].length) return;
+
+        const names = {};
+        index.numbers.forEach((n, i) => { names[n] = index.names[i]; });
+
+        section.innerHTML = '<span class="label">सम्बद्धनामानि:</span>' +
+            related.related[row].map(n =>
+                `<a href="../${n}/" title="${related.scores[row][related.related[row].indexOf(n)]}%">` +
+                `${toSanskritNumber(n)}. ${names[n] || ''}</a>`
+            ).join('');
+        section.style.display = 'block';
+    }
+
+    showRelated();
+})();
@@ -0,0 +1,14 @@
+// Registers the site's service worker (sw.js at the site root, generated by
+// tools/build_precache.py). Included on every page with a relative path, so
+// the worker URL is resolved from this script's own location.
+(function () {
+    if (!('serviceWorker' in navigator) || !document.currentScript) return;
+
+    const workerUrl = new URL('../../sw.js', document.currentScript.src);
+
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(workerUrl).catch(() => {
+            // Offline support is optional - the site works without it
+        });
+    });
+})();
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark the corpus maintenance scripts on synthetic corpora
+For each corpus size and target, generates a fresh corpus (see
+synth_corpus.py), runs the target in its own process and records:
+- wall time and files/sec
+- read/write syscalls (from /proc/self/io, Linux only)
+- peak RSS
+
+Results are compared against bench/baselines.json; any target that is
+slower, makes more syscalls or uses more memory than its baseline by more
+than the tolerance is reported as a regression and the run exits with 1.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import platform
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+BASELINES_FILE = BENCH_DIR / 'baselines.json'
+OUTPUT_FILE = REPO_ROOT / 'bench_output.txt'
+
+COLLECTIONS = ['umasahasranama', 'mookapanchasati']
+
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_TOLERANCE = 0.25
+
+
+# ============================================================================
+# Targets (run inside the child process)
+# ============================================================================
+
+def run_reformat_slokas(root: Path) -> int:
+    import reformat_slokas
+    files = 0
+    for collection in COLLECTIONS:
+        count, skipped, errors = reformat_slokas.process_directory(str(root / collection))
+        files += count + skipped + errors
+    return files
+
+
+def run_update_html_slokas(root: Path) -> int:
+    import update_html_slokas
+    files = 0
+    for collection in COLLECTIONS:
+        count, skipped, errors = update_html_slokas.process_directory(str(root), collection)
+        files += count + skipped + errors
+    return files
+
+
+def run_corpus_scan(root: Path) -> int:
+    from corpus import Corpus
+    corpus = Corpus(root)
+    files = 0
+    for collection in COLLECTIONS:
+        for _record, _text in corpus.iter_texts(collection):
+            files += 1
+    return files
+
+
+# name -> (function, needs pages)
+TARGETS = {
+    'reformat_slokas': (run_reformat_slokas, False),
+    'update_html_slokas': (run_update_html_slokas, True),
+    'corpus_scan': (run_corpus_scan, False),
+}
+
+
+def read_proc_io() -> Optional[Dict[str, int]]:
+    """This process's I/O counters, or None where /proc isn't available"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            return {key: int(value) for key, value in (line.split(': ') for line in f)}
+    except OSError:
+        return None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def child(target: str, root: str) -> None:
+    """Run one target and print its measurements as JSON"""
+    import io
+    from contextlib import redirect_stdout
+
+    sys.path.insert(0, str(REPO_ROOT))
+    sys.path.insert(0, str(REPO_ROOT / 'tools'))
+
+    function, _ = TARGETS[target]
+    before = read_proc_io()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        files = function(Path(root))
+    seconds = time.perf_counter() - start
+    after = read_proc_io()
+
+    result = {
+        'files': files,
+        'seconds': round(seconds, 4),
+        'files_per_sec': round(files / seconds, 1) if seconds else None,
+        'syscalls': None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    if before and after:
+        result['syscalls'] = (after['syscr'] - before['syscr']) + (after['syscw'] - before['syscw'])
+        result['read_mb'] = round((after['rchar'] - before['rchar']) / 1e6, 2)
+        result['write_mb'] = round((after['wchar'] - before['wchar']) / 1e6, 2)
+
+    print(json.dumps(result))
+
+
+# ============================================================================
+# Driver
+# ============================================================================
+
+def run_target(target: str, size: int, workdir: Path) -> Dict:
+    """Generate a fresh corpus and run one target on it in a child process"""
+    from synth_corpus import generate
+
+    root = workdir / f"{target}-{size}"
+    generate(root, size, pages=TARGETS[target][1])
+    try:
+        output = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--child', target, str(root)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def compare(result: Dict, baseline: Optional[Dict], tolerance: float) -> list:
+    """
+    Regressions of one result against its baseline
+
+    Returns:
+        List of human-readable problems (empty if within tolerance)
+    """
+    if not baseline:
+        return []
+    problems = []
+    if result.get('files_per_sec') and baseline.get('files_per_sec'):
+        if result['files_per_sec'] < baseline['files_per_sec'] * (1 - tolerance):
+            problems.append(f"files/sec {result['files_per_sec']} < baseline {baseline['files_per_sec']}")
+    for key, label in (('syscalls', 'syscalls'), ('peak_rss_mb', 'peak RSS MB')):
+        if result.get(key) is not None and baseline.get(key):
+            if result[key] > baseline[key] * (1 + tolerance):
+                problems.append(f"{label} {result[key]} > baseline {baseline[key]}")
+    return problems
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the corpus maintenance scripts on synthetic corpora'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                       help=f"Corpus sizes in slokas (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGETS), default=list(TARGETS),
+                       help='Targets to run (default: all)')
+    parser.add_argument('--baselines', default=str(BASELINES_FILE), help='Baselines file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                       help=f'Allowed relative regression (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--update-baselines', action='store_true',
+                       help='Store this run as the new baselines instead of comparing')
+    parser.add_argument('--output', default=str(OUTPUT_FILE), help='Report file (default: bench_output.txt)')
+    parser.add_argument('--workdir', help='Where to generate corpora (default: a temp directory)')
+    parser.add_argument('--child', nargs=2, metavar=('TARGET', 'ROOT'), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    baselines = {}
+    if Path(args.baselines).exists():
+        with open(args.baselines, 'r', encoding='utf-8') as f:
+            baselines = json.load(f).get('results', {})
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix='bench-'))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    regressions = []
+    lines = []
+    try:
+        for size in args.sizes:
+            for target in args.targets:
+                key = f"{target}@{size}"
+                print(f"Running {key}...")
+                result = run_target(target, size, workdir)
+                results[key] = result
+
+                problems = [] if args.update_baselines else compare(result, baselines.get(key), args.tolerance)
+                status = 'REGRESSION' if problems else ('new' if key not in baselines else 'ok')
+                line = (f"{key:<32} {result['files']:>7} files  {result['seconds']:>8.2f}s  "
+                        f"{result['files_per_sec'] or 0:>9.0f} files/s  "
+                        f"{result['syscalls'] if result['syscalls'] is not None else '-':>8} syscalls  "
+                        f"{result['peak_rss_mb']:>7.1f} MB  {status}")
+                print(f"  {line}")
+                lines.append(line)
+                for problem in problems:
+                    print(f"    ⚠️  {problem}")
+                    lines.append(f"    {problem}")
+                    regressions.append(key)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    if args.update_baselines:
+        baselines.update(results)
+        with open(args.baselines, 'w', encoding='utf-8') as f:
+            json.dump({
+                'machine': f"{platform.system()} {platform.machine()}, Python {platform.python_version()}, "
+                           f"{os.cpu_count()} CPUs",
+                'results': baselines
+            }, f, indent=2)
+            f.write('\n')
+        print(f"\nBaselines saved: {args.baselines}")
+        return
+
+    print(f"\n{'='*60}")
+    print(f"{len(results)} benchmark(s), {len(set(regressions))} regression(s)")
+    print(f"Report: {args.output}")
+    print(f"{'='*60}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
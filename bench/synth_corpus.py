@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic corpora for benchmarking the maintenance scripts
+Mirrors the real layouts at any size:
+- umasahasranama/shataka-XX/stabaka-YY/NNNN.txt + N/index.html
+  (4 stabakas of 25 slokas per shataka)
+- mookapanchasati/SECTION/NNNN.txt + N/index.html (5 sections)
+
+Sloka texts and page templates are taken from the real collections, so
+file sizes match what the scripts see in production. Every other sloka is
+written on a single line, as before reformatting.
+"""
+
+import re
+import sys
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+STABAKAS_PER_SHATAKA = 4
+SLOKAS_PER_STABAKA = 25
+MOOKA_SECTIONS = ['aryashatakam', 'padaravindashatakam', 'stutishatakam',
+                  'katakshashatakam', 'mandasmitashatakam']
+
+# Share of the slokas in each collection (995 : 506 in the real corpus)
+UMA_SHARE = 2 / 3
+
+FALLBACK_SLOKA = 'अखिलजगन्मातोमा तमसा तापेन चाकुलानस्मान् ।\nअनुगृह्णात्वनुकम्पासुधार्द्रया हसितचन्द्रिकया ॥'
+FALLBACK_PAGE = """<!DOCTYPE html>
+<html lang="sa">
+<head><meta charset="UTF-8"><title>Sloka</title></head>
+<body>
+    <div class="container">
+        <div class="sloka-section">
+            {sloka}
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+SLOKA_SECTION_RE = re.compile(r'(<div class="sloka-section"[^>]*>)(.*?)(</div>)', re.DOTALL)
+
+
+def load_samples(root: Path = REPO_ROOT, limit: int = 200) -> List[str]:
+    """Real sloka texts to cycle through"""
+    samples = []
+    for collection in ('umasahasranama', 'mookapanchasati'):
+        for path in sorted((root / collection).glob('**/[0-9][0-9][0-9][0-9].txt'))[:limit // 2]:
+            samples.append(path.read_text(encoding='utf-8').strip())
+    return samples or [FALLBACK_SLOKA]
+
+
+def load_templates(root: Path = REPO_ROOT) -> Dict[str, str]:
+    """Real page of each collection with its sloka replaced by a {sloka} slot"""
+    templates = {}
+    for collection, page in (('umasahasranama', 'shataka-01/stabaka-01/1/index.html'),
+                             ('mookapanchasati', 'aryashatakam/1/index.html')):
+        path = root / collection / page
+        if path.exists():
+            html = path.read_text(encoding='utf-8').replace('{', '{{').replace('}', '}}')
+            html = SLOKA_SECTION_RE.sub(r'\1\n            {sloka}\n        \3', html, count=1)
+            templates[collection] = html
+        else:
+            templates[collection] = FALLBACK_PAGE
+    return templates
+
+
+def layout(size: int) -> List[tuple]:
+    """
+    (collection, section, number) for a corpus of `size` slokas
+
+    Returns:
+        List of keys in directory order
+    """
+    uma = round(size * UMA_SHARE)
+    mooka = size - uma
+    keys = []
+
+    per_shataka = STABAKAS_PER_SHATAKA * SLOKAS_PER_STABAKA
+    for i in range(uma):
+        shataka, rest = divmod(i, per_shataka)
+        stabaka, number = divmod(rest, SLOKAS_PER_STABAKA)
+        keys.append(('umasahasranama', f"shataka-{shataka + 1:02d}/stabaka-{stabaka + 1:02d}", number + 1))
+
+    per_section = -(-mooka // len(MOOKA_SECTIONS)) if mooka else 1
+    for i in range(mooka):
+        section, number = divmod(i, per_section)
+        keys.append(('mookapanchasati', MOOKA_SECTIONS[section], number + 1))
+
+    return keys
+
+
+def generate(root: Path, size: int, pages: bool = True) -> Dict[str, int]:
+    """
+    Write a synthetic corpus under `root`
+
+    Args:
+        root: Output directory (stands in for the repository root)
+        size: Total number of slokas
+        pages: Also write the per-sloka index.html pages
+
+    Returns:
+        {'slokas': ..., 'pages': ...}
+    """
+    root = Path(root)
+    samples = cycle(load_samples())
+    templates = load_templates()
+
+    slokas = 0
+    written_pages = 0
+    made = set()
+    for i, (collection, section, number) in enumerate(layout(size)):
+        directory = root / collection / section
+        if directory not in made:
+            directory.mkdir(parents=True, exist_ok=True)
+            made.add(directory)
+
+        text = next(samples)
+        stored = ' '.join(text.split('\n')) if i % 2 == 0 else text
+        (directory / f"{number:04d}.txt").write_text(stored + '\n', encoding='utf-8')
+        slokas += 1
+
+        if pages:
+            page_dir = directory / str(number)
+            page_dir.mkdir(exist_ok=True)
+            sloka = ' '.join(text.split('\n'))
+            (page_dir / 'index.html').write_text(templates[collection].format(sloka=sloka), encoding='utf-8')
+            written_pages += 1
+
+    return {'slokas': slokas, 'pages': written_pages}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic sloka corpus')
+    parser.add_argument('output', help='Output directory')
+    parser.add_argument('--size', type=int, default=1000, help='Number of slokas (default: 1000)')
+    parser.add_argument('--no-pages', action='store_true', help='Only write the .txt files')
+
+    args = parser.parse_args()
+
+    if Path(args.output).exists() and any(Path(args.output).iterdir()):
+        print(f"Output directory is not empty: {args.output}")
+        sys.exit(1)
+
+    counts = generate(Path(args.output), args.size, pages=not args.no_pages)
+    print(f"Generated {counts['slokas']} slokas and {counts['pages']} pages in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,8 +9,9 @@ import os
 import sys
 import json
 import time
+import socket
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 try:
@@ -25,21 +26,31 @@ except ImportError as e:
     print("  brew install poppler")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from ocr_quality import score_text, load_lexicon, STRONG_MODELS
+from ocr_queue import OcrQueue, DEFAULT_LEASE
+from batch_write import atomic_write
+import instrument
+
 
 class GeminiOCR:
     """OCR processor using Google Gemini API"""
 
-    def __init__(self, api_key: str, model: str = "gemini-2.0-flash-exp"):
+    def __init__(self, api_key: str, model: str = "gemini-2.0-flash-exp",
+                 strong_model: Optional[str] = None):
         """
         Initialize Gemini OCR
 
         Args:
             api_key: Google AI Studio API key
             model: Model to use (gemini-2.0-flash-exp, gemini-1.5-pro, gemini-1.5-flash)
+            strong_model: Optional slower/better model for low-confidence pages
         """
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model)
         self.model_name = model
+        self.strong_model = genai.GenerativeModel(strong_model) if strong_model else None
+        self.strong_model_name = strong_model
 
     def create_prompt(self, typeface: Optional[str] = None, context: Optional[str] = None) -> str:
         """
@@ -71,7 +82,8 @@ This is a Sanskrit text in Devanagari script. Please:
         return prompt
 
     def ocr_image(self, image_path: str, typeface: Optional[str] = None,
-                  context: Optional[str] = None, retry_count: int = 3) -> Dict:
+                  context: Optional[str] = None, retry_count: int = 3,
+                  strong: bool = False) -> Dict:
         """
         Perform OCR on a single image
 
@@ -80,16 +92,23 @@ This is a Sanskrit text in Devanagari script. Please:
             typeface: Optional typeface description
             context: Optional context about the text
             retry_count: Number of retries on failure
+            strong: Use the strong model instead of the default one
 
         Returns:
             Dict with text, confidence, and metadata
         """
-        image = Image.open(image_path)
+        with instrument.span('read', file=Path(image_path).name):
+            image = Image.open(image_path)
+            image.load()
         prompt = self.create_prompt(typeface, context)
+        model = self.strong_model if strong else self.model
+        model_name = self.strong_model_name if strong else self.model_name
 
         for attempt in range(retry_count):
             try:
-                response = self.model.generate_content([prompt, image])
+                instrument.count(f'api_calls.{model_name}')
+                with instrument.span('network', model=model_name, attempt=attempt + 1):
+                    response = model.generate_content([prompt, image])
 
                 # Check if response was blocked
                 if not response.text:
@@ -102,17 +121,37 @@ This is a Sanskrit text in Devanagari script. Please:
 
                 return {
                     'text': response.text.strip(),
-                    'model': self.model_name,
+                    'model': model_name,
                     'success': True,
                     'attempt': attempt + 1
                 }
 
             except Exception as e:
+                error_str = str(e)
+                instrument.count('api_errors')
+
+                # Check for rate limit
+                if '429' in error_str or 'quota' in error_str.lower():
+                    if attempt < retry_count - 1:
+                        wait_time = 60  # Wait 1 minute for rate limit
+                        print(f"  ⚠️  Rate limit hit. Waiting {wait_time}s...")
+                        instrument.count('rate_limits')
+                        with instrument.span('sleep', reason='rate_limit'):
+                            time.sleep(wait_time)
+                        continue
+                    return {
+                        'text': '',
+                        'error': 'Rate limit exceeded',
+                        'success': False,
+                        'retry_later': True
+                    }
+
                 if attempt < retry_count - 1:
                     wait_time = 2 ** attempt  # Exponential backoff
                     print(f"  ⚠️  Attempt {attempt + 1} failed: {e}")
                     print(f"  Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    with instrument.span('sleep', reason='retry'):
+                        time.sleep(wait_time)
                 else:
                     return {
                         'text': '',
@@ -127,7 +166,9 @@ This is a Sanskrit text in Devanagari script. Please:
                     context: Optional[str] = None,
                     dpi: int = 300,
                     start_page: Optional[int] = None,
-                    end_page: Optional[int] = None) -> Dict:
+                    end_page: Optional[int] = None,
+                    threshold: float = 0.8,
+                    lexicon: Optional[List[str]] = None) -> Dict:
         """
         Process entire PDF with OCR
 
@@ -139,6 +180,9 @@ This is a Sanskrit text in Devanagari script. Please:
             dpi: DPI for PDF conversion (300 recommended)
             start_page: Optional starting page (1-indexed)
             end_page: Optional ending page (1-indexed)
+            threshold: Quality score below which pages are re-OCRed with the
+                       strong model (only if one was given)
+            lexicon: Word-list files/directories for the out-of-lexicon signal
 
         Returns:
             Dict with results and metadata
@@ -154,26 +198,28 @@ This is a Sanskrit text in Devanagari script. Please:
         print(f"📄 Converting PDF to images (DPI: {dpi})...")
 
         # Convert PDF to images
-        pages = convert_from_path(
-            str(pdf_path),
-            dpi=dpi,
-            fmt='png',
-            first_page=start_page,
-            last_page=end_page
-        )
+        with instrument.span('transform', step='pdf_to_images'):
+            pages = convert_from_path(
+                str(pdf_path),
+                dpi=dpi,
+                fmt='png',
+                first_page=start_page,
+                last_page=end_page
+            )
 
         print(f"✅ Converted {len(pages)} page(s)")
         print(f"🔍 Starting OCR with {self.model_name}...")
         print()
 
         results = []
-        total_chars = 0
+        lexicon_words = load_lexicon(lexicon) if lexicon else None
 
         for i, page_image in enumerate(pages, start=start_page or 1):
             # Save image
             image_filename = f'{pdf_path.stem}_page_{i:03d}.png'
             image_path = images_dir / image_filename
-            page_image.save(image_path, 'PNG')
+            with instrument.span('write', file=image_filename):
+                page_image.save(image_path, 'PNG')
 
             print(f"Page {i}/{len(pages) + (start_page or 1) - 1}: ", end='', flush=True)
 
@@ -182,8 +228,9 @@ This is a Sanskrit text in Devanagari script. Please:
 
             if result['success']:
                 char_count = len(result['text'])
-                total_chars += char_count
-                print(f"✅ {char_count} characters")
+                with instrument.span('score'):
+                    quality = score_text(result['text'], lexicon_words, str(image_path))
+                print(f"✅ {char_count} characters (score {quality['score']:.2f})")
 
                 results.append({
                     'page_number': i,
@@ -191,6 +238,7 @@ This is a Sanskrit text in Devanagari script. Please:
                     'text': result['text'],
                     'char_count': char_count,
                     'model': result['model'],
+                    'quality_score': quality['score'],
                     'success': True
                 })
             else:
@@ -204,7 +252,192 @@ This is a Sanskrit text in Devanagari script. Please:
                 })
 
             # Rate limiting - be nice to the API
-            time.sleep(1)
+            with instrument.span('sleep', reason='rate_limit'):
+                time.sleep(1)
+
+        # Second tier: only low-confidence pages go to the strong model
+        weak = [r for r in results
+                if r['success'] and self.strong_model and r['quality_score'] < threshold]
+        if weak:
+            print()
+            print(f"🔁 Re-running {len(weak)} low-confidence page(s) with {self.strong_model_name}...")
+            print()
+
+        escalated = 0
+        for page in weak:
+            print(f"Page {page['page_number']}: ", end='', flush=True)
+            result = self.ocr_image(str(images_dir / page['image_file']), typeface, context, strong=True)
+
+            if result['success']:
+                with instrument.span('score'):
+                    quality = score_text(result['text'], lexicon_words, str(images_dir / page['image_file']))
+                print(f"✅ score {page['quality_score']:.2f} → {quality['score']:.2f}")
+
+                page.update({
+                    'text': result['text'],
+                    'char_count': len(result['text']),
+                    'model': result['model'],
+                    'first_pass_score': page['quality_score'],
+                    'quality_score': quality['score']
+                })
+                escalated += 1
+            else:
+                print(f"❌ Failed: {result.get('error', 'Unknown error')} (keeping {self.model_name} text)")
+                if result.get('retry_later'):
+                    break
+
+            with instrument.span('sleep', reason='rate_limit'):
+                time.sleep(1)
+
+        return self.save_results(pdf_path, output_dir, results, dpi=dpi, typeface=typeface,
+                                 context=context, threshold=threshold, escalated=escalated)
+
+    def process_queue(self, queue: OcrQueue, worker: str, dpi: int = 300,
+                      typeface: Optional[str] = None, context: Optional[str] = None,
+                      threshold: float = 0.8, lexicon: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Work through PDF pages of a shared queue (see tools/ocr_queue.py)
+
+        Each leased page is rendered on its own, OCRed (and re-OCRed with the
+        strong model right away if it scores low) and saved as
+        <output-dir>/pages/<stem>_page_NNN.txt. The worker that finds the
+        queue drained writes the usual JSON, text and proofreading files.
+
+        Args:
+            queue: Queue made with 'ocr_queue.py init --pdf ...'
+            worker: This worker's name
+            (other arguments as for process_pdf)
+
+        Returns:
+            The JSON output data if this worker wrote it, else None
+        """
+        lexicon_words = load_lexicon(lexicon) if lexicon else None
+        done = failed = lost = 0
+        print(f"📋 Queue: {queue.path} ({queue.remaining()} page(s) left), worker {worker}")
+        print(f"🔍 Model: {self.model_name}")
+        print()
+
+        try:
+            while True:
+                jobs = queue.lease(worker)
+                if not jobs:
+                    break
+                job = jobs[0]
+                page, pdf_path, txt_path = job['page'], Path(job['source']), Path(job['output'])
+
+                images_dir = txt_path.parent.parent / 'images'
+                images_dir.mkdir(parents=True, exist_ok=True)
+                image_path = images_dir / f'{pdf_path.stem}_page_{page:03d}.png'
+                if not image_path.exists():
+                    with instrument.span('transform', step='pdf_to_images'):
+                        page_image = convert_from_path(str(pdf_path), dpi=dpi, fmt='png',
+                                                       first_page=page, last_page=page)[0]
+                    with instrument.span('write', file=image_path.name):
+                        page_image.save(image_path, 'PNG')
+
+                print(f"Page {page} (attempt {job['attempts']}): ", end='', flush=True)
+                result = self.ocr_image(str(image_path), typeface, context)
+
+                if not result['success']:
+                    print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+                    if result.get('retry_later'):
+                        queue.release(worker, page)
+                        print()
+                        print("⚠️  Rate limit reached. Stopping this worker; the page is back in the queue.")
+                        break
+                    if queue.fail(worker, page, result.get('error') or 'Unknown error') == 'failed':
+                        failed += 1
+                    continue
+
+                with instrument.span('score'):
+                    score = score_text(result['text'], lexicon_words, str(image_path))['score']
+                text, model, first_score = result['text'], result['model'], None
+
+                if self.strong_model and score < threshold and queue.renew(worker, page):
+                    print(f"score {score:.2f}, re-running with {self.strong_model_name}... ", end='', flush=True)
+                    strong = self.ocr_image(str(image_path), typeface, context, strong=True)
+                    if strong['success']:
+                        with instrument.span('score'):
+                            strong_score = score_text(strong['text'], lexicon_words, str(image_path))['score']
+                        text, model, first_score, score = strong['text'], strong['model'], score, strong_score
+
+                txt_path.parent.mkdir(parents=True, exist_ok=True)
+                with instrument.span('write', file=txt_path.name):
+                    atomic_write(txt_path, text)
+                if not queue.complete(worker, page, model, score, first_score):
+                    print(f"⚠️  lease expired; page {page} was taken over by another worker")
+                    lost += 1
+                    continue
+                done += 1
+                print(f"✅ {len(text)} characters (score {score:.2f}, {model})")
+
+                # Rate limiting - be nice to the API
+                with instrument.span('sleep', reason='rate_limit'):
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n⚠️  Interrupted; returning leased pages to the queue")
+            return None
+        finally:
+            queue.release(worker)
+
+        print()
+        print(f"Worker {worker}: {done} page(s) done, {failed} failed"
+              + (f", {lost} taken over after the lease expired (try a longer --lease)" if lost else ''))
+        if queue.remaining():
+            print(f"{queue.remaining()} page(s) left for other or later workers: "
+                  f"python3 tools/ocr_queue.py {queue.path} status")
+            return None
+        return self.save_queue_results(queue, dpi, typeface, context, threshold)
+
+    def save_queue_results(self, queue: OcrQueue, dpi: int = 300, typeface: Optional[str] = None,
+                           context: Optional[str] = None, threshold: float = 0.8) -> Optional[Dict]:
+        """Write the output files of every PDF in a drained queue from its per-page texts"""
+        books: Dict[Tuple[str, Path], List[Dict]] = {}
+        for job in queue.jobs():
+            txt_path = Path(job['output'])
+            books.setdefault((job['source'], txt_path.parent.parent), []).append(job)
+
+        output_data = None
+        for (pdf_file, output_dir), jobs in books.items():
+            pdf_path = Path(pdf_file)
+            results = []
+            for job in jobs:
+                result = {'page_number': job['page'],
+                          'image_file': f"{pdf_path.stem}_page_{job['page']:03d}.png"}
+                if job['state'] == 'done':
+                    with open(job['output'], 'r', encoding='utf-8') as f:
+                        text = f.read()
+                    result.update({'text': text, 'char_count': len(text), 'model': job['model'],
+                                   'quality_score': job['score'], 'success': True})
+                    if job['first_pass_score'] is not None:
+                        result['first_pass_score'] = job['first_pass_score']
+                else:
+                    result.update({'text': '', 'error': job['error'], 'success': False})
+                results.append(result)
+
+            escalated = sum(1 for r in results if 'first_pass_score' in r)
+            output_data = self.save_results(pdf_path, output_dir, results, dpi=dpi, typeface=typeface,
+                                            context=context, threshold=threshold, escalated=escalated)
+        return output_data
+
+    def save_results(self, pdf_path: Path, output_dir: Path, results: List[Dict],
+                     dpi: int = 300, typeface: Optional[str] = None,
+                     context: Optional[str] = None, threshold: float = 0.8,
+                     escalated: int = 0) -> Dict:
+        """
+        Write the JSON, plain-text and proofreading files for a set of pages
+
+        Args:
+            pdf_path: Source PDF
+            output_dir: Output directory (holds images/)
+            results: Page results as built by process_pdf, by page number
+            escalated: Pages re-OCRed with the strong model
+
+        Returns:
+            The JSON output data
+        """
+        images_dir = output_dir / 'images'
+        total_chars = sum(r.get('char_count', 0) for r in results)
 
         # Save results
         print()
@@ -216,6 +449,8 @@ This is a Sanskrit text in Devanagari script. Please:
             'metadata': {
                 'source_file': str(pdf_path),
                 'model': self.model_name,
+                'strong_model': self.strong_model_name,
+                'threshold': threshold if self.strong_model else None,
                 'timestamp': datetime.now().isoformat(),
                 'total_pages': len(results),
                 'total_characters': total_chars,
@@ -226,12 +461,12 @@ This is a Sanskrit text in Devanagari script. Please:
             'pages': results
         }
 
-        with open(json_output, 'w', encoding='utf-8') as f:
+        with instrument.span('write', file=json_output.name), open(json_output, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
 
         # Save as plain text
         txt_output = output_dir / f'{pdf_path.stem}_ocr.txt'
-        with open(txt_output, 'w', encoding='utf-8') as f:
+        with instrument.span('write', file=txt_output.name), open(txt_output, 'w', encoding='utf-8') as f:
             for result in results:
                 if result['success']:
                     f.write(f"{'='*80}\n")
@@ -257,12 +492,15 @@ This is a Sanskrit text in Devanagari script. Please:
                 'image_file': result['image_file'],
                 'ocr_text': result.get('text', ''),
                 'corrected_text': '',
-                'needs_review': not result['success'],
+                'model': result.get('model'),
+                'quality_score': result.get('quality_score'),
+                'needs_review': not result['success'] or result['quality_score'] < threshold,
                 'notes': result.get('error', ''),
                 'status': 'pending'
             })
 
-        with open(proofreading_output, 'w', encoding='utf-8') as f:
+        with instrument.span('write', file=proofreading_output.name), \
+                open(proofreading_output, 'w', encoding='utf-8') as f:
             json.dump(proofreading_data, f, ensure_ascii=False, indent=2)
 
         print()
@@ -272,6 +510,8 @@ This is a Sanskrit text in Devanagari script. Please:
         print()
         print(f"📊 Summary:")
         print(f"  • Model: {self.model_name}")
+        if self.strong_model:
+            print(f"  • Re-OCRed with {self.strong_model_name}: {escalated}")
         print(f"  • Pages processed: {len(results)}")
         print(f"  • Total characters: {total_chars:,}")
         print(f"  • Success rate: {sum(1 for r in results if r['success'])}/{len(results)}")
@@ -314,6 +554,14 @@ Examples:
   python gemini_ocr.py commentary.pdf --api-key YOUR_API_KEY \\
       --context "Commentary on Lalita Sahasranama, mixture of Sanskrit and explanatory text"
 
+  # Two-tier: fast model everywhere, pro only where the page scores low
+  python gemini_ocr.py commentary.pdf --api-key YOUR_API_KEY \\
+      --strong-model gemini-2.5-pro --lexicon Data/SoubhagyaBhaskara
+
+  # Several workers on one book (any machines sharing the files)
+  python ../tools/ocr_queue.py ocr.sqlite init --pdf commentary.pdf --output-dir ocr_output --end-page 400
+  python gemini_ocr.py --queue ocr.sqlite --worker host1 --api-key YOUR_API_KEY
+
 Models:
   - gemini-2.0-flash-exp (default, fast, good quality)
   - gemini-1.5-pro (highest quality, slower)
@@ -323,7 +571,7 @@ Get API key from: https://aistudio.google.com/apikey
         '''
     )
 
-    parser.add_argument('pdf_file', help='Path to PDF file')
+    parser.add_argument('pdf_file', nargs='?', help='Path to PDF file (not needed with --queue)')
     parser.add_argument('--api-key', help='Google AI Studio API key (or set GEMINI_API_KEY env var)')
     parser.add_argument('--output-dir', default='ocr_output', help='Output directory (default: ocr_output)')
     parser.add_argument('--model', default='gemini-2.5-flash',
@@ -334,11 +582,38 @@ Get API key from: https://aistudio.google.com/apikey
     parser.add_argument('--dpi', type=int, default=300, help='DPI for PDF conversion (default: 300)')
     parser.add_argument('--start-page', type=int, help='Starting page number (1-indexed)')
     parser.add_argument('--end-page', type=int, help='Ending page number (1-indexed)')
+    parser.add_argument('--strong-model', choices=STRONG_MODELS,
+                       help='Re-OCR low-confidence pages with this model')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                       help='Quality score below which pages go to --strong-model (default: 0.8)')
+    parser.add_argument('--lexicon', nargs='+',
+                       help='Word lists or text directories for the out-of-lexicon check')
+    parser.add_argument('--queue',
+                       help='Pull pages from this shared queue (tools/ocr_queue.py init --pdf ...)')
+    parser.add_argument('--worker', default=f"{socket.gethostname()}-{os.getpid()}",
+                       help='Worker name in the queue (default: host-pid)')
+    parser.add_argument('--lease', type=int, default=DEFAULT_LEASE,
+                       help=f'Seconds a leased page is held before other workers may take it (default: {DEFAULT_LEASE})')
+    instrument.add_arguments(parser)
 
     args = parser.parse_args()
 
-    # Get API key
+    if not args.pdf_file and not args.queue:
+        parser.error('a PDF file (or --queue) is required')
+    if args.strong_model == args.model:
+        parser.error('--strong-model must differ from --model')
+
+    # Get API key (and model) - a queue worker's assignment wins
     api_key = args.api_key or os.environ.get('GEMINI_API_KEY')
+    model = args.model
+    queue = None
+    if args.queue:
+        queue = OcrQueue(args.queue, lease_seconds=args.lease)
+        try:
+            api_key, model = queue.credentials(args.worker, api_key, model)
+        except KeyError as e:
+            print(f"❌ Error: {e.args[0]}")
+            sys.exit(1)
     if not api_key:
         print("❌ Error: API key required")
         print()
@@ -350,7 +625,7 @@ Get API key from: https://aistudio.google.com/apikey
         sys.exit(1)
 
     # Check if PDF exists
-    if not os.path.exists(args.pdf_file):
+    if args.pdf_file and not os.path.exists(args.pdf_file):
         print(f"❌ Error: File not found: {args.pdf_file}")
         sys.exit(1)
 
@@ -361,19 +636,38 @@ Get API key from: https://aistudio.google.com/apikey
     print()
 
     # Initialize OCR
-    ocr = GeminiOCR(api_key, model=args.model)
+    strong_model = args.strong_model
+    if strong_model == model:
+        print(f"⚠️  Worker is assigned {model}, the same as --strong-model; not escalating")
+        strong_model = None
+    ocr = GeminiOCR(api_key, model=model, strong_model=strong_model)
 
     # Process PDF
     try:
-        ocr.process_pdf(
-            pdf_path=args.pdf_file,
-            output_dir=args.output_dir,
-            typeface=args.typeface,
-            context=args.context,
-            dpi=args.dpi,
-            start_page=args.start_page,
-            end_page=args.end_page
-        )
+        with instrument.session(args):
+            if queue:
+                ocr.process_queue(
+                    queue,
+                    args.worker,
+                    dpi=args.dpi,
+                    typeface=args.typeface,
+                    context=args.context,
+                    threshold=args.threshold,
+                    lexicon=args.lexicon
+                )
+                queue.close()
+                return
+            ocr.process_pdf(
+                pdf_path=args.pdf_file,
+                output_dir=args.output_dir,
+                typeface=args.typeface,
+                context=args.context,
+                dpi=args.dpi,
+                start_page=args.start_page,
+                end_page=args.end_page,
+                threshold=args.threshold,
+                lexicon=args.lexicon
+            )
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(1)
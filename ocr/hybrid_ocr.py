@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Local-first hybrid OCR
+Runs Tesseract (tools/extract_text.py) on every page in a process pool,
+scores each result and sends only low-scoring pages to Gemini.
+The engine that produced each page is recorded in the output JSON.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+
+try:
+    from extract_text import extract_text
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("\nPlease install required packages:")
+    print("  pip install opencv-python numpy pytesseract pillow")
+    print("\nTesseract with Sanskrit data is also needed:")
+    print("  brew install tesseract tesseract-lang")
+    sys.exit(1)
+
+from ocr_quality import score_text, load_lexicon
+
+LOCAL_ENGINE = 'tesseract'
+
+_lexicon = None
+
+
+def _init_worker(lexicon: Optional[List[str]]):
+    """Load the lexicon once per worker process"""
+    global _lexicon
+    _lexicon = load_lexicon(lexicon) if lexicon else None
+
+
+def local_ocr(image_path: str) -> Dict:
+    """
+    OCR one page with Tesseract and score the result
+
+    Runs inside a worker process.
+    """
+    try:
+        text = extract_text(image_path, preprocess=True)
+    except Exception as e:
+        return {'text': '', 'quality_score': 0.0, 'error': str(e)}
+
+    quality = score_text(text, _lexicon, image_path)
+    return {'text': text, 'quality_score': quality['score']}
+
+
+def page_number(image_path: Path) -> int:
+    """Page number from file names like page_007.png or Book_page_007.png"""
+    numbers = re.findall(r'\d+', image_path.stem)
+    return int(numbers[-1]) if numbers else 0
+
+
+def process_images(images_dir: str, output_dir: str,
+                   api_key: Optional[str] = None,
+                   model: str = "gemini-2.5-flash",
+                   threshold: float = 0.8,
+                   lexicon: Optional[List[str]] = None,
+                   pattern: str = "*.png",
+                   workers: Optional[int] = None,
+                   typeface: Optional[str] = None,
+                   context: Optional[str] = None,
+                   delay: int = 4) -> Dict:
+    """
+    OCR a directory of page images, local engine first
+
+    Args:
+        images_dir: Directory with page images
+        output_dir: Directory to save results
+        api_key: Gemini API key; without it no page goes remote
+        model: Gemini model used for fallback pages
+        threshold: Local score below which a page is sent to Gemini
+        lexicon: Word-list files/directories for the out-of-lexicon signal
+        pattern: Glob for page images (default: *.png)
+        workers: Local OCR processes (default: CPU count)
+        typeface: Optional typeface description for Gemini
+        context: Optional context about the text for Gemini
+        delay: Delay between Gemini requests in seconds
+
+    Returns:
+        Dict with results and metadata
+    """
+    images_dir = Path(images_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    image_files = sorted(images_dir.glob(pattern), key=page_number)
+    if not image_files:
+        print(f"❌ No page images found in: {images_dir}")
+        return {}
+
+    print(f"🖥️  Local OCR on {len(image_files)} page(s) with {workers or os.cpu_count()} worker(s)...")
+    start = time.time()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(lexicon,)) as pool:
+        local_results = list(pool.map(local_ocr, map(str, image_files)))
+
+    print(f"✅ Local pass done in {time.time() - start:.1f}s")
+
+    results = []
+    for image_file, local in zip(image_files, local_results):
+        results.append({
+            'page_number': page_number(image_file),
+            'image_file': image_file.name,
+            'text': local['text'],
+            'engine': LOCAL_ENGINE,
+            'local_score': local['quality_score'],
+            'quality_score': local['quality_score'],
+            'success': bool(local['text']),
+            'error': local.get('error', '')
+        })
+
+    weak = [r for r in results if r['local_score'] < threshold]
+    print(f"📊 {len(results) - len(weak)} page(s) accepted locally, {len(weak)} below {threshold}")
+
+    if weak and api_key:
+        from gemini_ocr import GeminiOCR
+
+        print(f"🔍 Sending {len(weak)} page(s) to {model}...")
+        print()
+        remote = GeminiOCR(api_key, model=model)
+        lexicon_words = load_lexicon(lexicon) if lexicon else None
+
+        for i, page in enumerate(weak, start=1):
+            print(f"Page {page['page_number']} ({i}/{len(weak)}): ", end='', flush=True)
+            image_path = str(images_dir / page['image_file'])
+            result = remote.ocr_image(image_path, typeface, context)
+
+            if result['success']:
+                quality = score_text(result['text'], lexicon_words, image_path)
+                page.update({
+                    'text': result['text'],
+                    'engine': result['model'],
+                    'quality_score': quality['score'],
+                    'success': True,
+                    'error': ''
+                })
+                print(f"✅ score {page['local_score']:.2f} → {quality['score']:.2f}")
+            else:
+                page['error'] = result.get('error', '')
+                print(f"❌ {page['error']} (keeping {LOCAL_ENGINE} text)")
+
+            if i < len(weak):
+                time.sleep(delay)
+    elif weak:
+        print("⚠️  No API key given, low-scoring pages keep their local text")
+
+    engines = {}
+    for r in results:
+        engines[r['engine']] = engines.get(r['engine'], 0) + 1
+
+    stem = images_dir.resolve().name
+    output_data = {
+        'metadata': {
+            'source_dir': str(images_dir),
+            'local_engine': LOCAL_ENGINE,
+            'remote_model': model if api_key else None,
+            'threshold': threshold,
+            'timestamp': datetime.now().isoformat(),
+            'total_pages': len(results),
+            'total_characters': sum(len(r['text']) for r in results),
+            'engines': engines,
+            'typeface': typeface,
+            'context': context
+        },
+        'pages': results
+    }
+
+    json_output = output_dir / f'{stem}_ocr.json'
+    with open(json_output, 'w', encoding='utf-8') as f:
+        json.dump(output_data, f, ensure_ascii=False, indent=2)
+
+    proofreading_output = output_dir / f'{stem}_proofreading.json'
+    proofreading_data = {
+        'project': 'Lalita Sahasranama Commentaries',
+        'source_file': str(images_dir),
+        'ocr_method': f'Hybrid {LOCAL_ENGINE} + Google Gemini {model}',
+        'date': datetime.now().isoformat(),
+        'pages': [
+            {
+                'page_number': r['page_number'],
+                'image_file': r['image_file'],
+                'ocr_text': r['text'],
+                'corrected_text': '',
+                'engine': r['engine'],
+                'quality_score': r['quality_score'],
+                'needs_review': not r['success'] or r['quality_score'] < threshold,
+                'notes': r['error'],
+                'status': 'pending'
+            }
+            for r in results
+        ]
+    }
+    with open(proofreading_output, 'w', encoding='utf-8') as f:
+        json.dump(proofreading_data, f, ensure_ascii=False, indent=2)
+
+    print()
+    print("━" * 80)
+    print("✅ HYBRID OCR COMPLETE")
+    print("━" * 80)
+    print()
+    print("📊 Pages by engine:")
+    for engine, count in sorted(engines.items()):
+        print(f"  • {engine}: {count}")
+    print()
+    print("📁 Results saved to:")
+    print(f"  • JSON: {json_output}")
+    print(f"  • Proofreading: {proofreading_output}")
+    print()
+
+    return output_data
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Local-first OCR: Tesseract on every page, Gemini only for weak pages',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Local pass only (no API key): scores every page, nothing goes remote
+  python hybrid_ocr.py "../Jayamangala Book" --pattern "page_*.png"
+
+  # Local pass, Gemini fallback for pages scoring below 0.8
+  python hybrid_ocr.py "../Jayamangala Book" --pattern "page_*.png" \\
+      --api-key YOUR_API_KEY --lexicon ../Data/SoubhagyaBhaskara
+        '''
+    )
+
+    parser.add_argument('images_dir', help='Directory with page images')
+    parser.add_argument('--api-key', help='Google AI Studio API key (or set GEMINI_API_KEY env var)')
+    parser.add_argument('--output-dir', default='ocr_output', help='Output directory (default: ocr_output)')
+    parser.add_argument('--model', default='gemini-2.5-flash',
+                       choices=['gemini-2.5-flash', 'gemini-2.5-pro', 'gemini-2.0-flash-exp', 'gemini-2.0-flash'],
+                       help='Gemini model for fallback pages (default: gemini-2.5-flash)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                       help='Local quality score below which pages go to Gemini (default: 0.8)')
+    parser.add_argument('--lexicon', nargs='+',
+                       help='Word lists or text directories for the out-of-lexicon check')
+    parser.add_argument('--pattern', default='*.png', help='Glob for page images (default: *.png)')
+    parser.add_argument('--workers', type=int, help='Local OCR processes (default: CPU count)')
+    parser.add_argument('--typeface', help='Description of typeface/font used')
+    parser.add_argument('--context', help='Context about the text content')
+    parser.add_argument('--delay', type=int, default=4,
+                       help='Delay between Gemini requests in seconds (default: 4)')
+
+    args = parser.parse_args()
+
+    try:
+        process_images(
+            images_dir=args.images_dir,
+            output_dir=args.output_dir,
+            api_key=args.api_key or os.environ.get('GEMINI_API_KEY'),
+            model=args.model,
+            threshold=args.threshold,
+            lexicon=args.lexicon,
+            pattern=args.pattern,
+            workers=args.workers,
+            typeface=args.typeface,
+            context=args.context,
+            delay=args.delay
+        )
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
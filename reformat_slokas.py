@@ -7,6 +7,12 @@ Splits at the single danda (।) to create two lines.
 import os
 import sys
 import re
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'tools'))
+from corpus import Corpus, COLLECTIONS
+from batch_write import BatchWriter, atomic_write, DEFAULT_BATCH_SIZE, JOURNAL_NAME
+import instrument
 
 def reformat_sloka(text):
     """
@@ -31,13 +37,16 @@ def reformat_sloka(text):
 
     return f"{line1}\n{line2}"
 
-def process_file(filepath):
+def process_file(filepath, writer=None):
     """
     Process a single sloka file and reformat it.
+    With a BatchWriter the new text is staged and committed with its batch;
+    without one the file is replaced on its own (temp file + rename).
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with instrument.span('read'):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
 
         # Check if already formatted (has newline)
         if '\n' in content.strip():
@@ -45,51 +54,87 @@ def process_file(filepath):
             return False
 
         # Reformat
-        reformatted = reformat_sloka(content)
+        with instrument.span('transform'):
+            reformatted = reformat_sloka(content)
 
         # Write back
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(reformatted + '\n')
+        with instrument.span('write'):
+            if writer:
+                writer.write(filepath, reformatted + '\n')
+            else:
+                atomic_write(filepath, reformatted + '\n')
 
         return True
     except Exception as e:
         print(f"Error processing {filepath}: {e}")
         return False
 
-def process_directory(directory):
+# Where each collection keeps its sloka texts (stavaratnam's are in lalitastavaratnam)
+COLLECTION_DIRS = {Corpus().collection(name).text_dir: name for name in COLLECTIONS}
+
+def find_collection(directory):
+    """
+    The collection whose sloka texts live in `directory` (e.g. umasahasranama,
+    or lalitastavaratnam for stavaratnam).
+
+    Returns:
+        (Corpus rooted above the directory, collection name), or (None, None)
+        for any other directory
     """
-    Process all .txt files in a directory recursively.
+    directory = Path(directory).resolve()
+    for text_dir, name in COLLECTION_DIRS.items():
+        parts = Path(text_dir).parts
+        if len(directory.parts) > len(parts) and directory.parts[-len(parts):] == parts:
+            return Corpus(directory.parents[len(parts) - 1]), name
+    return None, None
+
+def process_directory(directory, writer=None):
     """
+    Process all sloka .txt files of a collection directory, in directory order.
+    Raises ValueError for a directory that isn't a collection's.
+    Rewrites go through `writer`, or a BatchWriter journaled next to the
+    collection if none is given.
+    """
+    directory = Path(directory)
+    corpus, collection = find_collection(directory)
+    if not corpus:
+        raise ValueError(f"Not a collection directory: {directory}")
+
+    if writer is None:
+        with BatchWriter(journal=directory.parent / JOURNAL_NAME, root=directory.parent) as writer:
+            return process_directory(directory, writer)
+
     count = 0
     skipped = 0
     errors = 0
 
-    for root, dirs, files in os.walk(directory):
-        for filename in files:
-            if filename.endswith('.txt'):
-                filepath = os.path.join(root, filename)
-                result = process_file(filepath)
-
-                if result:
-                    count += 1
-                elif result is False and '\n' in open(filepath, 'r', encoding='utf-8').read().strip():
-                    skipped += 1
-                else:
-                    errors += 1
+    for record in corpus.records(collection):
+        filepath = record.text_path
+        result = process_file(filepath, writer)
 
-                if (count + skipped + errors) % 100 == 0:
-                    print(f"Progress: {count} reformatted, {skipped} skipped, {errors} errors")
+        if result:
+            count += 1
+        else:
+            with instrument.span('read'):
+                already_formatted = '\n' in open(filepath, 'r', encoding='utf-8').read().strip()
+            if already_formatted:
+                skipped += 1
+            else:
+                errors += 1
 
-    return count, skipped, errors
+        instrument.progress(reformatted=count, skipped=skipped, errors=errors)
 
-def main():
-    base_path = '/Users/adarshtadwai/Documents/GitHub/LalitaSahastranaamaCommentaries'
+    instrument.count('reformatted', count)
+    instrument.count('skipped', skipped)
+    instrument.count('errors', errors)
 
-    directories = [
-        os.path.join(base_path, 'umasahasranama'),
-        os.path.join(base_path, 'mookapanchasati')
-    ]
+    return count, skipped, errors
 
+def reformat_directories(directories, dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Reformat every collection directory and print the totals.
+    With dry_run, print a unified diff instead of writing.
+    """
     total_count = 0
     total_skipped = 0
     total_errors = 0
@@ -98,9 +143,16 @@ def main():
         if not os.path.exists(directory):
             print(f"Directory not found: {directory}")
             continue
+        if find_collection(directory) == (None, None):
+            print(f"Not a collection directory: {directory} "
+                  f"(expected one of: {', '.join(sorted(COLLECTION_DIRS))})")
+            continue
 
         print(f"\nProcessing: {directory}")
-        count, skipped, errors = process_directory(directory)
+        parent = Path(directory).resolve().parent
+        with BatchWriter(journal=parent / JOURNAL_NAME, batch_size=batch_size,
+                         dry_run=dry_run, root=parent) as writer:
+            count, skipped, errors = process_directory(directory, writer)
         total_count += count
         total_skipped += skipped
         total_errors += errors
@@ -113,5 +165,27 @@ def main():
     print(f"Total: {total_errors} errors")
     print(f"{'='*60}")
 
+def main():
+    import argparse
+
+    base_path = Path(__file__).resolve().parent
+
+    parser = argparse.ArgumentParser(
+        description="Reformat single-line sloka files into Soundaryalahari's 2-line format"
+    )
+    parser.add_argument('directories', nargs='*',
+                       default=[str(base_path / 'umasahasranama'), str(base_path / 'mookapanchasati')],
+                       help='Collection directories (default: umasahasranama mookapanchasati)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Print a unified diff of the changes instead of writing them')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Files renamed into place per batch (default: {DEFAULT_BATCH_SIZE})')
+    instrument.add_arguments(parser)
+
+    args = parser.parse_args()
+
+    with instrument.session(args):
+        reformat_directories(args.directories, args.dry_run, args.batch_size)
+
 if __name__ == '__main__':
     main()
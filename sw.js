@@ -0,0 +1,256 @@
+// Generated by tools/build_precache.py - do not edit
+const VERSION = 'b9a08bc5f2';
+const CACHE = 'site-precache';
+const ROOT = new URL('./', self.location).href;
+const MANIFEST_URL = ROOT + 'precache-manifest.json';
+const HASHES_KEY = ROOT + '__precache__/hashes.json';
+const BATCH = 8;
+const SLICE_SIZE = 100;
+
+// Content-hashed files never change under the same name
+const IMMUTABLE = [ROOT + 'assets/bundles/', ROOT + 'assets/precache/'];
+
+let manifest = null;
+const collections = {};
+const slices = {};
+const warmed = new Set();
+// {url: hash} of the files in the reading-order slices loaded so far
+const fileHashes = new Map();
+
+// Cache keys ignore query strings (the pages add ?t=<timestamp> cache-busters)
+function keyFor(url) {
+    const u = new URL(url);
+    u.search = '';
+    u.hash = '';
+    if (u.pathname.endsWith('/index.html')) {
+        u.pathname = u.pathname.slice(0, -'index.html'.length);
+    }
+    return u.href;
+}
+
+async function getManifest(refresh = false) {
+    if (manifest && !refresh) return manifest;
+    const cache = await caches.open(CACHE);
+    let response = refresh ? null : await cache.match(MANIFEST_URL);
+    if (!response) {
+        response = await fetch(MANIFEST_URL, {cache: 'no-cache'});
+        if (!response.ok) throw new Error('Precache manifest unavailable');
+        await cache.put(MANIFEST_URL, response.clone());
+    }
+    manifest = await response.json();
+    return manifest;
+}
+
+// Updates to the stored hashes run one at a time
+let queue = Promise.resolve();
+function serial(task) {
+    queue = queue.then(task, task);
+    return queue;
+}
+
+async function readHashes(cache) {
+    const stored = await cache.match(HASHES_KEY);
+    return stored ? stored.json() : {};
+}
+
+async function writeHashes(cache, hashes) {
+    await cache.put(HASHES_KEY, new Response(JSON.stringify(hashes), {
+        headers: {'Content-Type': 'application/json'}
+    }));
+}
+
+// Note the hash of a file just cached; writes are batched into one update
+let recorded = null;
+function record(url, hash) {
+    if (!recorded) {
+        recorded = {};
+        serial(async () => {
+            const batch = recorded;
+            recorded = null;
+            const cache = await caches.open(CACHE);
+            const hashes = await readHashes(cache);
+            await writeHashes(cache, Object.assign(hashes, batch));
+        });
+    }
+    recorded[url] = hash;
+}
+
+// Fetch entries whose hash changed, and drop cached copies of changed on-demand files
+async function sync(entries, invalidate = {}) {
+    const cache = await caches.open(CACHE);
+    const hashes = await readHashes(cache);
+
+    const stale = Object.entries(entries).filter(([url, hash]) => hashes[url] !== hash);
+    for (let i = 0; i < stale.length; i += BATCH) {
+        await Promise.all(stale.slice(i, i + BATCH).map(async ([url, hash]) => {
+            try {
+                const response = await fetch(ROOT + url, {cache: 'no-cache'});
+                if (response.ok && !response.redirected) {
+                    await cache.put(ROOT + url, response);
+                    hashes[url] = hash;
+                }
+            } catch (error) {
+                // Offline - try again on the next sync
+            }
+        }));
+    }
+
+    for (const [url, hash] of Object.entries(invalidate)) {
+        if (hashes[url] !== undefined && hashes[url] !== hash) {
+            await cache.delete(ROOT + url);
+            delete hashes[url];
+        }
+    }
+
+    await writeHashes(cache, hashes);
+}
+
+function collectionFor(path) {
+    for (const [name, info] of Object.entries(manifest.collections)) {
+        if (path.startsWith(info.prefix)) return name;
+    }
+    return null;
+}
+
+// Content-hashed JSON, cached under its URL; a failed load is retried next time
+function loadJson(loaded, url, prepare = data => data) {
+    if (!loaded[url]) {
+        loaded[url] = (async () => {
+            const cache = await caches.open(CACHE);
+            let response = await cache.match(ROOT + url);
+            if (!response) {
+                response = await fetch(ROOT + url);
+                if (!response.ok) throw new Error(url + ' unavailable');
+                await cache.put(ROOT + url, response.clone());
+            }
+            return prepare(await response.json());
+        })().catch(error => {
+            delete loaded[url];
+            throw error;
+        });
+    }
+    return loaded[url];
+}
+
+function loadCollection(name) {
+    return loadJson(collections, manifest.collections[name].manifest);
+}
+
+// Same key as build_precache.slice_key: chapter directory + block of SLICE_SIZE entries
+function sliceKey(page) {
+    const match = page.match(/^(.*)\/(\d+)\/$/);
+    return match ? match[1] + '/' + Math.floor((match[2] - 1) / SLICE_SIZE) : null;
+}
+
+function loadSlice(url) {
+    return loadJson(slices, url, data => {
+        data.index = new Map(data.entries.map(([page], i) => [page, i]));
+        for (const [, files] of data.entries) {
+            for (const [file, hash] of Object.entries(files)) fileHashes.set(file, hash);
+        }
+        return data;
+    });
+}
+
+// Cache the previous and next entry so sequential reading never waits; a
+// cached copy is refetched when its hash differs from the manifest's
+async function prefetchNeighbors(name, page) {
+    const url = manifest.collections[name].slices[sliceKey(page)];
+    if (!url) return;
+    const data = await loadSlice(url);
+    const i = data.index.get(page);
+    if (i === undefined) return;
+
+    const cache = await caches.open(CACHE);
+    const hashes = await readHashes(cache);
+    for (const j of [i + 1, i - 1]) {
+        if (j < 0 || j >= data.entries.length) continue;
+        const [, files] = data.entries[j];
+        await Promise.all(Object.entries(files).map(async ([file, hash]) => {
+            if (hashes[file] === hash && await cache.match(ROOT + file)) return;
+            try {
+                const response = await fetch(ROOT + file, {cache: 'no-cache'});
+                if (response.ok && !response.redirected) {
+                    await cache.put(ROOT + file, response);
+                    record(file, hash);
+                }
+            } catch (error) {
+                // Offline
+            }
+        }));
+    }
+}
+
+async function warmCollection(name) {
+    if (warmed.has(name)) return;
+    warmed.add(name);
+    const data = await loadCollection(name);
+    await serial(() => sync(data.precache, data.on_demand));
+}
+
+async function afterNavigation(key) {
+    await getManifest();
+    const page = key.slice(ROOT.length);
+    const name = collectionFor(page);
+    if (!name) return;
+    // Neighbours need only their slice; the collection's full list of
+    // files is loaded after them
+    await prefetchNeighbors(name, page);
+    await warmCollection(name);
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const current = await getManifest(true);
+        await serial(() => sync(current.shell));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        for (const name of await caches.keys()) {
+            if (name !== CACHE) await caches.delete(name);
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(ROOT)) return;
+
+    const key = keyFor(request.url);
+    const cacheReady = caches.open(CACHE);
+    const cachedResponse = cacheReady.then(cache => cache.match(key));
+
+    if (IMMUTABLE.some(prefix => key.startsWith(prefix))) {
+        event.respondWith(cachedResponse.then(cached => cached || cacheReady.then(async cache => {
+            const response = await fetch(key);
+            if (response.ok && !response.redirected) await cache.put(key, response.clone());
+            return response;
+        })));
+        return;
+    }
+
+    // Stale-while-revalidate: answer from the cache, refresh in the background
+    const network = cacheReady.then(async cache => {
+        const response = await fetch(key, {cache: 'no-cache'});
+        if (response.ok && !response.redirected) {
+            await cache.put(key, response.clone());
+            const hash = fileHashes.get(key.slice(ROOT.length));
+            if (hash) record(key.slice(ROOT.length), hash);
+        }
+        return response;
+    });
+    // Browsers reject a redirected response to a navigation (/naamani/1 ->
+    // /naamani/1/), so let the browser follow the redirect itself
+    const fresh = network.then(response =>
+        response.redirected && request.mode === 'navigate' ? fetch(request) : response);
+    event.respondWith(cachedResponse.then(cached => cached || fresh));
+    event.waitUntil(network.catch(() => null));
+
+    if (request.mode === 'navigate') {
+        event.waitUntil(afterNavigation(key).catch(() => null));
+    }
+});
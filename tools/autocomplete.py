@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Build the cross-collection autocomplete index
+Keys are the 1000 names and the opening of every sloka in all six
+collections, in normalized Devanagari and in ASCII-folded IAST (so
+'srimata' finds श्रीमाता). Keys are stored in minimized DAWGs (shared
+prefixes and suffixes), one shard per first letter, and every key's targets
+are found by its rank in the DAWG. The browser fetches only the shard for
+the letter being typed.
+
+Writes assets/autocomplete/index.json and one <codepoint>.json per shard.
+Also usable from Python:
+
+    from autocomplete import Autocomplete
+    index = Autocomplete.build()
+    index.complete('lalitā')     # [(key, [(collection, path, label), ...]), ...]
+"""
+
+import os
+import re
+import json
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from corpus import Corpus
+from devanagari import to_iast
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INDEX_DIR = Path('assets') / 'autocomplete'
+CLIENT_SCRIPT = Path('assets') / 'js' / 'autocomplete.js'
+
+# Typing more than this narrows nothing further; keys are cut here
+MAX_KEY_LENGTH = 24
+LABEL_LENGTH = 32
+
+# Letters, vowel signs, virama, anusvara/visarga/candrabindu; everything
+# else (spaces, dandas, digits, avagraha, accents, ZWJ/ZWNJ) is dropped.
+# assets/js/autocomplete.js applies the same rules to the query.
+DEVANAGARI_DROP_RE = re.compile(r'[^ँ-ःअ-हा-्ॠ-ॣ]')
+LATIN_DROP_RE = re.compile(r'[^a-z]')
+OPENING_RE = re.compile(r'^[^।॥\n]*')
+# Chapter headings and bracketed notes that precede the verse itself
+BRACKETS_RE = re.compile(r'\([^)]*\)')
+
+Target = Tuple[str, str, str]
+
+
+def devanagari_key(text: str) -> str:
+    """Normalized Devanagari search key"""
+    return DEVANAGARI_DROP_RE.sub('', unicodedata.normalize('NFC', text))[:MAX_KEY_LENGTH]
+
+
+def latin_key(text: str) -> str:
+    """ASCII-folded search key for IAST or plain Latin input ('śrīmātā' -> 'srimata')"""
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    return LATIN_DROP_RE.sub('', decomposed)[:MAX_KEY_LENGTH]
+
+
+def query_key(text: str) -> str:
+    """Key for what a reader typed: Devanagari if it contains any, else Latin"""
+    if re.search(r'[ऀ-ॿ]', text):
+        return devanagari_key(text)
+    return latin_key(text)
+
+
+class Dawg:
+    """
+    Minimized directed acyclic word graph with key ranks
+
+    Built from sorted keys (Daciuk et al.'s incremental algorithm), so
+    equivalent suffixes share states. Each node stores how many keys pass
+    through it, which turns a key into its rank in sorted order; values live
+    in a separate list indexed by rank.
+
+    Nodes are (final, {char: child}) and node 0 is the root.
+    """
+
+    def __init__(self, nodes: List[Tuple[bool, Dict[str, int]]]):
+        self.nodes = nodes
+        self._counts: Optional[List[int]] = None
+
+    @classmethod
+    def build(cls, keys: Iterable[str]) -> 'Dawg':
+        """
+        Build from keys in strictly increasing order
+
+        Raises:
+            ValueError: Keys are not sorted or contain duplicates
+        """
+        nodes: List[list] = [[False, {}]]
+        register: Dict[tuple, int] = {}
+        unchecked: List[Tuple[int, str, int]] = []
+        previous = None
+
+        def minimize(down_to: int):
+            while len(unchecked) > down_to:
+                parent, char, child = unchecked.pop()
+                final, edges = nodes[child]
+                signature = (final, tuple(sorted(edges.items())))
+                if signature in register:
+                    nodes[parent][1][char] = register[signature]
+                else:
+                    register[signature] = child
+
+        for key in keys:
+            if previous is not None and key <= previous:
+                raise ValueError(f"Keys must be sorted and unique: {previous!r} then {key!r}")
+            common = 0
+            if previous is not None:
+                while common < min(len(key), len(previous)) and key[common] == previous[common]:
+                    common += 1
+            minimize(common)
+
+            node = unchecked[-1][2] if unchecked else 0
+            for char in key[common:]:
+                nodes.append([False, {}])
+                child = len(nodes) - 1
+                nodes[node][1][char] = child
+                unchecked.append((node, char, child))
+                node = child
+            nodes[node][0] = True
+            previous = key
+        minimize(0)
+
+        return cls._compact(nodes)
+
+    @classmethod
+    def _compact(cls, nodes: List[list]) -> 'Dawg':
+        """Drop states merged away during minimization and renumber from the root"""
+        order, seen = [0], {0}
+        for node in order:
+            for child in sorted(nodes[node][1].values()):
+                if child not in seen:
+                    seen.add(child)
+                    order.append(child)
+        renumber = {old: new for new, old in enumerate(order)}
+        return cls([
+            (nodes[old][0], {char: renumber[child] for char, child in sorted(nodes[old][1].items())})
+            for old in order
+        ])
+
+    @property
+    def counts(self) -> List[int]:
+        """Number of keys reachable from each node"""
+        if self._counts is None:
+            counts = [0] * len(self.nodes)
+            # Children are always numbered after a node's first parent, but a
+            # shared state can sit before another parent; resolve by memoized DFS
+            done = [False] * len(self.nodes)
+            for start in range(len(self.nodes) - 1, -1, -1):
+                stack = [start]
+                while stack:
+                    node = stack[-1]
+                    if done[node]:
+                        stack.pop()
+                        continue
+                    pending = [c for c in self.nodes[node][1].values() if not done[c]]
+                    if pending:
+                        stack.extend(pending)
+                        continue
+                    final, edges = self.nodes[node]
+                    counts[node] = int(final) + sum(counts[c] for c in edges.values())
+                    done[node] = True
+                    stack.pop()
+            self._counts = counts
+        return self._counts
+
+    def __len__(self) -> int:
+        return self.counts[0]
+
+    def _walk(self, prefix: str) -> Tuple[Optional[int], int]:
+        """Node reached by prefix and the rank of the first key below it"""
+        counts = self.counts
+        node, rank = 0, 0
+        for char in prefix:
+            final, edges = self.nodes[node]
+            if char not in edges:
+                return None, rank
+            rank += int(final)
+            for other, child in edges.items():
+                if other < char:
+                    rank += counts[child]
+            node = edges[char]
+        return node, rank
+
+    def rank(self, key: str) -> Optional[int]:
+        """Position of key in sorted order, or None if absent"""
+        node, rank = self._walk(key)
+        if node is None or not self.nodes[node][0]:
+            return None
+        return rank
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Keys starting with prefix, in sorted order
+
+        Returns:
+            List of (key, rank)
+        """
+        node, rank = self._walk(prefix)
+        if node is None:
+            return []
+
+        results = []
+        stack = [(node, prefix)]
+        while stack and len(results) < limit:
+            node, key = stack.pop()
+            final, edges = self.nodes[node]
+            if final:
+                results.append((key, rank))
+                rank += 1
+            # Reversed so the smallest char is popped first
+            for char, child in reversed(list(edges.items())):
+                stack.append((child, key + char))
+        return results
+
+    def to_json(self) -> List[list]:
+        """
+        Nodes as [final, label, child, label, child, ...]
+
+        Runs of non-final single-child states (the unique tail of most keys)
+        are folded into multi-character edge labels, so only branching and
+        final states are written.
+        """
+        kept, order = {0: 0}, [0]
+        rows = []
+        for node in order:
+            final, edges = self.nodes[node]
+            row = [int(final)]
+            for char, child in edges.items():
+                label = char
+                while not self.nodes[child][0] and len(self.nodes[child][1]) == 1:
+                    (next_char, next_child), = self.nodes[child][1].items()
+                    label += next_char
+                    child = next_child
+                if child not in kept:
+                    kept[child] = len(order)
+                    order.append(child)
+                row += [label, kept[child]]
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def from_json(cls, data: List[list]) -> 'Dawg':
+        """Read to_json() output, unfolding edge labels back into states"""
+        nodes = [(bool(row[0]), {}) for row in data]
+        for row, (_, edges) in zip(data, list(nodes)):
+            for label, child in zip(row[1::2], row[2::2]):
+                parent = edges
+                for char in label[:-1]:
+                    nodes.append((False, {}))
+                    parent[char] = len(nodes) - 1
+                    parent = nodes[-1][1]
+                parent[label[-1]] = child
+        return cls(nodes)
+
+
+def opening(text: str) -> str:
+    """First pada of a sloka (up to the first danda or line break)"""
+    text = BRACKETS_RE.sub('', text).strip()
+    match = OPENING_RE.match(text)
+    return ' '.join(match.group(0).split())[:LABEL_LENGTH]
+
+
+def iter_entries(corpus: Corpus) -> Iterator[Tuple[str, Target]]:
+    """
+    (key, target) for every name and sloka opening, in both scripts
+
+    Targets are (collection, page path within the collection, label)
+    """
+    for record in corpus.records():
+        text = record.text
+        label = ' '.join(text.split()) if record.collection.name == 'naamani' else opening(text)
+        if not label:
+            continue
+        path = f"{record.section}/{record.number}" if record.section else str(record.number)
+        target = (record.collection.name, path, label[:LABEL_LENGTH])
+        for key in (devanagari_key(label), latin_key(to_iast(label))):
+            if key:
+                yield key, target
+
+
+class Autocomplete:
+    """
+    Prefix search over all collections
+
+    Args:
+        shards: First char -> (Dawg, targets by rank)
+    """
+
+    def __init__(self, shards: Dict[str, Tuple[Dawg, List[List[Target]]]]):
+        self.shards = shards
+
+    @classmethod
+    def build(cls, corpus: Optional[Corpus] = None) -> 'Autocomplete':
+        """Index every name and sloka opening in the corpus"""
+        corpus = corpus or Corpus(cache_size=0)
+        targets: Dict[str, List[Target]] = defaultdict(list)
+        for key, target in iter_entries(corpus):
+            if target not in targets[key]:
+                targets[key].append(target)
+
+        by_shard: Dict[str, List[str]] = defaultdict(list)
+        for key in sorted(targets):
+            by_shard[key[0]].append(key)
+
+        return cls({
+            char: (Dawg.build(keys), [targets[key] for key in keys])
+            for char, keys in by_shard.items()
+        })
+
+    def __len__(self) -> int:
+        return sum(len(dawg) for dawg, _ in self.shards.values())
+
+    def complete(self, query: str, limit: int = 10) -> List[Tuple[str, List[Target]]]:
+        """
+        Names and slokas whose key starts with the query
+
+        Args:
+            query: Devanagari, IAST or plain Latin text
+            limit: Maximum number of keys
+
+        Returns:
+            List of (key, [(collection, path, label), ...])
+        """
+        key = query_key(query)
+        if not key or key[0] not in self.shards:
+            return []
+        dawg, values = self.shards[key[0]]
+        return [(match, values[rank]) for match, rank in dawg.complete(key, limit)]
+
+    def lookup(self, query: str) -> List[Target]:
+        """Targets of an exact key"""
+        key = query_key(query)
+        if not key or key[0] not in self.shards:
+            return []
+        dawg, values = self.shards[key[0]]
+        rank = dawg.rank(key)
+        return values[rank] if rank is not None else []
+
+    def save(self, directory: Path) -> Dict:
+        """
+        Write index.json and one file per shard
+
+        Targets are stored as [collection index, path, label].
+
+        Returns:
+            The index.json content
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        collections = sorted({t[0] for _, values in self.shards.values() for ts in values for t in ts})
+        position = {name: i for i, name in enumerate(collections)}
+
+        shards = {}
+        for char, (dawg, values) in sorted(self.shards.items()):
+            name = f"{ord(char):04x}.json"
+            data = {
+                'nodes': dawg.to_json(),
+                'values': [[[position[c], path, label] for c, path, label in ts] for ts in values]
+            }
+            write_json(directory / name, data)
+            shards[char] = {'file': name, 'keys': len(dawg)}
+
+        for stale in directory.glob('*.json'):
+            if stale.name != 'index.json' and stale.name not in {s['file'] for s in shards.values()}:
+                stale.unlink()
+
+        index = {'max_key': MAX_KEY_LENGTH, 'collections': collections, 'shards': shards}
+        write_json(directory / 'index.json', index)
+        return index
+
+    @classmethod
+    def load(cls, directory: Path) -> 'Autocomplete':
+        """Read an index written by save()"""
+        with open(directory / 'index.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        shards = {}
+        for char, shard in index['shards'].items():
+            with open(directory / shard['file'], 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            values = [[(index['collections'][c], path, label) for c, path, label in ts] for ts in data['values']]
+            shards[char] = (Dawg.from_json(data['nodes']), values)
+        return cls(shards)
+
+
+def write_json(path: Path, data) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def inject_script(root: Path) -> int:
+    """
+    Add the autocomplete.js <script> to pages with a #searchBox
+
+    Returns:
+        Number of files changed
+    """
+    from hoist_assets import find_pages, group_pages
+
+    changed = 0
+    for real, served in group_pages(root, find_pages(root)).items():
+        with open(real, 'r', encoding='utf-8') as f:
+            html = f.read()
+        if 'id="searchBox"' not in html or CLIENT_SCRIPT.name in html or '</body>' not in html:
+            continue
+
+        href = Path(os.path.relpath(root / CLIENT_SCRIPT, served[0].parent)).as_posix()
+        end = html.rindex('</body>')
+        line_start = html.rfind('\n', 0, end) + 1
+        indent = '    ' if html[line_start:end].strip() == '' else ''
+        html = html[:line_start] + f'{indent}<script src="{href}" defer></script>\n' + html[line_start:]
+
+        tmp = f"{real}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp, real)
+        changed += 1
+    return changed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Build the cross-collection autocomplete index'
+    )
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Site root (default: repository root)')
+    parser.add_argument('--inject', action='store_true',
+                       help='Add the autocomplete script to every page with a search box')
+    parser.add_argument('--query', help='Print completions for this text and exit')
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    index = Autocomplete.build(Corpus(root, cache_size=0))
+
+    if args.query:
+        for key, targets in index.complete(args.query):
+            for collection, path, label in targets:
+                print(f"  {key:<34} {collection}/{path}  {label}")
+        return
+
+    manifest = index.save(root / INDEX_DIR)
+    if args.inject:
+        print(f"Added autocomplete to {inject_script(root)} page(s)")
+
+    sizes = sorted((root / INDEX_DIR / s['file']).stat().st_size for s in manifest['shards'].values())
+    nodes = sum(len(dawg.nodes) for dawg, _ in index.shards.values())
+    print(f"\n{'='*60}")
+    print(f"Keys: {len(index)} in {len(sizes)} shards ({nodes} DAWG states)")
+    print(f"Shard size: median {sizes[len(sizes) // 2] / 1024:.1f} KB, largest {sizes[-1] / 1024:.1f} KB")
+    print(f"Total: {sum(sizes) / 1024:.0f} KB")
+    print(f"Output: {root / INDEX_DIR}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Crash-safe batched file rewrites
+Outputs are staged to fsynced temp files next to their targets and renamed
+into place in batches, with the directory fsyncs shared by the batch,
+instead of opening each file in place with 'w' (which leaves a truncated
+file if the run is interrupted).
+
+A journal lists every rename of the batch in progress, with a hard-link
+backup of each original, so an interrupted batch can be rolled forward
+(finish the renames) or back (restore the originals):
+
+    python3 tools/batch_write.py --recover forward .batch-journal.json
+
+Usage:
+
+    with BatchWriter(journal=root / '.batch-journal.json') as writer:
+        for path in paths:
+            writer.write(path, new_text)    # staged; committed every batch_size files
+
+With dry_run=True nothing is written and a unified diff is printed instead.
+"""
+
+import os
+import sys
+import json
+import difflib
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Union
+
+import instrument
+
+DEFAULT_BATCH_SIZE = 500
+JOURNAL_NAME = '.batch-journal.json'
+
+
+def _fsync_directory(directory: Union[str, Path]) -> None:
+    """Persist renames in a directory (no-op where directories can't be opened)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _sibling(path: str, suffix: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{suffix}")
+
+
+def _target(path: Union[str, Path]) -> str:
+    """The file a rename must replace: a symlink's target rather than the link"""
+    path = os.fspath(path)
+    return os.path.realpath(path) if os.path.islink(path) else path
+
+
+def atomic_write(path: Union[str, Path], content: str) -> None:
+    """Replace one file via temp file + rename (no journal, no batching)"""
+    path = _target(path)
+    tmp = _sibling(path, f"{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    try:
+        os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+    os.replace(tmp, path)
+    _fsync_directory(os.path.dirname(path) or '.')
+
+
+class BatchWriter:
+    """
+    Stage file rewrites and commit them atomically in batches
+
+    Args:
+        journal: Journal file for crash recovery (default: .batch-journal.json
+                 in the current directory)
+        batch_size: Files per batch
+        dry_run: Write nothing; print a unified diff of each staged change
+        diff_out: Stream for the dry-run diff (default: stdout)
+        root: Paths in the diff are shown relative to this directory
+    """
+
+    def __init__(self, journal: Union[str, Path, None] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 dry_run: bool = False, diff_out: Optional[TextIO] = None,
+                 root: Union[str, Path, None] = None):
+        self.journal = Path(journal) if journal else Path.cwd() / JOURNAL_NAME
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.diff_out = diff_out or sys.stdout
+        self.root = str(Path(root).resolve()) if root else None
+        self.staged: Dict[str, str] = {}
+        self.committed = 0
+        self.batches = 0
+
+        if self.journal.exists() and not dry_run:
+            raise RuntimeError(
+                f"Unfinished batch in {self.journal}; run "
+                f"'python3 tools/batch_write.py --recover forward|back {self.journal}' first"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def write(self, path: Union[str, Path], content: str) -> None:
+        """
+        Stage new content for a file
+
+        Symlinks are resolved so the file they point to is replaced, as
+        open(path, 'w') would. Content is written as given, without newline
+        translation, so CRLF files stay CRLF. Staging the same file twice
+        keeps the last content.
+        """
+        path = _target(path)
+
+        if self.dry_run:
+            self._diff(path, content)
+            return
+
+        tmp = _sibling(path, f"{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        self.staged[path] = tmp
+
+        if len(self.staged) >= self.batch_size:
+            self.commit()
+
+    def _diff(self, path: str, content: str) -> None:
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                old = f.read()
+        except FileNotFoundError:
+            old = ''
+        name = path
+        if self.root and path.startswith(self.root + os.sep):
+            name = path[len(self.root) + 1:]
+        self.diff_out.writelines(difflib.unified_diff(
+            old.splitlines(keepends=True), content.splitlines(keepends=True),
+            fromfile=f"a/{name}", tofile=f"b/{name}"
+        ))
+        self.committed += 1
+
+    def commit(self) -> int:
+        """
+        Rename the staged batch into place
+
+        Returns:
+            Number of files replaced
+        """
+        if not self.staged:
+            return 0
+
+        with instrument.span('commit', files=len(self.staged)):
+            entries = []
+            for path, tmp in self.staged.items():
+                try:
+                    mode = os.stat(path).st_mode
+                except FileNotFoundError:
+                    backup = None
+                else:
+                    os.chmod(tmp, mode & 0o7777)
+                    backup = _sibling(path, 'bak')
+                    try:
+                        os.link(path, backup)
+                    except FileExistsError:
+                        os.unlink(backup)
+                        os.link(path, backup)
+                entries.append({'path': path, 'tmp': tmp, 'backup': backup})
+
+            # Staged data was fsynced in write(); the backup links must be on
+            # disk too before the journal says "renaming"
+            directories = {os.path.dirname(entry['path']) for entry in entries}
+            for directory in directories:
+                _fsync_directory(directory)
+            _write_journal(self.journal, entries)
+
+            for entry in entries:
+                os.replace(entry['tmp'], entry['path'])
+            for directory in directories:
+                _fsync_directory(directory)
+
+            # Renames are durable: the batch can no longer be rolled back
+            self.journal.unlink()
+            _fsync_directory(self.journal.parent)
+            for entry in entries:
+                if entry['backup']:
+                    os.unlink(entry['backup'])
+
+        count = len(entries)
+        self.committed += count
+        self.batches += 1
+        self.staged = {}
+        return count
+
+    def discard(self) -> None:
+        """Drop the staged (not yet committed) batch"""
+        for tmp in self.staged.values():
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+        self.staged = {}
+
+
+def _write_journal(journal: Path, entries: List[Dict]) -> None:
+    tmp = journal.with_name(journal.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'entries': entries}, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, journal)
+    _fsync_directory(journal.parent)
+
+
+def recover(journal: Union[str, Path], direction: str) -> Dict[str, int]:
+    """
+    Finish or undo an interrupted batch
+
+    Args:
+        journal: Journal file left by the interrupted run
+        direction: 'forward' (apply the staged files) or 'back' (restore originals)
+
+    Returns:
+        {'replaced': n, 'restored': n, 'files': n}
+    """
+    if direction not in ('forward', 'back'):
+        raise ValueError(f"Unknown direction: {direction} (expected forward or back)")
+
+    journal = Path(journal)
+    with open(journal, 'r', encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+
+    replaced = restored = 0
+    for entry in entries:
+        path, tmp = Path(entry['path']), Path(entry['tmp'])
+        backup = Path(entry['backup']) if entry['backup'] else None
+
+        if direction == 'forward':
+            if tmp.exists():
+                os.replace(tmp, path)
+                replaced += 1
+            if backup and backup.exists():
+                backup.unlink()
+        elif tmp.exists():
+            # Not renamed yet: the original is still in place
+            tmp.unlink()
+            if backup and backup.exists():
+                backup.unlink()
+        elif backup and backup.exists():
+            os.replace(backup, path)
+            restored += 1
+        elif not backup and path.exists():
+            # New file that was already renamed into place
+            path.unlink()
+            restored += 1
+
+    for directory in {Path(entry['path']).parent for entry in entries}:
+        _fsync_directory(directory)
+    journal.unlink()
+    _fsync_directory(journal.parent)
+    return {'replaced': replaced, 'restored': restored, 'files': len(entries)}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Recover from an interrupted batch rewrite'
+    )
+    parser.add_argument('journal', nargs='?', default=JOURNAL_NAME,
+                       help=f'Journal file (default: {JOURNAL_NAME})')
+    parser.add_argument('--recover', choices=['forward', 'back'], required=True,
+                       help='forward: finish the interrupted renames; back: restore the originals')
+
+    args = parser.parse_args()
+
+    if not Path(args.journal).exists():
+        print(f"No journal found: {args.journal} (nothing to recover)")
+        return
+
+    result = recover(args.journal, args.recover)
+    if args.recover == 'forward':
+        print(f"Rolled forward: {result['replaced']} of {result['files']} file(s) replaced")
+    else:
+        print(f"Rolled back: {result['restored']} of {result['files']} file(s) restored "
+              f"(the rest were never replaced)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed names index used by naamani/index.html
+Reads Data/naamani.json and writes Data/naamani-index.json with:
+- the names and meanings as flat arrays (in number order)
+- the alphabetical order (Sanskrit varnamala collation) as a list of numbers
+- letter facets: letter -> name numbers, and the letter order by
+  varnamala and by frequency
+
+The page then sorts and filters with array lookups instead of calling
+localeCompare on every load and every sort toggle.
+"""
+
+import json
+from pathlib import Path
+
+from devanagari import collation_key, initial_letter, VARNAMALA
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+NAMES_FILE = REPO_ROOT / 'Data' / 'naamani.json'
+INDEX_FILE = REPO_ROOT / 'Data' / 'naamani-index.json'
+
+
+def build_index(names):
+    """
+    Build the index structure from the entries of naamani.json
+
+    Args:
+        names: List of {'number', 'name', 'meaning'} dicts
+
+    Returns:
+        Dict ready to be written as JSON
+    """
+    names = sorted(names, key=lambda item: item['number'])
+
+    alphabetical = sorted(names, key=lambda item: (collation_key(item['name']), item['number']))
+
+    facets = {}
+    for item in names:
+        facets.setdefault(initial_letter(item['name']), []).append(item['number'])
+
+    def varnamala_position(letter):
+        return VARNAMALA.index(letter) if letter in VARNAMALA else len(VARNAMALA)
+
+    by_alpha = sorted(facets, key=lambda letter: (varnamala_position(letter), collation_key(letter)))
+    by_count = sorted(by_alpha, key=lambda letter: -len(facets[letter]))
+
+    return {
+        'numbers': [item['number'] for item in names],
+        'names': [item['name'] for item in names],
+        'meanings': [item.get('meaning', '') for item in names],
+        'order': {
+            'alphabetical': [item['number'] for item in alphabetical]
+        },
+        'letters': {
+            'alpha': by_alpha,
+            'count': by_count
+        },
+        'facets': {letter: facets[letter] for letter in by_alpha}
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Precompute name orderings and letter facets for the names list page'
+    )
+    parser.add_argument('--input', default=str(NAMES_FILE), help='Names file (default: Data/naamani.json)')
+    parser.add_argument('--output', default=str(INDEX_FILE), help='Index file (default: Data/naamani-index.json)')
+
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        names = json.load(f)['names']
+
+    index = build_index(names)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Indexed {len(index['names'])} names under {len(index['facets'])} letters")
+    print(f"Index saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Build the offline precache manifest and service worker for the site
+Writes:
+- precache-manifest.json: the shell tier (home page, collection index
+  pages, shared CSS/JS, names index) and one entry per collection
+- assets/precache/<collection>.<hash>.json: a collection's pages, bundles
+  and mula texts (precached once a page of it is opened) and its
+  commentary files (fetched on demand)
+- assets/precache/<collection>-order.<hash>.json: slices of the reading
+  order (one per chapter directory and block of SLICE_SIZE entries), so
+  the previous/next entry can be found without the whole collection
+- sw.js: a service worker that answers from the cache with
+  stale-while-revalidate and prefetches the previous/next entry
+
+Every file is listed with a content hash, so after a rebuild the worker
+refetches only the entries whose hash changed, including commentaries
+it cached on demand. With --inject, pages that
+don't register the worker yet get a <script> tag for
+assets/js/sw-register.js.
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from corpus import Corpus, REPO_ROOT
+from hoist_assets import find_pages, group_pages, BUNDLE_DIR
+
+MANIFEST_FILE = 'precache-manifest.json'
+WORKER_FILE = 'sw.js'
+COLLECTION_DIR = Path('assets') / 'precache'
+REGISTER_SCRIPT = Path('assets') / 'js' / 'sw-register.js'
+
+SHELL_FILES = [
+    'index.html',
+    'home/styles.css',
+    'assets/css/style.css',
+    'assets/js/sanscript.js',
+    'assets/js/sw-register.js',
+    'assets/js/related-names.js',
+    'assets/js/autocomplete.js',
+    'assets/autocomplete/index.json',
+    'Data/naamani.json',
+    'Data/naamani-index.json',
+    'Data/naamani-related.json',
+]
+
+# Commentaries the pages actually load (Data/tags and SoundaryalahariTeeka aren't used by the site)
+SITE_COMMENTARIES = {
+    'naamani': ['datta', 'mantra', 'balatapa', 'soubhagyabhaskara', 'jayamangala'],
+    'stavaratnam': ['teeka'],
+    'soundaryalahari': ['lakshmidhara', 'kaivalya'],
+    'lalitopaakhyaanam': ['teeka'],
+    'umasahasranama': ['teeka'],
+    'mookapanchasati': ['teeka'],
+}
+
+HASH_LENGTH = 10
+SLICE_SIZE = 100
+
+WORKER_TEMPLATE = r"""// Generated by tools/build_precache.py - do not edit
+const VERSION = '%(version)s';
+const CACHE = 'site-precache';
+const ROOT = new URL('./', self.location).href;
+const MANIFEST_URL = ROOT + '%(manifest)s';
+const HASHES_KEY = ROOT + '__precache__/hashes.json';
+const BATCH = 8;
+const SLICE_SIZE = %(slice_size)d;
+
+// Content-hashed files never change under the same name
+const IMMUTABLE = [ROOT + '%(bundles)s/', ROOT + '%(collections)s/'];
+
+let manifest = null;
+const collections = {};
+const slices = {};
+const warmed = new Set();
+// {url: hash} of the files in the reading-order slices loaded so far
+const fileHashes = new Map();
+
+// Cache keys ignore query strings (the pages add ?t=<timestamp> cache-busters)
+function keyFor(url) {
+    const u = new URL(url);
+    u.search = '';
+    u.hash = '';
+    if (u.pathname.endsWith('/index.html')) {
+        u.pathname = u.pathname.slice(0, -'index.html'.length);
+    }
+    return u.href;
+}
+
+async function getManifest(refresh = false) {
+    if (manifest && !refresh) return manifest;
+    const cache = await caches.open(CACHE);
+    let response = refresh ? null : await cache.match(MANIFEST_URL);
+    if (!response) {
+        response = await fetch(MANIFEST_URL, {cache: 'no-cache'});
+        if (!response.ok) throw new Error('Precache manifest unavailable');
+        await cache.put(MANIFEST_URL, response.clone());
+    }
+    manifest = await response.json();
+    return manifest;
+}
+
+// Updates to the stored hashes run one at a time
+let queue = Promise.resolve();
+function serial(task) {
+    queue = queue.then(task, task);
+    return queue;
+}
+
+async function readHashes(cache) {
+    const stored = await cache.match(HASHES_KEY);
+    return stored ? stored.json() : {};
+}
+
+async function writeHashes(cache, hashes) {
+    await cache.put(HASHES_KEY, new Response(JSON.stringify(hashes), {
+        headers: {'Content-Type': 'application/json'}
+    }));
+}
+
+// Note the hash of a file just cached; writes are batched into one update
+let recorded = null;
+function record(url, hash) {
+    if (!recorded) {
+        recorded = {};
+        serial(async () => {
+            const batch = recorded;
+            recorded = null;
+            const cache = await caches.open(CACHE);
+            const hashes = await readHashes(cache);
+            await writeHashes(cache, Object.assign(hashes, batch));
+        });
+    }
+    recorded[url] = hash;
+}
+
+// Fetch entries whose hash changed, and drop cached copies of changed on-demand files
+async function sync(entries, invalidate = {}) {
+    const cache = await caches.open(CACHE);
+    const hashes = await readHashes(cache);
+
+    const stale = Object.entries(entries).filter(([url, hash]) => hashes[url] !== hash);
+    for (let i = 0; i < stale.length; i += BATCH) {
+        await Promise.all(stale.slice(i, i + BATCH).map(async ([url, hash]) => {
+            try {
+                const response = await fetch(ROOT + url, {cache: 'no-cache'});
+                if (response.ok && !response.redirected) {
+                    await cache.put(ROOT + url, response);
+                    hashes[url] = hash;
+                }
+            } catch (error) {
+                // Offline - try again on the next sync
+            }
+        }));
+    }
+
+    for (const [url, hash] of Object.entries(invalidate)) {
+        if (hashes[url] !== undefined && hashes[url] !== hash) {
+            await cache.delete(ROOT + url);
+            delete hashes[url];
+        }
+    }
+
+    await writeHashes(cache, hashes);
+}
+
+function collectionFor(path) {
+    for (const [name, info] of Object.entries(manifest.collections)) {
+        if (path.startsWith(info.prefix)) return name;
+    }
+    return null;
+}
+
+// Content-hashed JSON, cached under its URL; a failed load is retried next time
+function loadJson(loaded, url, prepare = data => data) {
+    if (!loaded[url]) {
+        loaded[url] = (async () => {
+            const cache = await caches.open(CACHE);
+            let response = await cache.match(ROOT + url);
+            if (!response) {
+                response = await fetch(ROOT + url);
+                if (!response.ok) throw new Error(url + ' unavailable');
+                await cache.put(ROOT + url, response.clone());
+            }
+            return prepare(await response.json());
+        })().catch(error => {
+            delete loaded[url];
+            throw error;
+        });
+    }
+    return loaded[url];
+}
+
+function loadCollection(name) {
+    return loadJson(collections, manifest.collections[name].manifest);
+}
+
+// Same key as build_precache.slice_key: chapter directory + block of SLICE_SIZE entries
+function sliceKey(page) {
+    const match = page.match(/^(.*)\/(\d+)\/$/);
+    return match ? match[1] + '/' + Math.floor((match[2] - 1) / SLICE_SIZE) : null;
+}
+
+function loadSlice(url) {
+    return loadJson(slices, url, data => {
+        data.index = new Map(data.entries.map(([page], i) => [page, i]));
+        for (const [, files] of data.entries) {
+            for (const [file, hash] of Object.entries(files)) fileHashes.set(file, hash);
+        }
+        return data;
+    });
+}
+
+// Cache the previous and next entry so sequential reading never waits; a
+// cached copy is refetched when its hash differs from the manifest's
+async function prefetchNeighbors(name, page) {
+    const url = manifest.collections[name].slices[sliceKey(page)];
+    if (!url) return;
+    const data = await loadSlice(url);
+    const i = data.index.get(page);
+    if (i === undefined) return;
+
+    const cache = await caches.open(CACHE);
+    const hashes = await readHashes(cache);
+    for (const j of [i + 1, i - 1]) {
+        if (j < 0 || j >= data.entries.length) continue;
+        const [, files] = data.entries[j];
+        await Promise.all(Object.entries(files).map(async ([file, hash]) => {
+            if (hashes[file] === hash && await cache.match(ROOT + file)) return;
+            try {
+                const response = await fetch(ROOT + file, {cache: 'no-cache'});
+                if (response.ok && !response.redirected) {
+                    await cache.put(ROOT + file, response);
+                    record(file, hash);
+                }
+            } catch (error) {
+                // Offline
+            }
+        }));
+    }
+}
+
+async function warmCollection(name) {
+    if (warmed.has(name)) return;
+    warmed.add(name);
+    const data = await loadCollection(name);
+    await serial(() => sync(data.precache, data.on_demand));
+}
+
+async function afterNavigation(key) {
+    await getManifest();
+    const page = key.slice(ROOT.length);
+    const name = collectionFor(page);
+    if (!name) return;
+    // Neighbours need only their slice; the collection's full list of
+    // files is loaded after them
+    await prefetchNeighbors(name, page);
+    await warmCollection(name);
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const current = await getManifest(true);
+        await serial(() => sync(current.shell));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        for (const name of await caches.keys()) {
+            if (name !== CACHE) await caches.delete(name);
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(ROOT)) return;
+
+    const key = keyFor(request.url);
+    const cacheReady = caches.open(CACHE);
+    const cachedResponse = cacheReady.then(cache => cache.match(key));
+
+    if (IMMUTABLE.some(prefix => key.startsWith(prefix))) {
+        event.respondWith(cachedResponse.then(cached => cached || cacheReady.then(async cache => {
+            const response = await fetch(key);
+            if (response.ok && !response.redirected) await cache.put(key, response.clone());
+            return response;
+        })));
+        return;
+    }
+
+    // Stale-while-revalidate: answer from the cache, refresh in the background
+    const network = cacheReady.then(async cache => {
+        const response = await fetch(key, {cache: 'no-cache'});
+        if (response.ok && !response.redirected) {
+            await cache.put(key, response.clone());
+            const hash = fileHashes.get(key.slice(ROOT.length));
+            if (hash) record(key.slice(ROOT.length), hash);
+        }
+        return response;
+    });
+    // Browsers reject a redirected response to a navigation (/naamani/1 ->
+    // /naamani/1/), so let the browser follow the redirect itself
+    const fresh = network.then(response =>
+        response.redirected && request.mode === 'navigate' ? fetch(request) : response);
+    event.respondWith(cachedResponse.then(cached => cached || fresh));
+    event.waitUntil(network.catch(() => null));
+
+    if (request.mode === 'navigate') {
+        event.waitUntil(afterNavigation(key).catch(() => null));
+    }
+});
+"""
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+
+
+def url_for(path: Path, root: Path) -> str:
+    """Site-relative URL of a file; pages are addressed by their directory"""
+    rel = path.relative_to(root).as_posix()
+    if rel == 'index.html':
+        return ''
+    if rel.endswith('/index.html'):
+        return rel[:-len('index.html')]
+    return rel
+
+
+def hashed(paths: List[Path], root: Path) -> Dict[str, str]:
+    """{url: content hash} for the files that exist"""
+    return {url_for(p, root): file_hash(p) for p in paths if p.is_file()}
+
+
+def shell_tier(root: Path) -> Dict[str, str]:
+    """Home page, collection index pages and shared assets"""
+    paths = [root / f for f in SHELL_FILES]
+    paths += [root / name / 'index.html' for name in SITE_COMMENTARIES]
+    return hashed(paths, root)
+
+
+def slice_key(page: str) -> str:
+    """Reading-order slice of a page URL (sw.js's sliceKey must match)"""
+    parent, _, number = page.rstrip('/').rpartition('/')
+    return f"{parent}/{(int(number) - 1) // SLICE_SIZE}"
+
+
+def collection_manifest(corpus: Corpus, name: str, root: Path, pages: List[Path]) -> Dict:
+    """
+    Tiers and reading order of one collection
+
+    Returns:
+        {'collection', 'precache': {url: hash}, 'on_demand': {url: hash},
+         'entries': [[page url, {url: hash} for the page and its data], ...]}
+    """
+    precache: Dict[str, str] = {}
+    on_demand: Dict[str, str] = {}
+    entries = []
+
+    # Every page of the collection except its index (already in the shell)
+    precache.update(hashed([p for p in pages if p.parent != root / name], root))
+    bundle_dir = root / BUNDLE_DIR
+    if bundle_dir.is_dir():
+        precache.update(hashed([p for p in sorted(bundle_dir.iterdir())
+                                if p.name.startswith((f"{name}.", 'shared.'))], root))
+
+    for record in corpus.records(name):
+        page = record.page_path
+        if not page.exists():
+            continue
+        files = [record.text_path]
+        for kind in SITE_COMMENTARIES[name]:
+            path = record.commentary_path(kind)
+            if path:
+                files.append(path)
+
+        page_url = url_for(page, root)
+        entry = {page_url: precache.get(page_url) or file_hash(page)}
+        precache[url_for(record.text_path, root)] = file_hash(record.text_path)
+        for path in files[1:]:
+            on_demand[url_for(path, root)] = file_hash(path)
+        for path in files:
+            url = url_for(path, root)
+            entry[url] = precache.get(url) or on_demand[url]
+        entries.append([page_url, entry])
+
+    return {'collection': name, 'precache': precache, 'on_demand': on_demand, 'entries': entries}
+
+
+def order_slices(entries: List) -> Dict[str, List]:
+    """
+    Split the reading order into slices by slice_key
+
+    Each slice also holds the entry before and after it, so the first and
+    last pages of a slice still find their neighbours.
+
+    Returns:
+        {slice key: entries}
+    """
+    ranges: Dict[str, List[int]] = {}
+    for i, (page, _) in enumerate(entries):
+        first_last = ranges.setdefault(slice_key(page), [i, i])
+        first_last[1] = i
+    return {key: entries[max(first - 1, 0):last + 2] for key, (first, last) in ranges.items()}
+
+
+def inject_registration(root: Path, pages: List[Path]) -> int:
+    """
+    Add the sw-register.js <script> to pages that don't have it
+
+    Returns:
+        Number of files changed
+    """
+    changed = 0
+    for real, served in group_pages(root, pages).items():
+        with open(real, 'r', encoding='utf-8') as f:
+            html = f.read()
+        if REGISTER_SCRIPT.name in html or '</body>' not in html:
+            continue
+
+        href = Path(os.path.relpath(root / REGISTER_SCRIPT, served[0].parent)).as_posix()
+        end = html.rindex('</body>')
+        line_start = html.rfind('\n', 0, end) + 1
+        indent = '    ' if html[line_start:end].strip() == '' else ''
+        tag = f'{indent}<script src="{href}" defer></script>\n'
+        html = html[:line_start] + tag + html[line_start:]
+
+        tmp = f"{real}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp, real)
+        changed += 1
+    return changed
+
+
+def write_json(path: Path, data: Dict) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_hashed(root: Path, name: str, data: Dict) -> str:
+    """Write data to COLLECTION_DIR/<name>.<content hash>.json and return its URL"""
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    path = COLLECTION_DIR / f"{name}.{digest}.json"
+    write_json(root / path, data)
+    return path.as_posix()
+
+
+def build(root: Path, inject: bool = False) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    Write the manifests and service worker
+
+    Returns:
+        (top-level manifest, {collection: collection manifest})
+    """
+    pages = find_pages(root)
+    if inject:
+        changed = inject_registration(root, pages)
+        print(f"Added service worker registration to {changed} file(s)")
+
+    corpus = Corpus(root)
+    (root / COLLECTION_DIR).mkdir(parents=True, exist_ok=True)
+
+    shell = shell_tier(root)
+    collections = {}
+    details = {}
+    for name in SITE_COMMENTARIES:
+        collection_pages = [p for p in pages if p.relative_to(root).parts[0] == name]
+        data = collection_manifest(corpus, name, root, collection_pages)
+        slices = {}
+        for key, entries in order_slices(data.pop('entries')).items():
+            slices[key] = write_hashed(root, f"{name}-order", {'entries': entries})
+        collections[name] = {'prefix': f"{name}/", 'manifest': write_hashed(root, name, data), 'slices': slices}
+        details[name] = data
+
+    # Drop collection manifests and slices from earlier builds
+    current = {Path(c['manifest']).name for c in collections.values()}
+    current.update(Path(url).name for c in collections.values() for url in c['slices'].values())
+    for old in (root / COLLECTION_DIR).glob('*.json'):
+        if old.name not in current:
+            old.unlink()
+
+    version = hashlib.sha1(json.dumps([shell, collections], sort_keys=True).encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    manifest = {'version': version, 'shell': shell, 'collections': collections}
+    write_json(root / MANIFEST_FILE, manifest)
+
+    worker = WORKER_TEMPLATE % {
+        'version': version,
+        'manifest': MANIFEST_FILE,
+        'bundles': BUNDLE_DIR.as_posix(),
+        'collections': COLLECTION_DIR.as_posix(),
+        'slice_size': SLICE_SIZE,
+    }
+    (root / WORKER_FILE).write_text(worker, encoding='utf-8')
+
+    return manifest, details
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Generate the precache manifest and service worker for offline reading'
+    )
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Site root (default: repository root)')
+    parser.add_argument('--inject', action='store_true',
+                       help='Add the service worker registration script to pages missing it')
+
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    if not (root / 'index.html').exists():
+        print(f"Not a site root: {root}")
+        sys.exit(1)
+
+    manifest, details = build(root, inject=args.inject)
+
+    print(f"\n{'Tier':<28} {'Files':>7}")
+    print(f"{'shell':<28} {len(manifest['shell']):>7}")
+    for name, data in details.items():
+        print(f"{name + ' (collection)':<28} {len(data['precache']):>7}")
+        print(f"{name + ' (on demand)':<28} {len(data['on_demand']):>7}")
+        print(f"{name + ' (order slices)':<28} {len(manifest['collections'][name]['slices']):>7}")
+
+    print(f"\n{'='*60}")
+    print(f"Version: {manifest['version']}")
+    print(f"Manifest: {root / MANIFEST_FILE}")
+    print(f"Service worker: {root / WORKER_FILE}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Build a quotation/citation index from the Soubhagya Bhaskara commentary
+Finds quoted passages (‘…’ and '…') in Data/SoubhagyaBhaskara/NNNN.md and
+the text they are attributed to (तदुक्तं कूर्मपुराणे । '…' / '…' इति श्रुतेः),
+then writes a reverse index (quote -> names, source -> names).
+
+The index keeps a SHA-1 per commentary file, so re-running only re-parses
+files that changed since the last build.
+"""
+
+import re
+import sys
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from devanagari import MATRA_VOWELS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCE_DIR = REPO_ROOT / 'Data' / 'SoubhagyaBhaskara'
+DEFAULT_INDEX = REPO_ROOT / 'Data' / 'citations.json'
+
+INDEX_VERSION = 1
+
+QUOTE_RE = re.compile(r"['‘]([^'‘’\n]{3,800}?)['’]")
+
+# Locative endings of work titles: कूर्मपुराणे -> कूर्मपुराण
+SOURCE_ENDINGS = {
+    'पुराणे': 'पुराण',
+    'तन्त्रे': 'तन्त्र',
+    'सूत्रे': 'सूत्र',
+    'उपनिषदि': 'उपनिषद्',
+    'स्मृतौ': 'स्मृति',
+    'संहितायां': 'संहिता',
+    'संहितायाम्': 'संहिता',
+    'कल्पे': 'कल्प',
+    'आगमे': 'आगम',
+    'रहस्ये': 'रहस्य',
+    'भागवते': 'भागवत',
+    'रामायणे': 'रामायण',
+    'भारते': 'भारत',
+    'स्तोत्रे': 'स्तोत्र',
+    'खण्डे': 'खण्ड',
+    'शतके': 'शतक',
+    'कोशे': 'कोश',
+    'तन्त्रराजे': 'तन्त्रराज',
+    'गीतासु': 'गीता',
+}
+
+# Attributions that follow the quote: '…' इति श्रुतेः / इति स्मृतेः / इति …वचनात्
+TRAILING_SOURCES = {
+    'श्रुतेः': 'श्रुति',
+    'स्मृतेः': 'स्मृति',
+    'श्रुतिः': 'श्रुति',
+    'स्मृतिः': 'स्मृति',
+}
+
+SOURCE_WORD_RE = re.compile(
+    r'([\u0900-\u0963\u0966-\u097F]+?(?:' + '|'.join(sorted(SOURCE_ENDINGS, key=len, reverse=True)) + '))'
+    r'(?:ऽपि|पि)?(?=[\s।॥,]|$)'
+)
+# Words the printed edition hyphenated across lines: महास्व-च्छन्दतन्त्रे
+HYPHEN_RE = re.compile(r'(?<=[\u0900-\u097F])-(?=[\u0900-\u097F])')
+TRAILING_RE = re.compile(
+    r"^[ऀ-ॿ]*\s*इति\s*([ऀ-ॣ०-ॿ]+?(?:वचनात्|सूत्रात्|"
+    + '|'.join(TRAILING_SOURCES) + '))'
+)
+
+# Particles fused onto the title by sandhi: इत्यादिगौडपादीयसूत्रे,
+# यत्तावत्तन्त्रराजे, तदुक्तमापस्तम्बस्मृतौ, दुर्गापदनिरुक्तिर्देवीपुराणे
+LEADING_PARTICLES = (
+    'इत्यादि', 'त्यादि', 'तदुक्तम', 'तावत्', 'तावन्', 'यत्', 'तत्', 'श्री'
+)
+FUSED_PREFIX_RE = re.compile(r'^.*?निरुक्ति[र्स्]्?')
+# What is left of "that sutra" (तत्सूत्रे) once the particle is gone: not a work
+GENERIC_STEMS = ('सूत्र', 'तन्त्र', 'पुराण', 'स्मृति', 'संहिता', 'कल्प', 'आगम', 'खण्ड', 'स्तोत्र')
+
+# How much text before a quote is searched for the source it is attributed to
+LOOKBEHIND = 120
+
+
+def normalize_quote(text: str) -> str:
+    """Collapse whitespace and drop trailing dandas/punctuation"""
+    return ' '.join(text.split()).strip(' ।॥,-–')
+
+
+def _stem(word: str) -> str:
+    for suffix in ('ऽपि', 'पि'):
+        if word.endswith(suffix) and word[:-len(suffix)].endswith(tuple(SOURCE_ENDINGS)):
+            word = word[:-len(suffix)]
+    for ending in sorted(SOURCE_ENDINGS, key=len, reverse=True):
+        if word.endswith(ending):
+            return word[:-len(ending)] + SOURCE_ENDINGS[ending]
+    for ending, stem in TRAILING_SOURCES.items():
+        if word.endswith(ending):
+            return word[:-len(ending)] + stem
+    for ending, stem in (('वचनात्', 'वचन'), ('सूत्रात्', 'सूत्र')):
+        if word.endswith(ending):
+            return word[:-len(ending)] + stem
+    return word
+
+
+def normalize_source(word: str) -> Optional[str]:
+    """
+    Turn an inflected title into its stem: कूर्मपुराणेऽपि -> कूर्मपुराण
+
+    Fused particles are stripped (यत्तावत्तन्त्रराजे -> तन्त्रराज) and so is
+    a trailing वचन after a title (भविष्योत्तरपुराणवचनात् -> भविष्योत्तरपुराण).
+
+    Returns:
+        The stem, or None if only a generic word is left (तत्सूत्रे -> सूत्र)
+    """
+    word = FUSED_PREFIX_RE.sub('', _stem(word))
+    particles = 0
+    while True:
+        # A doubled consonant across the boundary means it isn't a particle (तत्त्व...)
+        particle = next((p for p in LEADING_PARTICLES
+                         if word.startswith(p) and len(word) > len(p) + 1
+                         and not (p[-1] == '्' and word[len(p)] == p[-2] and word[len(p) + 1] == '्')), None)
+        if not particle:
+            break
+        word = word[len(particle):]
+        particles += 1
+    # तदुक्तम् + आपस्तम्ब was written तदुक्तमापस्तम्ब
+    if word[:1] in MATRA_VOWELS:
+        word = MATRA_VOWELS[word[0]] + word[1:]
+
+    if word.endswith('वचन') and word[:-len('वचन')].endswith(tuple(SOURCE_ENDINGS.values())):
+        word = word[:-len('वचन')]
+    if particles and word in GENERIC_STEMS:
+        return None
+    return word
+
+
+def extract_citations(text: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Find quotations and their attributed sources in one commentary
+
+    Returns:
+        List of (quote, source) pairs; source is None when unattributed
+    """
+    citations = []
+
+    for match in QUOTE_RE.finditer(text):
+        quote = normalize_quote(match.group(1))
+        if len(quote) < 3:
+            continue
+
+        source = None
+        before = text[max(0, match.start() - LOOKBEHIND):match.start()]
+        if match.start() > LOOKBEHIND:
+            # Don't start inside a word (च्छन्दतन्त्रे for स्वच्छन्दतन्त्रे)
+            before = before[before.find(' ') + 1:]
+        # Only the current and previous sentence can introduce the quote
+        before = HYPHEN_RE.sub('', '।'.join(before.split('।')[-2:]))
+        candidates = SOURCE_WORD_RE.findall(before)
+        if candidates:
+            source = normalize_source(candidates[-1])
+        else:
+            trailing = TRAILING_RE.match(text[match.end():match.end() + 60])
+            if trailing:
+                source = normalize_source(trailing.group(1))
+
+        citations.append((quote, source))
+
+    return citations
+
+
+def parse_file(path: str) -> Tuple[str, List[Tuple[str, Optional[str]]]]:
+    """Worker: extract citations from one file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return path, extract_citations(f.read())
+
+
+def file_hash(path: Path) -> str:
+    """SHA-1 of a file's bytes"""
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+class CitationIndex:
+    """
+    Reverse index of quotations and sources to name numbers
+
+    On disk, quotes and sources are stored once in tables and everything
+    else refers to them by position:
+
+        {
+          "quotes": ["…", …], "quote_names": [[5, 52], …],
+          "sources": ["कूर्मपुराण", …], "source_names": [[5], …],
+          "files": {"0005": {"sha1": "…", "citations": [[quote_id, source_id|-1], …]}}
+        }
+    """
+
+    def __init__(self):
+        self.files: Dict[str, Dict] = {}
+        self.quote_names: Dict[str, List[int]] = {}
+        self.source_names: Dict[str, List[int]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> 'CitationIndex':
+        """Load a saved index (an empty one if the file doesn't exist)"""
+        index = cls()
+        path = Path(path)
+        if not path.exists():
+            return index
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != INDEX_VERSION:
+            return index
+
+        quotes, sources = data['quotes'], data['sources']
+        for stem, entry in data['files'].items():
+            index.files[stem] = {
+                'sha1': entry['sha1'],
+                'citations': [(quotes[q], sources[s] if s >= 0 else None) for q, s in entry['citations']]
+            }
+        index._rebuild()
+        return index
+
+    def save(self, path: Path) -> None:
+        """Write the index in its compact table form"""
+        quote_ids: Dict[str, int] = {}
+        source_ids: Dict[str, int] = {}
+        files = {}
+
+        for stem in sorted(self.files):
+            entry = self.files[stem]
+            refs = []
+            for quote, source in entry['citations']:
+                q = quote_ids.setdefault(quote, len(quote_ids))
+                s = source_ids.setdefault(source, len(source_ids)) if source else -1
+                refs.append([q, s])
+            files[stem] = {'sha1': entry['sha1'], 'citations': refs}
+
+        data = {
+            'version': INDEX_VERSION,
+            'quotes': list(quote_ids),
+            'quote_names': [self.quote_names[q] for q in quote_ids],
+            'sources': list(source_ids),
+            'source_names': [self.source_names[s] for s in source_ids],
+            'files': files
+        }
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    def update(self, source_dir: Path, workers: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Re-parse new or changed commentary files
+
+        Returns:
+            (files parsed, files removed)
+        """
+        current = {p.stem: p for p in sorted(Path(source_dir).glob('[0-9]*.md'))}
+        hashes = {stem: file_hash(p) for stem, p in current.items()}
+
+        removed = [stem for stem in self.files if stem not in current]
+        for stem in removed:
+            del self.files[stem]
+
+        changed = [stem for stem in current
+                   if self.files.get(stem, {}).get('sha1') != hashes[stem]]
+
+        if changed:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                paths = [str(current[stem]) for stem in changed]
+                for path, citations in pool.map(parse_file, paths, chunksize=32):
+                    stem = Path(path).stem
+                    self.files[stem] = {'sha1': hashes[stem], 'citations': citations}
+
+        self._rebuild()
+        return len(changed), len(removed)
+
+    def _rebuild(self) -> None:
+        """Derive the quote/source -> names maps from the per-file entries"""
+        quote_names: Dict[str, set] = {}
+        source_names: Dict[str, set] = {}
+
+        for stem, entry in self.files.items():
+            number = int(stem)
+            for quote, source in entry['citations']:
+                quote_names.setdefault(quote, set()).add(number)
+                if source:
+                    source_names.setdefault(source, set()).add(number)
+
+        self.quote_names = {q: sorted(n) for q, n in quote_names.items()}
+        self.source_names = {s: sorted(n) for s, n in source_names.items()}
+
+    def names_for_source(self, source: str) -> List[int]:
+        """Names whose commentary cites a work (e.g. 'कूर्मपुराण')"""
+        return self.source_names.get(normalize_source(source), [])
+
+    def names_for_quote(self, text: str) -> List[int]:
+        """Names whose commentary quotes a passage containing `text`"""
+        text = normalize_quote(text)
+        if text in self.quote_names:
+            return self.quote_names[text]
+        names = set()
+        for quote, numbers in self.quote_names.items():
+            if text in quote:
+                names.update(numbers)
+        return sorted(names)
+
+    def citations_for_name(self, number: int) -> List[Tuple[str, Optional[str]]]:
+        """All (quote, source) pairs in one name's commentary"""
+        return list(self.files.get(f"{number:04d}", {}).get('citations', []))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Build the quotation/citation index for the Soubhagya Bhaskara commentary'
+    )
+    parser.add_argument('--source-dir', default=str(DEFAULT_SOURCE_DIR),
+                       help='Commentary directory (default: Data/SoubhagyaBhaskara)')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX),
+                       help='Index file (default: Data/citations.json)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--full', action='store_true', help='Ignore the saved index and re-parse everything')
+    parser.add_argument('--source', help='Look up names citing a work, e.g. कूर्मपुराण')
+    parser.add_argument('--quote', help='Look up names quoting a passage')
+
+    args = parser.parse_args()
+
+    if args.source or args.quote:
+        index = CitationIndex.load(args.index)
+        if args.source:
+            print(f"{args.source}: {index.names_for_source(args.source)}")
+        if args.quote:
+            print(f"{args.quote}: {index.names_for_quote(args.quote)}")
+        return
+
+    if not Path(args.source_dir).is_dir():
+        print(f"Directory not found: {args.source_dir}")
+        sys.exit(1)
+
+    index = CitationIndex() if args.full else CitationIndex.load(args.index)
+    parsed, removed = index.update(Path(args.source_dir), workers=args.workers)
+    index.save(args.index)
+
+    total = sum(len(e['citations']) for e in index.files.values())
+    print(f"Parsed {parsed} file(s), removed {removed}, {len(index.files) - parsed} unchanged")
+    print(f"{total} citations, {len(index.quote_names)} distinct quotes, {len(index.source_names)} sources")
+    print(f"Index saved: {args.index}")
+
+
+if __name__ == '__main__':
+    main()
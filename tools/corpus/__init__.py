@@ -0,0 +1,17 @@
+"""
+Shared access to every collection in the repository
+
+    from corpus import Corpus
+
+    corpus = Corpus()
+    for record in corpus.records('umasahasranama'):
+        print(record.key, record.text)
+
+Collections: naamani, stavaratnam, soundaryalahari, lalitopaakhyaanam,
+umasahasranama and mookapanchasati, each with its Data/* commentaries.
+"""
+
+from .corpus import Corpus, COLLECTIONS, REPO_ROOT
+from .records import Collection, Record
+
+__all__ = ['Corpus', 'Collection', 'Record', 'COLLECTIONS', 'REPO_ROOT']
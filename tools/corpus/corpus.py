@@ -0,0 +1,156 @@
+"""
+Corpus: one access path to every collection and its commentaries
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .records import Collection, Record
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# name -> (text directory, commentaries, section depth, global commentary numbering)
+LAYOUTS = {
+    'naamani': ('Data/Naamavali', {
+        'mantra': ('Data/Mantra', '.txt'),
+        'balatapa': ('Data/Balatapa', '.txt'),
+        'soubhagyabhaskara': ('Data/SoubhagyaBhaskara', '.md'),
+        'jayamangala': ('Data/Jayamangala', '.md'),
+        'datta': ('Data/DattaCommentary', '.json'),
+        'tags': ('Data/tags', '.yaml'),
+    }, 0, False),
+    'stavaratnam': ('lalitastavaratnam', {
+        'teeka': ('StavaratnaTeeka', '.md'),
+    }, 0, False),
+    'soundaryalahari': ('soundaryalahari', {
+        'lakshmidhara': ('Data/LakshmidharaSoundaryaLahari', '.txt'),
+        'kaivalya': ('Data/KaivalyaSoundaryaLahari', '.txt'),
+        'teeka': ('SoundaryalahariTeeka', '.md'),
+    }, 0, False),
+    'lalitopaakhyaanam': ('lalitopaakhyaanam', {
+        'teeka': ('Data/LalitopaakhyaanamTeeka', '.txt'),
+    }, 1, True),
+    'umasahasranama': ('umasahasranama', {
+        'teeka': ('Data/UmaSahasranamaTeeka', '.txt'),
+    }, 2, False),
+    'mookapanchasati': ('mookapanchasati', {
+        'teeka': ('Data/MookaPanchasatiTeeka', '.txt'),
+    }, 1, False),
+}
+
+COLLECTIONS = list(LAYOUTS)
+
+
+class Corpus:
+    """
+    Lazy view over all collections
+
+    Records are cheap handles; text is only read when asked for, and the
+    most recently used decoded files are kept in a bounded LRU cache.
+
+    Args:
+        root: Repository root (default: this checkout)
+        cache_size: Number of decoded files kept in memory
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None, cache_size: int = 256):
+        self.root = Path(root) if root else REPO_ROOT
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Path, str]' = OrderedDict()
+        self._collections = {
+            name: Collection(self.root, name, text_dir, commentaries, depth, global_numbers)
+            for name, (text_dir, commentaries, depth, global_numbers) in LAYOUTS.items()
+        }
+
+    def __repr__(self):
+        return f"Corpus({str(self.root)!r})"
+
+    @property
+    def collections(self) -> List[str]:
+        return list(self._collections)
+
+    def collection(self, name: str) -> Collection:
+        """Layout of one collection"""
+        try:
+            return self._collections[name]
+        except KeyError:
+            raise KeyError(f"Unknown collection: {name} (expected one of {', '.join(COLLECTIONS)})")
+
+    def records(self, collection: Optional[str] = None) -> Iterator[Record]:
+        """All records of one collection (or of every collection), in directory order"""
+        names = [collection] if collection else self.collections
+        for name in names:
+            layout = self.collection(name)
+            for section, number in layout.iter_keys():
+                yield Record(self, layout, section, number)
+
+    def get(self, collection: str, number: int, section: Optional[str] = None) -> Optional[Record]:
+        """A single record, or None if its text file doesn't exist"""
+        record = Record(self, self.collection(collection), section, number)
+        return record if record.text_path.exists() else None
+
+    def record_for_page(self, html_path: Union[str, Path]) -> Optional[Record]:
+        """
+        The record an individual page belongs to
+
+        e.g. umasahasranama/shataka-01/stabaka-02/7/index.html
+        -> the record for umasahasranama/shataka-01/stabaka-02/0007.txt
+        """
+        parts = Path(html_path).parts
+        for i, part in enumerate(parts):
+            if part in self._collections:
+                layout = self._collections[part]
+                found = layout.section_for_page_parts(list(parts[i + 1:]))
+                if found:
+                    return self.get(part, found[1], found[0])
+        return None
+
+    def read(self, path: Union[str, Path]) -> str:
+        """Decoded file contents, through the LRU cache"""
+        path = Path(path)
+        if path in self._cache:
+            self._cache.move_to_end(path)
+            return self._cache[path]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        self._cache[path] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def invalidate(self, path: Union[str, Path, None] = None) -> None:
+        """Drop one file (or everything) from the cache, e.g. after rewriting it"""
+        if path is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(Path(path), None)
+
+    def iter_texts(self, collection: Optional[str] = None,
+                   kind: Optional[str] = None) -> Iterator[Tuple[Record, str]]:
+        """
+        Stream (record, text) pairs for a bulk pass
+
+        Files are read in directory order and bypass the cache, so a full
+        pass over the corpus doesn't evict the working set.
+
+        Args:
+            collection: Limit to one collection
+            kind: Commentary kind to read instead of the mula text; records
+                  without that commentary are skipped
+        """
+        for record in self.records(collection):
+            path = record.text_path if kind is None else record.commentary_path(kind)
+            if path is None:
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                yield record, f.read()
+
+    def counts(self) -> Dict[str, int]:
+        """Number of records per collection"""
+        return {
+            name: sum(len(layout.numbers(section)) for section in layout.sections())
+            for name, layout in self._collections.items()
+        }
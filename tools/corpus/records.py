@@ -0,0 +1,162 @@
+"""
+Record and collection types for the corpus
+
+Records only hold their collection, section and number; file paths are
+derived from the collection layout and text is loaded on demand through
+the owning Corpus, so thousands of records stay small in memory.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+class Record:
+    """One name or sloka in a collection"""
+
+    __slots__ = ('corpus', 'collection', 'section', 'number')
+
+    def __init__(self, corpus, collection: 'Collection', section: Optional[str], number: int):
+        self.corpus = corpus
+        self.collection = collection
+        self.section = section
+        self.number = number
+
+    def __repr__(self):
+        return f"Record({self.key!r})"
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, e.g. 'umasahasranama/shataka-01/stabaka-02/7'"""
+        parts = [self.collection.name, self.section, str(self.number)]
+        return '/'.join(p for p in parts if p)
+
+    @property
+    def text_path(self) -> Path:
+        """Path of the mula text (name or sloka)"""
+        return self.collection.text_path(self)
+
+    @property
+    def page_path(self) -> Path:
+        """Path of the generated index.html for this record"""
+        return self.collection.page_path(self)
+
+    @property
+    def text(self) -> str:
+        """Mula text, read lazily through the corpus cache"""
+        return self.corpus.read(self.text_path)
+
+    def commentary_path(self, kind: str) -> Optional[Path]:
+        """Path of a commentary (see Collection.commentaries), if it exists"""
+        path = self.collection.commentary_path(self, kind)
+        return path if path is not None and path.exists() else None
+
+    def commentary(self, kind: str) -> Optional[str]:
+        """Commentary text, or None if this record has none of that kind"""
+        path = self.commentary_path(kind)
+        return self.corpus.read(path) if path else None
+
+    def commentaries(self) -> Dict[str, Path]:
+        """All existing commentary files of this record by kind"""
+        paths = {kind: self.commentary_path(kind) for kind in self.collection.commentaries}
+        return {kind: path for kind, path in paths.items() if path}
+
+
+class Collection:
+    """
+    File layout of one collection
+
+    Args:
+        name: Collection name (also the site directory under the root)
+        text_dir: Directory holding the NNNN.txt mula files (per section)
+        commentaries: Commentary kind -> (directory, extension)
+        section_depth: How many directory levels make up a section
+        global_commentary_numbers: Commentary files are numbered across the
+            whole collection rather than per section
+    """
+
+    __slots__ = ('root', 'name', 'text_dir', 'commentaries', 'section_depth',
+                 'global_commentary_numbers', '_sections', '_offsets')
+
+    def __init__(self, root: Path, name: str, text_dir: str,
+                 commentaries: Dict[str, tuple], section_depth: int = 0,
+                 global_commentary_numbers: bool = False):
+        self.root = root
+        self.name = name
+        self.text_dir = text_dir
+        self.commentaries = commentaries
+        self.section_depth = section_depth
+        self.global_commentary_numbers = global_commentary_numbers
+        self._sections = None
+        self._offsets = None
+
+    def __repr__(self):
+        return f"Collection({self.name!r})"
+
+    def sections(self) -> List[Optional[str]]:
+        """Section paths in directory order ([None] for flat collections)"""
+        if self._sections is None:
+            if not self.section_depth:
+                self._sections = [None]
+            else:
+                base = self.root / self.text_dir
+                pattern = '/'.join(['*'] * self.section_depth)
+                self._sections = sorted(
+                    p.relative_to(base).as_posix() for p in base.glob(pattern) if p.is_dir()
+                )
+        return self._sections
+
+    def numbers(self, section: Optional[str]) -> List[int]:
+        """Record numbers in one section, from its NNNN.txt files"""
+        directory = self.root / self.text_dir / (section or '')
+        if not directory.is_dir():
+            return []
+        return sorted(
+            int(entry.stem) for entry in directory.iterdir()
+            if entry.suffix == '.txt' and entry.stem.isdigit()
+        )
+
+    def text_path(self, record: Record) -> Path:
+        """Path of a record's NNNN.txt"""
+        return self.root / self.text_dir / (record.section or '') / f"{record.number:04d}.txt"
+
+    def page_path(self, record: Record) -> Path:
+        """Path of a record's generated page"""
+        return self.root / self.name / (record.section or '') / str(record.number) / 'index.html'
+
+    def commentary_path(self, record: Record, kind: str) -> Optional[Path]:
+        """Path a record's commentary of the given kind would have"""
+        if kind not in self.commentaries:
+            return None
+        directory, extension = self.commentaries[kind]
+        number = record.number
+        if self.global_commentary_numbers:
+            number += self._section_offsets()[record.section]
+        return self.root / directory / (record.section or '') / f"{number:04d}{extension}"
+
+    def _section_offsets(self) -> Dict[Optional[str], int]:
+        """Number of records before each section, for globally numbered commentaries"""
+        if self._offsets is None:
+            self._offsets = {}
+            total = 0
+            for section in self.sections():
+                self._offsets[section] = total
+                total += len(self.numbers(section))
+        return self._offsets
+
+    def section_for_page_parts(self, parts: List[str]) -> Optional[tuple]:
+        """
+        Map index.html path parts below the collection directory to
+        (section, number), e.g. ['shataka-01', 'stabaka-02', '7', 'index.html']
+        """
+        if len(parts) != self.section_depth + 2 or parts[-1] != 'index.html':
+            return None
+        if not parts[-2].isdigit():
+            return None
+        section = '/'.join(parts[:self.section_depth]) or None
+        return section, int(parts[-2])
+
+    def iter_keys(self) -> Iterator[tuple]:
+        """(section, number) for every record, in directory order"""
+        for section in self.sections():
+            for number in self.numbers(section):
+                yield section, number
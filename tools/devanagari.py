@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Devanagari text helpers shared by the corpus tools
+Splits text into grapheme clusters (aksharas) so conjuncts, matras and
+virama are handled as single units instead of raw code points, and
+normalizes OCR and hand-entered text (see normalize())
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import List, Optional
+
+CONSONANT = r'[\u0915-\u0939\u0958-\u095F\u0978-\u097F]\u093C?'
+VOWEL = r'[\u0904-\u0914\u0960\u0961\u0972-\u0977]'
+VIRAMA = r'\u094D'
+JOINER = r'[\u200C\u200D]'
+MATRA = r'[\u093A\u093B\u093E-\u094C\u094E\u094F\u0955-\u0957\u0962\u0963]'
+MODIFIER = r'[\u0900-\u0903\u0951-\u0954\u1CD0-\u1CFF\uA8E0-\uA8F1]'
+DANDAS = r'\u0964\u0965'
+
+# One akshara: a run of consonants joined by virama, ending either in a
+# dead consonant (trailing virama) or an optional matra, followed by any
+# anusvara / visarga / accent marks. Anything else is its own cluster,
+# together with whatever combining marks follow it.
+GRAPHEME_RE = re.compile(
+    f'(?:{CONSONANT}{VIRAMA}{JOINER}?)*{CONSONANT}(?:{VIRAMA}{JOINER}?|{MATRA}*){MODIFIER}*'
+    f'|{VOWEL}{MODIFIER}*'
+    f'|.{MODIFIER}*',
+    re.DOTALL
+)
+
+WORD_RE = re.compile(rf'[{DANDAS}]+|[^\s{DANDAS}]+')
+
+DEVANAGARI_RE = re.compile(r'[\u0900-\u097F\u1CD0-\u1CFF\uA8E0-\uA8FF]')
+
+
+def graphemes(text: str) -> List[str]:
+    """
+    Split text into Devanagari grapheme clusters
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of clusters, e.g. 'श्रीमाता' -> ['श्री', 'मा', 'ता']
+    """
+    return GRAPHEME_RE.findall(text)
+
+
+def words(text: str) -> List[str]:
+    """
+    Split text into words, keeping dandas as separate tokens
+    """
+    return WORD_RE.findall(text)
+
+
+def is_devanagari(char: str) -> bool:
+    """Check whether a character belongs to the Devanagari blocks"""
+    return bool(DEVANAGARI_RE.match(char))
+
+
+# Varnamala order used for collation: vowels, anusvara/visarga, consonants
+VOWELS = 'अआइईउऊऋॠऌॡएऐओऔ'
+MATRA_VOWELS = {
+    'ा': 'आ', 'ि': 'इ', 'ी': 'ई', 'ु': 'उ', 'ू': 'ऊ', 'ृ': 'ऋ', 'ॄ': 'ॠ',
+    'ॢ': 'ऌ', 'ॣ': 'ॡ', 'े': 'ए', 'ै': 'ऐ', 'ो': 'ओ', 'ौ': 'औ'
+}
+CONSONANTS = 'कखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसहळ'
+# Conjuncts traditionally listed as letters of their own, after ह
+CONJUNCT_LETTERS = ('क्ष', 'त्र', 'ज्ञ')
+VARNAMALA = list(VOWELS) + list(CONSONANTS) + list(CONJUNCT_LETTERS)
+
+_RANKS = {v: 1 + i for i, v in enumerate(VOWELS)}
+_RANKS.update({'ँ': 15, 'ं': 15, 'ः': 16})
+_RANKS.update({c: 20 + i for i, c in enumerate(CONSONANTS)})
+_INHERENT_A = _RANKS['अ']
+
+
+def collation_key(text: str) -> tuple:
+    """
+    Sort key following the Sanskrit varnamala (dictionary order)
+
+    Each consonant is followed by its vowel (the inherent अ unless a matra
+    or virama says otherwise), so क < का < कि < ... < क्क, as in the
+    dictionaries. Characters outside the alphabet are ignored.
+    """
+    ranks = []
+    chars = text.replace('़', '')
+
+    for i, char in enumerate(chars):
+        if char in MATRA_VOWELS:
+            ranks.append(_RANKS[MATRA_VOWELS[char]])
+        elif char in _RANKS:
+            ranks.append(_RANKS[char])
+            if char in CONSONANTS:
+                following = chars[i + 1] if i + 1 < len(chars) else ''
+                if following != '्' and following not in MATRA_VOWELS:
+                    ranks.append(_INHERENT_A)
+
+    return tuple(ranks)
+
+
+def initial_letter(name: str) -> str:
+    """
+    Letter a name is filed under in the names list
+
+    The honorific श्री prefix is skipped (as on the site), and क्ष, त्र and
+    ज्ञ count as letters of their own.
+    """
+    if name.startswith('श्री') and len(name) > len('श्री'):
+        name = name[len('श्री'):].lstrip()
+
+    for letter in CONJUNCT_LETTERS:
+        if name.startswith(letter):
+            return letter
+    return name[:1]
+
+
+# IAST transliteration
+IAST_VOWELS = {
+    'अ': 'a', 'आ': 'ā', 'इ': 'i', 'ई': 'ī', 'उ': 'u', 'ऊ': 'ū', 'ऋ': 'ṛ', 'ॠ': 'ṝ',
+    'ऌ': 'ḷ', 'ॡ': 'ḹ', 'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au'
+}
+IAST_MATRAS = {matra: IAST_VOWELS[vowel] for matra, vowel in MATRA_VOWELS.items()}
+IAST_CONSONANTS = dict(zip(
+    CONSONANTS,
+    ['k', 'kh', 'g', 'gh', 'ṅ', 'c', 'ch', 'j', 'jh', 'ñ', 'ṭ', 'ṭh', 'ḍ', 'ḍh', 'ṇ',
+     't', 'th', 'd', 'dh', 'n', 'p', 'ph', 'b', 'bh', 'm', 'y', 'r', 'l', 'v',
+     'ś', 'ṣ', 's', 'h', 'ḷ']
+))
+IAST_OTHER = {
+    'ं': 'ṃ', 'ः': 'ḥ', 'ँ': 'm̐', 'ऽ': "'", 'ॐ': 'oṃ', '।': '|', '॥': '||',
+    **{chr(0x0966 + d): str(d) for d in range(10)}
+}
+
+
+def to_iast(text: str) -> str:
+    """
+    Transliterate Devanagari to IAST
+
+    Consonants carry the inherent 'a' unless followed by a matra or virama.
+    Nukta and ZWJ/ZWNJ are dropped; anything else outside the alphabet
+    passes through, e.g. 'श्रीमाता' -> 'śrīmātā'.
+    """
+    out = []
+    chars = text.replace('़', '')
+    i = 0
+    while i < len(chars):
+        char = chars[i]
+        if char in IAST_CONSONANTS:
+            out.append(IAST_CONSONANTS[char])
+            following = chars[i + 1] if i + 1 < len(chars) else ''
+            if following == '्':
+                i += 1
+            elif following in IAST_MATRAS:
+                out.append(IAST_MATRAS[following])
+                i += 1
+            else:
+                out.append('a')
+        elif char in IAST_VOWELS:
+            out.append(IAST_VOWELS[char])
+        elif char in IAST_OTHER:
+            out.append(IAST_OTHER[char])
+        elif char not in '‌‍':
+            out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+# Normalization (OCR output and hand-entered text)
+# Invisible characters dropped everywhere (ZWSP, soft hyphen, word joiner, BOM)
+INVISIBLE = '\u200B\u00AD\u2060\uFEFF'
+
+# Vowel letter + matra sequences that render like an independent vowel
+# (Unicode's "do not use" table); OCR and some keyboards produce them
+VOWEL_SEQUENCES = {
+    'अा': 'आ', 'अो': 'ओ', 'अौ': 'औ', 'आे': 'ओ', 'आै': 'औ', 'एे': 'ऐ'
+}
+# Characters OCR and transliteration tools use in place of dandas
+DANDA_LIKE = {
+    '|': '।', '||': '॥', '\u01C0': '।', '\u2223': '।', '\uFF5C': '।', '\u01C1': '॥', '\u2016': '॥', '।।': '॥'
+}
+
+# Nasal consonant and the stops of its class (its homorganic consonants)
+NASAL_CLASSES = {
+    'ङ': 'कखगघ', 'ञ': 'चछजझ', 'ण': 'टठडढ', 'न': 'तथदध', 'म': 'पफबभ'
+}
+NASAL_FOR_STOP = {stop: nasal for nasal, stops in NASAL_CLASSES.items() for stop in stops}
+NASAL_MODES = ('keep', 'conjunct', 'anusvara')
+
+_CONSONANT_CHARS = frozenset(chr(c) for c in (*range(0x0915, 0x093A), *range(0x0958, 0x0960)))
+# A danda-like mark right after one of these is a danda (not IAST punctuation)
+_DANDA_CONTEXT_RE = re.compile(r'[\u0900-\u0963\u0966-\u097F]')
+_SPACE_CHARS = ' \t\u00A0'
+
+# Every alternative starts with a literal or a character class (no groups, no
+# leading lookbehind) so re can skip straight to candidate characters; the
+# rule is told apart by the first character of the match. Spacing is only
+# checked at a danda: several spaces or a tab before it.
+_NORMALIZE_ALTERNATIVES = [
+    '|'.join(VOWEL_SEQUENCES),
+    f'[{INVISIBLE}]',
+    JOINER,
+    r'\|\|?|[\u01C0\u01C1\u2223\uFF5C\u2016]|।।',
+    rf'[{DANDAS}](?<=[ \t\u00A0][ \t\u00A0].)|[{DANDAS}](?<=[\t\u00A0].)',
+]
+_NASAL_ALTERNATIVES = {
+    'keep': [],
+    'conjunct': ['ं(?=[' + ''.join(NASAL_FOR_STOP) + '])'],
+    'anusvara': [f'{nasal}्(?=[{stops}])' for nasal, stops in NASAL_CLASSES.items()],
+}
+_SPACES_RE = re.compile(rf'(?: [ \t\u00A0]+|[\t\u00A0][ \t\u00A0]*)(?=[{DANDAS}])')
+_normalize_patterns = {}
+
+
+def _normalize_pattern(nasals: str):
+    if nasals not in _normalize_patterns:
+        _normalize_patterns[nasals] = re.compile('|'.join(_NORMALIZE_ALTERNATIVES + _NASAL_ALTERNATIVES[nasals]))
+    return _normalize_patterns[nasals]
+
+
+def _keep_joiner(text: str, i: int) -> bool:
+    """ZWJ/ZWNJ only change rendering inside a conjunct (virama + joiner + consonant) or before a virama (eyelash र)"""
+    following = text[i + 1] if i + 1 < len(text) else ''
+    if text[i] == '\u200D' and following == '्':
+        return True
+    return i > 0 and text[i - 1] == '्' and following in _CONSONANT_CHARS
+
+
+def _spaces_before(text: str, i: int) -> str:
+    start = i
+    while start > 0 and text[start - 1] in _SPACE_CHARS:
+        start -= 1
+    return text[start:i]
+
+
+def _in_table_row(text: str, i: int) -> bool:
+    """Whether position i is on a Markdown table row (a line starting with |)"""
+    start = text.rfind('\n', 0, i) + 1
+    while text[start] in _SPACE_CHARS:
+        start += 1
+    return text[start] == '|'
+
+
+def normalize(text: str, nasals: str = 'keep', counts: Optional[Counter] = None) -> str:
+    """
+    Normalize Devanagari text in one pass
+
+    NFC, invisible characters removed, stray ZWJ/ZWNJ removed, vowel + matra
+    sequences composed (अा -> आ), Latin pipes after Devanagari turned into
+    dandas (। / ॥) except on Markdown table rows, and tabs or runs of spaces before a danda reduced to one
+    space. Optionally anusvara before a stop is written as the nasal of its
+    class ('conjunct': संकर -> सङ्कर) or the reverse ('anusvara').
+
+    Args:
+        text: Input text
+        nasals: 'keep', 'conjunct' or 'anusvara'
+        counts: Counter that receives the number of changes per rule
+
+    Returns:
+        Normalized text
+    """
+    if counts is None:
+        counts = Counter()
+
+    if not unicodedata.is_normalized('NFC', text):
+        lines = text.split('\n')
+        normalized = [unicodedata.normalize('NFC', line) for line in lines]
+        counts['nfc'] += sum(1 for old, new in zip(lines, normalized) if old != new)
+        text = '\n'.join(normalized)
+
+    fix_spaces = False
+
+    def replace(m):
+        nonlocal fix_spaces
+        found = m.group()
+        first = found[0]
+        if first in INVISIBLE:
+            rule, new = 'invisible', ''
+        elif first in '\u200C\u200D':
+            if _keep_joiner(m.string, m.start()):
+                return found
+            rule, new = 'joiner', ''
+        elif found in VOWEL_SEQUENCES:
+            rule, new = 'vowel', VOWEL_SEQUENCES[found]
+        elif first == 'ं':
+            rule, new = 'nasal', NASAL_FOR_STOP[m.string[m.end()]] + '्'
+        elif found[-1] == '्':
+            rule, new = 'nasal', 'ं'
+        else:
+            spaces = _spaces_before(m.string, m.start())
+            if spaces not in ('', ' '):
+                fix_spaces = True
+            if found not in DANDA_LIKE:
+                return found
+            before = m.start() - len(spaces) - 1
+            if found != '।।' and (before < 0 or not _DANDA_CONTEXT_RE.match(m.string, before)):
+                return found
+            if found[0] == '|' and _in_table_row(m.string, m.start()):
+                return found
+            rule, new = 'danda', DANDA_LIKE[found]
+        counts[rule] += 1
+        return new
+
+    text = _normalize_pattern(nasals).sub(replace, text)
+    if fix_spaces:
+        text, n = _SPACES_RE.subn(' ', text)
+        counts['spaces'] += n
+    return text
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Export complete commentary volumes for offline reading
+Streams a collection with its commentaries into an EPUB 3 file and/or a
+single-file, print-ready HTML page:
+- naamani: all 1000 names with mantra, Balatapa, Datta, Jayamangala and
+  Soubhagya Bhaskara
+- soundaryalahari: all 100 slokas with the Lakshmidhara and Kaivalya teekas
+
+Chapters are rendered in parallel and written out as soon as they arrive,
+so only a few chapters are ever held in memory. The stylesheet and any
+embedded fonts are stored once and shared by every chapter.
+"""
+
+import os
+import re
+import sys
+import json
+import base64
+import hashlib
+import zipfile
+from html import escape
+from pathlib import Path
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from corpus import Corpus, REPO_ROOT
+
+VOLUMES = {
+    'naamani': {
+        'title': 'श्रीललितासहस्रनाम',
+        'collection': 'naamani',
+        'chapter_size': 100,
+        'sections': [
+            ('mantra', 'नाममन्त्रः'),
+            ('balatapa', 'बालातपा'),
+            ('datta', 'Meaning'),
+            ('jayamangala', 'जयमङ्गला'),
+            ('soubhagyabhaskara', 'सौभाग्यभास्कर'),
+        ],
+    },
+    'soundaryalahari': {
+        'title': 'सौन्दर्यलहरी',
+        'collection': 'soundaryalahari',
+        'chapter_size': 10,
+        'sections': [
+            ('lakshmidhara', 'लक्ष्मीधरः'),
+            ('kaivalya', 'कैवल्याश्रमः'),
+        ],
+    },
+}
+
+STYLESHEET = """body { font-family: %(fonts)s; line-height: 1.7; color: #2c2c2c; margin: 0 1em; }
+h1 { color: #8B0000; text-align: center; }
+h2.chapter { color: #8B0000; border-bottom: 2px solid #8B4513; page-break-before: always; }
+section.entry { margin: 1.5em 0; page-break-inside: avoid; }
+h3.entry-title { color: #8B4513; margin-bottom: 0.3em; }
+.mula { font-size: 1.15em; font-weight: bold; margin: 0.5em 0; }
+.label { color: #8B4513; font-weight: bold; }
+.commentary { margin: 0.6em 0; text-align: justify; }
+.commentary h4 { color: #8B4513; margin: 0.8em 0 0.3em; }
+nav ol { list-style: none; padding-left: 0; }
+@media print { body { margin: 0; } h2.chapter { page-break-before: always; } }
+"""
+
+FONT_TYPES = {
+    '.woff2': 'font/woff2',
+    '.woff': 'font/woff',
+    '.ttf': 'font/ttf',
+    '.otf': 'font/otf',
+}
+
+CONTAINER_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+XHTML_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="sa" xml:lang="sa">
+<head>
+<meta charset="UTF-8"/>
+<title>%(title)s</title>
+<link rel="stylesheet" type="text/css" href="styles/volume.css"/>
+</head>
+<body>
+"""
+
+# Chapters rendered ahead of the writer per worker
+WINDOW_PER_WORKER = 2
+
+_corpus: Optional[Corpus] = None
+
+
+# ============================================================================
+# Rendering (runs in worker processes)
+# ============================================================================
+
+def markdown_to_html(text: str) -> str:
+    """
+    Render the small Markdown subset used by the commentaries
+
+    Handles headings, paragraphs and **bold**/*italic*; the leading
+    '# name' heading is dropped, as on the site.
+    """
+    text = re.sub(r'^#\s+.+$', '', text, count=1, flags=re.MULTILINE).strip()
+    blocks = []
+    for block in re.split(r'\n\s*\n', text):
+        block = block.strip()
+        if not block:
+            continue
+        heading = re.match(r'^(#{1,6})\s+(.+)$', block)
+        body = escape(heading.group(2) if heading else block, quote=False)
+        body = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', body)
+        body = re.sub(r'\*(.+?)\*', r'<em>\1</em>', body)
+        if heading:
+            blocks.append(f"<h4>{body}</h4>")
+        else:
+            blocks.append(f"<p>{body.replace(chr(10), '<br/>')}</p>")
+    return '\n'.join(blocks)
+
+
+def render_section(kind: str, label: str, content: str) -> str:
+    """Render one commentary of an entry (empty string if there is nothing to show)"""
+    if kind == 'datta':
+        data = json.loads(content)
+        parts = []
+        if data.get('meaning'):
+            parts.append(f"<p><span class=\"label\">{escape(label)} »</span> {escape(data['meaning'], quote=False)}</p>")
+        if data.get('commentary'):
+            parts.append(markdown_to_html(data['commentary']))
+        return f"<div class=\"commentary\">{''.join(parts)}</div>" if parts else ''
+
+    content = content.strip()
+    if not content:
+        return ''
+    if '\n' not in content and not content.startswith('#'):
+        return f"<p class=\"commentary\"><span class=\"label\">{escape(label)} »</span> {escape(content, quote=False)}</p>"
+
+    body = markdown_to_html(content)
+    if not body:
+        return ''
+    return f"<div class=\"commentary\"><p class=\"label\">{escape(label)}</p>\n{body}</div>"
+
+
+def _init_worker(root: str) -> None:
+    global _corpus
+    _corpus = Corpus(root, cache_size=0)
+
+
+def render_chapter(volume_name: str, index: int, numbers: List[int]) -> Tuple[int, str, str]:
+    """
+    Worker: render one chapter's entries
+
+    Returns:
+        (chapter index, chapter title, XHTML body fragment)
+    """
+    volume = VOLUMES[volume_name]
+    title = f"{numbers[0]}–{numbers[-1]}"
+    parts = [f"<h2 class=\"chapter\" id=\"chapter-{index:03d}\">{title}</h2>"]
+
+    for number in numbers:
+        record = _corpus.get(volume['collection'], number)
+        if record is None:
+            continue
+        mula = escape(record.text.strip(), quote=False).replace('\n', '<br/>')
+        parts.append(f"<section class=\"entry\" id=\"entry-{number}\">")
+        parts.append(f"<h3 class=\"entry-title\">{number}</h3>")
+        parts.append(f"<p class=\"mula\">{mula}</p>")
+        for kind, label in volume['sections']:
+            content = record.commentary(kind)
+            if content:
+                parts.append(render_section(kind, label, content))
+        parts.append("</section>")
+
+    return index, title, '\n'.join(p for p in parts if p)
+
+
+# ============================================================================
+# Volume assembly
+# ============================================================================
+
+def plan_chapters(corpus: Corpus, volume_name: str, chapter_size: int) -> List[List[int]]:
+    """Split a collection's record numbers into chapters"""
+    collection = corpus.collection(VOLUMES[volume_name]['collection'])
+    numbers = [number for _, number in collection.iter_keys()]
+    return [numbers[i:i + chapter_size] for i in range(0, len(numbers), chapter_size)]
+
+
+def iter_chapters(root: Path, volume_name: str, chapters: List[List[int]],
+                  workers: Optional[int] = None) -> Iterator[Tuple[int, str, str]]:
+    """
+    Render chapters in parallel and yield them in order
+
+    Only a bounded window of chapters is in flight, so memory stays flat
+    however large the volume is.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * WINDOW_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(root),)) as pool:
+        pending = deque()
+        for index, numbers in enumerate(chapters, start=1):
+            pending.append(pool.submit(render_chapter, volume_name, index, numbers))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def load_fonts(paths: List[str]) -> List[Dict]:
+    """
+    Read font files once, dropping duplicates by content hash
+
+    Returns:
+        List of {'family', 'name', 'media_type', 'data'}
+    """
+    fonts = []
+    seen = set()
+    for path in paths:
+        path = Path(path)
+        if path.suffix.lower() not in FONT_TYPES:
+            print(f"Skipping unsupported font: {path}")
+            continue
+        data = path.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        fonts.append({
+            'family': path.stem.split('-')[0],
+            'name': f"{digest[:12]}{path.suffix.lower()}",
+            'media_type': FONT_TYPES[path.suffix.lower()],
+            'data': data,
+        })
+    return fonts
+
+
+def build_stylesheet(fonts: List[Dict], embed: bool) -> str:
+    """Shared stylesheet with one @font-face per distinct font"""
+    families = []
+    faces = []
+    for font in fonts:
+        if font['family'] not in families:
+            families.append(font['family'])
+        if embed:
+            src = f"data:{font['media_type']};base64,{base64.b64encode(font['data']).decode('ascii')}"
+        else:
+            src = f"../fonts/{font['name']}"
+        faces.append(f"@font-face {{ font-family: '{font['family']}'; src: url('{src}'); }}")
+    stack = ', '.join(f"'{family}'" for family in families + ['Annapurna SIL']) + ', serif'
+    return '\n'.join(faces + [STYLESHEET % {'fonts': stack}])
+
+
+class EpubWriter:
+    """Write an EPUB 3 package entry by entry"""
+
+    def __init__(self, path: Path, title: str, fonts: List[Dict]):
+        self.title = title
+        self.chapters: List[Tuple[str, str]] = []
+        self.fonts = fonts
+        self.zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        # mimetype must be the first entry and stored uncompressed
+        self.zip.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        self.zip.writestr('META-INF/container.xml', CONTAINER_XML)
+        self.zip.writestr('OEBPS/styles/volume.css', build_stylesheet(fonts, embed=False))
+        for font in fonts:
+            self.zip.writestr(f"OEBPS/fonts/{font['name']}", font['data'], compress_type=zipfile.ZIP_STORED)
+
+    def add_chapter(self, index: int, title: str, body: str) -> None:
+        name = f"chapter-{index:03d}.xhtml"
+        self.zip.writestr(f"OEBPS/{name}", XHTML_HEAD % {'title': escape(title)} + body + "\n</body>\n</html>\n")
+        self.chapters.append((name, title))
+
+    def close(self) -> None:
+        nav = ''.join(f"<li><a href=\"{name}\">{escape(title)}</a></li>\n" for name, title in self.chapters)
+        self.zip.writestr('OEBPS/nav.xhtml', XHTML_HEAD % {'title': escape(self.title)}
+                          + f"<h1>{escape(self.title)}</h1>\n<nav epub:type=\"toc\" id=\"toc\"><ol>\n{nav}</ol></nav>\n"
+                          + "</body>\n</html>\n")
+
+        identifier = hashlib.sha1(self.title.encode('utf-8')).hexdigest()
+        modified = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        manifest = ['<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+                    '<item id="css" href="styles/volume.css" media-type="text/css"/>']
+        manifest += [f'<item id="font-{i}" href="fonts/{font["name"]}" media-type="{font["media_type"]}"/>'
+                     for i, font in enumerate(self.fonts)]
+        manifest += [f'<item id="c{i}" href="{name}" media-type="application/xhtml+xml"/>'
+                     for i, (name, _) in enumerate(self.chapters)]
+        spine = ['<itemref idref="nav"/>'] + [f'<itemref idref="c{i}"/>' for i in range(len(self.chapters))]
+
+        opf = f"""<?xml version="1.0" encoding="UTF-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid" xml:lang="sa">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="uid">urn:sha1:{identifier}</dc:identifier>
+    <dc:title>{escape(self.title)}</dc:title>
+    <dc:language>sa</dc:language>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    {chr(10).join(manifest).replace(chr(10), chr(10) + '    ')}
+  </manifest>
+  <spine>
+    {chr(10).join(spine).replace(chr(10), chr(10) + '    ')}
+  </spine>
+</package>
+"""
+        self.zip.writestr('OEBPS/content.opf', opf)
+        self.zip.close()
+
+
+class HtmlWriter:
+    """Write a single self-contained HTML file, chapter by chapter"""
+
+    def __init__(self, path: Path, title: str, fonts: List[Dict]):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.file.write(f"<!DOCTYPE html>\n<html lang=\"sa\">\n<head>\n<meta charset=\"UTF-8\">\n"
+                        f"<title>{escape(title)}</title>\n<style>\n{build_stylesheet(fonts, embed=True)}\n</style>\n"
+                        f"</head>\n<body>\n<h1>{escape(title)}</h1>\n")
+
+    def add_chapter(self, index: int, title: str, body: str) -> None:
+        self.file.write(body)
+        self.file.write('\n')
+
+    def close(self) -> None:
+        self.file.write("</body>\n</html>\n")
+        self.file.close()
+
+
+def export_volume(volume_name: str, epub_path: Optional[Path] = None, html_path: Optional[Path] = None,
+                  root: Path = REPO_ROOT, fonts: Optional[List[str]] = None,
+                  chapter_size: Optional[int] = None, workers: Optional[int] = None) -> int:
+    """
+    Export one volume to EPUB and/or single-file HTML
+
+    Args:
+        volume_name: Key of VOLUMES
+        epub_path: EPUB output path (skipped if None)
+        html_path: HTML output path (skipped if None)
+        root: Repository root
+        fonts: Font files to embed (deduplicated by content)
+        chapter_size: Entries per chapter (default: per volume)
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        Number of chapters written
+    """
+    volume = VOLUMES[volume_name]
+    corpus = Corpus(root)
+    chapters = plan_chapters(corpus, volume_name, chapter_size or volume['chapter_size'])
+    font_data = load_fonts(fonts or [])
+
+    writers = []
+    if epub_path:
+        writers.append(EpubWriter(Path(epub_path), volume['title'], font_data))
+    if html_path:
+        writers.append(HtmlWriter(Path(html_path), volume['title'], font_data))
+
+    written = 0
+    try:
+        for index, title, body in iter_chapters(Path(root), volume_name, chapters, workers):
+            for writer in writers:
+                writer.add_chapter(index, title, body)
+            written += 1
+            print(f"  Chapter {index}/{len(chapters)}: {title}")
+    finally:
+        for writer in writers:
+            writer.close()
+
+    return written
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description='Export a collection with its commentaries to EPUB and single-file HTML'
+    )
+    parser.add_argument('volume', choices=sorted(VOLUMES), help='Volume to export')
+    parser.add_argument('--epub', help='EPUB output file')
+    parser.add_argument('--html', help='Single-file HTML output')
+    parser.add_argument('--font', action='append', default=[],
+                       help='Font file to embed (can be repeated; duplicates are stored once)')
+    parser.add_argument('--chapter-size', type=int, help='Entries per chapter')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Repository root')
+
+    args = parser.parse_args()
+
+    if not args.epub and not args.html:
+        print("Nothing to do: pass --epub and/or --html")
+        sys.exit(1)
+
+    start = time.time()
+    print(f"Exporting {args.volume}...")
+    chapters = export_volume(args.volume, args.epub, args.html, Path(args.root), args.font,
+                             args.chapter_size, args.workers)
+
+    print(f"\n{'='*60}")
+    print(f"Wrote {chapters} chapters in {time.time() - start:.1f}s")
+    if args.epub:
+        print(f"EPUB: {args.epub}")
+    if args.html:
+        print(f"HTML: {args.html}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
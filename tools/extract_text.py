@@ -3,16 +3,18 @@
 Extract Sanskrit text from image using Tesseract OCR with preprocessing
 """
 
-import sys
 import cv2
 import numpy as np
 import pytesseract
 from PIL import Image
 
+import instrument
+
 def preprocess_image(image_path):
     """Preprocess image for better OCR accuracy"""
     # Read image
-    img = cv2.imread(image_path)
+    with instrument.span('read', file=image_path):
+        img = cv2.imread(image_path)
 
     # Convert to grayscale
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -43,7 +45,8 @@ def extract_text(image_path, preprocess=True):
 
     if preprocess:
         # Preprocess image
-        processed_img = preprocess_image(image_path)
+        with instrument.span('transform'):
+            processed_img = preprocess_image(image_path)
 
         # Convert back to PIL Image for pytesseract
         pil_img = Image.fromarray(processed_img)
@@ -54,22 +57,28 @@ def extract_text(image_path, preprocess=True):
     custom_config = r'--oem 3 --psm 6 -l san'
 
     # Extract text
-    text = pytesseract.image_to_string(pil_img, config=custom_config)
+    with instrument.span('ocr'):
+        text = pytesseract.image_to_string(pil_img, config=custom_config)
+    instrument.count('characters', len(text))
 
     return text.strip()
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 extract_text.py <image_path>")
-        sys.exit(1)
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Extract Sanskrit text from an image with Tesseract')
+    parser.add_argument('image_path', help='Image to OCR')
+    parser.add_argument('--no-preprocess', action='store_true', help='OCR the image as is')
+    instrument.add_arguments(parser)
 
-    image_path = sys.argv[1]
+    args = parser.parse_args()
 
-    print("Extracting text with preprocessing...")
-    text = extract_text(image_path, preprocess=True)
+    with instrument.session(args):
+        print("Extracting text with preprocessing..." if not args.no_preprocess else "Extracting text...")
+        text = extract_text(args.image_path, preprocess=not args.no_preprocess)
 
-    print("\n" + "="*80)
-    print("EXTRACTED TEXT:")
-    print("="*80)
-    print(text)
-    print("="*80)
+        print("\n" + "="*80)
+        print("EXTRACTED TEXT:")
+        print("="*80)
+        print(text)
+        print("="*80)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Hoist repeated inline <style>/<script> blocks into shared bundles
+Finds inline blocks that are identical across pages and moves them into
+content-hashed files under assets/bundles/ (e.g. naamani.3f2a9c1b7e.css),
+replacing each block with a <link>/<script src>. Pages keep only their own
+per-page constants inline:
+
+    <script>
+        const currentNumber = 5;
+    </script>
+    <script src="../../assets/bundles/soundaryalahari.8d0c51e2aa.js"></script>
+
+Leading `const/let/var name = literal;` lines stay inline and the rest of
+the script is hoisted, so pages that differ only in those constants share
+one bundle. Bundle names change whenever their content does, so they can
+be served with a long-lived, immutable Cache-Control.
+
+Runs as a dry run by default; pass --write to rewrite the pages.
+"""
+
+import os
+import re
+import sys
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUNDLE_DIR = Path('assets') / 'bundles'
+
+# Directories that are not part of the published site
+SKIP_DIRS = {'.git', 'ocr', 'ocr_test', 'tools', 'bench', 'test', 'assets',
+             'Jayamangala Book', 'Jayamangala Text', 'node_modules'}
+
+BLOCK_RE = re.compile(r'<(style|script)(\s[^>]*)?>(.*?)</\1\s*>', re.DOTALL | re.IGNORECASE)
+TYPE_RE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+LEADING_CONSTS_RE = re.compile(
+    r"""\A(?:[ \t]*\n)*(?:[ \t]*(?:const|let|var)\s+[A-Za-z_$][\w$]*\s*=\s*"""
+    r"""(?:'[^'\n]*'|"[^"\n]*"|-?\d+(?:\.\d+)?|true|false|null)\s*;?[ \t]*\n)+"""
+)
+
+# url()/@import paths in CSS resolve against the stylesheet, so blocks that
+# use relative ones can't move to another directory unchanged
+RELATIVE_CSS_URL_RE = re.compile(
+    r"""(?:url\(|@import)\s*(?=\S)(?!['"]?(?:data:|https?:|//|/|#)|url\()""", re.IGNORECASE
+)
+
+HOISTABLE_TYPES = {'', 'text/css', 'text/javascript', 'application/javascript'}
+
+DEFAULT_MIN_PAGES = 10
+DEFAULT_MIN_BYTES = 512
+
+
+def find_pages(root: Path) -> List[Path]:
+    """All published index.html pages under the site root"""
+    pages = []
+    for path in sorted(root.rglob('index.html')):
+        rel = path.relative_to(root).parts
+        if rel and rel[0] in SKIP_DIRS:
+            continue
+        pages.append(path)
+    return pages
+
+
+def group_pages(root: Path, pages: List[Path]) -> Dict[str, List[Path]]:
+    """
+    Group served pages by the file they actually are
+
+    naamani/<n>/index.html are symlinks to one naamani/naamani.html; the
+    target is rewritten once, with links relative to where it is served.
+    Targets served from different depths can't share relative links and
+    are left out.
+    """
+    groups: Dict[str, List[Path]] = {}
+    for page in pages:
+        groups.setdefault(str(page.resolve()), []).append(page)
+
+    for real, served in list(groups.items()):
+        depths = {len(p.relative_to(root).parts) for p in served}
+        if len(depths) > 1:
+            print(f"Skipping {real}: linked from pages at different depths")
+            del groups[real]
+    return groups
+
+
+def split_block(tag: str, text: str) -> Tuple[str, str]:
+    """
+    Split an inline block into the part that stays in the page and the
+    part that can be shared
+
+    Returns:
+        (inline prefix, shareable body); the prefix is only non-empty for
+        scripts that start with per-page constants
+    """
+    if tag == 'script':
+        match = LEADING_CONSTS_RE.match(text)
+        if match:
+            return text[:match.end()].rstrip('\n'), text[match.end():]
+    return '', text
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+
+def iter_blocks(html: str):
+    """
+    Inline style/script blocks that could be hoisted
+
+    Yields:
+        (match, tag, prefix, body, sha1 of body)
+    """
+    for match in BLOCK_RE.finditer(html):
+        tag = match.group(1).lower()
+        attrs = match.group(2) or ''
+        if 'src=' in attrs.lower():
+            continue
+        block_type = TYPE_RE.search(attrs)
+        if block_type and block_type.group(1).lower() not in HOISTABLE_TYPES:
+            continue
+        prefix, body = split_block(tag, match.group(3))
+        if not body.strip():
+            continue
+        if tag == 'style' and RELATIVE_CSS_URL_RE.search(body):
+            continue
+        yield match, tag, prefix, body, content_hash(body)
+
+
+def scan_page(path: str) -> Tuple[str, int, List[Tuple[str, str, int]]]:
+    """
+    Worker: list a page's hoistable blocks
+
+    Returns:
+        (path, page bytes, [(tag, sha1, body bytes), ...])
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    blocks = [(tag, sha, len(body.encode('utf-8'))) for _, tag, _, body, sha in iter_blocks(html)]
+    return path, len(html.encode('utf-8')), blocks
+
+
+def bundle_name(tag: str, sha: str, pages: List[str], root: Path) -> Path:
+    """assets/bundles/<section>.<hash>.css|js, named after the pages' section"""
+    sections = {Path(p).relative_to(root).parts[0] for p in pages}
+    section = sections.pop() if len(sections) == 1 else 'shared'
+    extension = 'css' if tag == 'style' else 'js'
+    return BUNDLE_DIR / f"{section}.{sha[:10]}.{extension}"
+
+
+def replacement(match: re.Match, tag: str, prefix: str, href: str, html: str) -> str:
+    """Markup that takes the place of a hoisted block"""
+    line_start = html.rfind('\n', 0, match.start()) + 1
+    indent = html[line_start:match.start()]
+    indent = indent if not indent.strip() else ''
+
+    if tag == 'style':
+        return f'<link rel="stylesheet" href="{href}">'
+
+    tag_src = f'<script src="{href}"></script>'
+    if not prefix:
+        return tag_src
+    return f"<script>{prefix}\n{indent}</script>\n{indent}{tag_src}"
+
+
+def rewrite_page(args: Tuple[str, str, Dict[str, str], bool]) -> Tuple[str, int, int]:
+    """
+    Worker: replace hoisted blocks in one page
+
+    Args:
+        args: (file path, directory it is served from,
+               {sha1: absolute bundle path}, write)
+
+    Returns:
+        (path, bytes before, bytes after)
+    """
+    path, served_dir, bundles, write = args
+
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    parts = []
+    pos = 0
+    for match, tag, prefix, _, sha in iter_blocks(html):
+        if sha not in bundles:
+            continue
+        href = Path(os.path.relpath(bundles[sha], served_dir)).as_posix()
+        parts.append(html[pos:match.start()])
+        parts.append(replacement(match, tag, prefix, href, html))
+        pos = match.end()
+    parts.append(html[pos:])
+    updated = ''.join(parts)
+
+    if write and updated != html:
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(updated)
+        os.replace(tmp, path)
+
+    return path, len(html.encode('utf-8')), len(updated.encode('utf-8'))
+
+
+def plan_bundles(scans: List[Tuple[str, int, list]], groups: Dict[str, List[Path]], root: Path,
+                 min_pages: int, min_bytes: int) -> Dict[str, Dict]:
+    """
+    Pick the blocks worth sharing
+
+    Returns:
+        {sha1: {'tag', 'bytes', 'files': [...], 'pages': [...], 'path': bundle path}}
+        where files are the files on disk and pages the URLs serving them
+    """
+    blocks: Dict[str, Dict] = {}
+    for path, _, page_blocks in scans:
+        for tag, sha, size in page_blocks:
+            entry = blocks.setdefault(sha, {'tag': tag, 'bytes': size, 'files': [], 'pages': []})
+            entry['files'].append(path)
+            entry['pages'].extend(groups[path])
+
+    chosen = {}
+    for sha, entry in blocks.items():
+        if len(entry['pages']) < min_pages or entry['bytes'] < min_bytes:
+            continue
+        # A block shared only by pages in different chapters (adhyaya-01/5/,
+        # adhyaya-02/5/, ...) differs between neighbouring pages, so readers
+        # would fetch a new bundle on every page
+        chapters = [page.parent.parent for page in entry['pages']]
+        if len(set(chapters)) == len(chapters):
+            continue
+        entry['path'] = bundle_name(entry['tag'], sha, entry['pages'], root)
+        chosen[sha] = entry
+    return chosen
+
+
+def write_bundles(bundles: Dict[str, Dict], root: Path) -> None:
+    """Write each bundle's content, taken from the first page that has it"""
+    (root / BUNDLE_DIR).mkdir(parents=True, exist_ok=True)
+    for sha, entry in bundles.items():
+        target = root / entry['path']
+        if target.exists():
+            continue
+        with open(entry['files'][0], 'r', encoding='utf-8') as f:
+            html = f.read()
+        body = next(body for _, _, _, body, block_sha in iter_blocks(html) if block_sha == sha)
+        target.write_text(body.strip('\n') + '\n', encoding='utf-8')
+
+
+def prune_bundles(root: Path, pages: List[Path]) -> List[Path]:
+    """Delete bundles no page refers to any more"""
+    bundle_dir = root / BUNDLE_DIR
+    if not bundle_dir.is_dir():
+        return []
+    referenced = set()
+    for page in pages:
+        referenced.update(re.findall(r'assets/bundles/([\w.-]+)', page.read_text(encoding='utf-8')))
+    removed = []
+    for bundle in bundle_dir.iterdir():
+        if bundle.is_file() and bundle.name not in referenced:
+            bundle.unlink()
+            removed.append(bundle)
+    return removed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Move inline style/script blocks shared by many pages into hashed bundles'
+    )
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Site root (default: repository root)')
+    parser.add_argument('--section', action='append',
+                       help='Only process pages under this top-level directory (can be repeated)')
+    parser.add_argument('--min-pages', type=int, default=DEFAULT_MIN_PAGES,
+                       help=f'Pages a block must appear in to be hoisted (default: {DEFAULT_MIN_PAGES})')
+    parser.add_argument('--min-bytes', type=int, default=DEFAULT_MIN_BYTES,
+                       help=f'Smallest block worth its own request (default: {DEFAULT_MIN_BYTES})')
+    parser.add_argument('--write', action='store_true', help='Write bundles and rewrite pages (default: dry run)')
+    parser.add_argument('--prune', action='store_true', help='Delete bundles no page refers to')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    all_pages = find_pages(root)
+    pages = all_pages
+    if args.section:
+        pages = [p for p in pages if p.relative_to(root).parts[0] in args.section]
+    if not pages:
+        print(f"No pages found under {root}")
+        sys.exit(1)
+
+    groups = group_pages(root, pages)
+
+    print(f"Scanning {len(pages)} pages ({len(groups)} files)...")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        scans = list(pool.map(scan_page, list(groups), chunksize=64))
+
+        bundles = plan_bundles(scans, groups, root, args.min_pages, args.min_bytes)
+
+        print(f"\n{'Bundle':<44} {'Pages':>6} {'KB':>8} {'Saved MB':>9}")
+        for sha, entry in sorted(bundles.items(), key=lambda item: -item[1]['bytes'] * len(item[1]['pages'])):
+            saved = entry['bytes'] * (len(entry['pages']) - 1)
+            print(f"{entry['path'].name:<44} {len(entry['pages']):>6} "
+                  f"{entry['bytes'] / 1024:>8.1f} {saved / 1e6:>9.2f}")
+
+        if args.write and bundles:
+            write_bundles(bundles, root)
+
+        affected = sorted({path for entry in bundles.values() for path in entry['files']})
+        mapping = {sha: str(root / entry['path']) for sha, entry in bundles.items()}
+        tasks = [(path, str(groups[path][0].parent), mapping, args.write) for path in affected]
+        results = list(pool.map(rewrite_page, tasks, chunksize=64))
+
+    # Bytes as served: a symlinked file counts once per page that serves it
+    before = sum(b * len(groups[path]) for path, b, _ in results)
+    after = sum(a * len(groups[path]) for path, _, a in results)
+
+    if args.prune and args.write:
+        # Other sections' pages still refer to their own bundles
+        removed = prune_bundles(root, all_pages)
+        for bundle in removed:
+            print(f"Removed unused bundle: {bundle.relative_to(root)}")
+
+    print(f"\n{'='*60}")
+    print(f"Bundles: {len(bundles)}")
+    print(f"Files {'rewritten' if args.write else 'to rewrite'}: {len(results)} "
+          f"(serving {sum(len(groups[path]) for path, _, _ in results)} pages)")
+    if before:
+        print(f"Page bytes: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB "
+              f"({100 * (before - after) / before:.0f}% smaller)")
+    if not args.write:
+        print("Dry run - pass --write to apply")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
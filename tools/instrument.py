@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Instrumentation shared by the maintenance and OCR scripts
+Named spans (read, transform, write, network, ...) with timings, counters
+and periodic progress lines, plus two opt-in command line flags:
+
+  --profile [cprofile|sample]  cProfile stats, or a low-overhead sampling
+                               profile written as folded stacks (speedscope,
+                               flamegraph.pl)
+  --trace-out FILE             Trace Event JSON for chrome://tracing or
+                               https://ui.perfetto.dev
+
+Usage:
+
+    import instrument
+
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    with instrument.session(args):
+        with instrument.span('read', file=str(path)):
+            text = path.read_text()
+        instrument.count('files')
+        instrument.progress(updated=count, skipped=skipped)
+
+A timing summary of all spans and counters is printed when the session ends.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SAMPLE_INTERVAL = 0.005
+
+
+class Recorder:
+    """Span timings, counters and (when tracing) the raw trace events"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, trace: bool = False):
+        self.start_ns = time.perf_counter_ns()
+        self.totals: Dict[str, List[int]] = {}
+        self.counters: Counter = Counter()
+        self.trace = trace
+        self.events: List[Dict] = []
+        self.lock = threading.Lock()
+
+    def add_span(self, name: str, start_ns: int, end_ns: int, args: Dict):
+        with self.lock:
+            total = self.totals.setdefault(name, [0, 0])
+            total[0] += 1
+            total[1] += end_ns - start_ns
+            if self.trace:
+                event = {
+                    'name': name, 'cat': name, 'ph': 'X',
+                    'ts': (start_ns - self.start_ns) / 1000, 'dur': (end_ns - start_ns) / 1000,
+                    'pid': os.getpid(), 'tid': threading.get_ident()
+                }
+                if args:
+                    event['args'] = args
+                self.events.append(event)
+
+    def add_count(self, name: str, n: int):
+        with self.lock:
+            self.counters[name] += n
+
+    def add_counter_event(self, name: str, values: Dict[str, int]):
+        if self.trace:
+            with self.lock:
+                self.events.append({
+                    'name': name, 'ph': 'C', 'ts': (time.perf_counter_ns() - self.start_ns) / 1000,
+                    'pid': os.getpid(), 'args': values
+                })
+
+
+_recorder = Recorder()
+
+
+class span:
+    """
+    Time a block under a name; extra keyword args are attached to the trace event
+
+    Usable as a context manager or a decorator.
+    """
+
+    __slots__ = ('name', 'args', 'start_ns')
+
+    def __init__(self, name: str, **args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        _recorder.add_span(self.name, self.start_ns, time.perf_counter_ns(), self.args)
+        return False
+
+    def __call__(self, func):
+        name, args = self.name, self.args
+
+        def wrapper(*a, **kw):
+            with span(name, **args):
+                return func(*a, **kw)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a named counter"""
+    _recorder.add_count(name, n)
+
+
+def progress(every: int = 100, **counts: int) -> None:
+    """
+    Print a progress line every `every` items
+
+    The keyword order is the print order, e.g.
+    progress(updated=3, skipped=97) -> "Progress: 3 updated, 97 skipped".
+    The counts are also recorded as a counter track in the trace.
+    """
+    done = sum(counts.values())
+    if done and done % every == 0:
+        print("Progress: " + ", ".join(f"{value} {name}" for name, value in counts.items()))
+        _recorder.add_counter_event('progress', counts)
+
+
+class Sampler:
+    """
+    Sampling profiler: records the main thread's stack on a CPU-time timer
+
+    Stacks are written in the folded format ("a;b;c 12") read by speedscope
+    and flamegraph.pl. Unix only (uses setitimer).
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        import signal
+        self.signal = signal
+        self.interval = interval
+        self.stacks: Counter = Counter()
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self.signal.signal(self.signal.SIGPROF, self._sample)
+        self.signal.setitimer(self.signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        self.signal.setitimer(self.signal.ITIMER_PROF, 0, 0)
+        self.signal.signal(self.signal.SIGPROF, self.signal.SIG_DFL)
+
+    def write(self, path: Path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+
+def add_arguments(parser) -> None:
+    """Add --profile, --profile-out and --trace-out to an argparse parser"""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', nargs='?', const='cprofile', choices=['cprofile', 'sample'],
+                       help='Profile the run with cProfile (default) or the sampling profiler')
+    group.add_argument('--profile-out',
+                       help='Profile output (default: <script>.prof or <script>.folded)')
+    group.add_argument('--trace-out', help='Write Trace Event JSON (chrome://tracing, Perfetto)')
+
+
+def summary() -> str:
+    """Table of span timings and counters recorded so far"""
+    wall = (time.perf_counter_ns() - _recorder.start_ns) / 1e9
+    lines = [f"{'Span':<16}{'Count':>8}{'Total':>10}{'Mean':>10}{'Share':>8}"]
+    for name, (calls, total_ns) in sorted(_recorder.totals.items(), key=lambda item: -item[1][1]):
+        total = total_ns / 1e9
+        lines.append(f"{name:<16}{calls:>8}{total:>9.3f}s{total / calls * 1000:>8.2f}ms"
+                     f"{total / wall * 100 if wall else 0:>7.1f}%")
+    if _recorder.counters:
+        lines.append("Counters: " + ", ".join(f"{k}={v}" for k, v in sorted(_recorder.counters.items())))
+    lines.append(f"Wall time: {wall:.3f}s")
+    return '\n'.join(lines)
+
+
+def write_trace(path: Path, process_name: str) -> int:
+    """
+    Write the recorded events as Trace Event JSON
+
+    Returns:
+        Number of events written
+    """
+    events = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': process_name}}]
+    events += _recorder.events
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return len(events)
+
+
+@contextmanager
+def session(args=None, name: Optional[str] = None, quiet: bool = False):
+    """
+    Instrument a whole run
+
+    Args:
+        args: Parsed arguments from a parser passed to add_arguments() (optional)
+        name: Name used for the trace and default profile paths (default: script name)
+        quiet: Don't print the span summary at the end
+    """
+    name = name or Path(sys.argv[0]).stem or 'run'
+    profile = getattr(args, 'profile', None)
+    profile_out = getattr(args, 'profile_out', None)
+    trace_out = getattr(args, 'trace_out', None)
+
+    _recorder.reset(trace=bool(trace_out))
+
+    profiler = sampler = None
+    if profile == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile == 'sample':
+        sampler = Sampler()
+        sampler.start()
+
+    try:
+        yield _recorder
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+
+        if not quiet and (_recorder.totals or _recorder.counters):
+            print(f"\n{'='*60}")
+            print(summary())
+            print(f"{'='*60}")
+
+        if profiler:
+            import pstats
+            path = Path(profile_out or f"{name}.prof")
+            profiler.dump_stats(path)
+            print(f"\nProfile saved: {path} (top functions by cumulative time)")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+        if sampler:
+            path = Path(profile_out or f"{name}.folded")
+            sampler.write(path)
+            print(f"Sampled profile saved: {path} ({sum(sampler.stacks.values())} samples)")
+        if trace_out:
+            written = write_trace(Path(trace_out), name)
+            print(f"Trace saved: {trace_out} ({written} events)")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Normalize Devanagari text across the corpus
+One pass per file with devanagari.normalize() (NFC, stray ZWJ/ZWNJ, Latin
+pipes for dandas, spaces before dandas, optionally anusvara vs nasal
+conjuncts) over Jayamangala Text/, every *_ocr.json and all Data/ text,
+with files split across a worker pool. Changes are reported per file and
+written through a journaled BatchWriter:
+
+    python3 tools/normalize_text.py --dry-run          # show the diff
+    python3 tools/normalize_text.py                    # rewrite in place
+    python3 tools/normalize_text.py --check            # exit 1 if anything would change
+
+Only Devanagari contexts are touched, so JSON and YAML structure (and
+IAST passages) are left as they are.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from batch_write import BatchWriter, DEFAULT_BATCH_SIZE, JOURNAL_NAME
+from corpus import COLLECTIONS, REPO_ROOT
+from devanagari import normalize, NASAL_MODES
+
+DEFAULT_PATHS = ('Jayamangala Text', 'Data')
+TEXT_SUFFIXES = ('.txt', '.md', '.json', '.yaml')
+OCR_OUTPUT = '*_ocr.json'
+# Top-level directories that never hold OCR output (the site pages)
+NOT_OCR_DIRS = set(COLLECTIONS) | {'Data', 'assets', 'home'}
+# Built from the corpus by other tools (build_name_index.py, related_names.py,
+# citation_index.py); rebuild them instead of normalizing
+GENERATED = {'Data/naamani-index.json', 'Data/naamani-related.json', 'Data/citations.json'}
+
+CHUNK_SIZE = 400
+
+
+def find_files(root: Path, paths: Optional[List[str]] = None) -> List[str]:
+    """
+    Text files to normalize, relative to root
+
+    Args:
+        root: Repository root
+        paths: Files or directories (default: Jayamangala Text/, Data/ and
+               every *_ocr.json outside the site pages). GENERATED files
+               are skipped.
+    """
+    root_str = str(root)
+    files = []
+
+    def walk(top: str):
+        for directory, dirnames, filenames in os.walk(top):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            files.extend(os.path.join(directory, name) for name in sorted(filenames)
+                         if name.endswith(TEXT_SUFFIXES))
+
+    for path in paths or DEFAULT_PATHS:
+        full = os.path.join(root_str, path)
+        if os.path.isdir(full):
+            walk(full)
+        elif os.path.isfile(full):
+            files.append(full)
+
+    if not paths:
+        for entry in sorted(os.scandir(root_str), key=lambda e: e.name):
+            if entry.is_dir() and not entry.name.startswith(('.', '_')) and entry.name not in NOT_OCR_DIRS:
+                files += sorted(glob.glob(os.path.join(entry.path, '**', OCR_OUTPUT), recursive=True))
+
+    relative = (os.path.relpath(f, root_str) for f in dict.fromkeys(files))
+    return [f for f in relative if f.replace(os.sep, '/') not in GENERATED]
+
+
+def normalize_files(root: str, paths: List[str], nasals: str) -> List[Tuple[str, Dict[str, int], Optional[str]]]:
+    """
+    Normalize one chunk of files (runs in a worker)
+
+    Returns:
+        (path, changes per rule, new text or None if unchanged) for each file
+    """
+    results = []
+    for path in paths:
+        try:
+            # newline='' keeps CRLF line endings as they are
+            with open(os.path.join(root, path), 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+        except UnicodeDecodeError:
+            results.append((path, {'unreadable': 1}, None))
+            continue
+        counts = Counter()
+        new = normalize(text, nasals, counts)
+        results.append((path, dict(counts), new if new != text else None))
+    return results
+
+
+def _run_chunk(job: Tuple) -> List[Tuple[str, Dict[str, int], Optional[str]]]:
+    return normalize_files(*job)
+
+
+def normalize_corpus(root: Path = REPO_ROOT, paths: Optional[List[str]] = None, nasals: str = 'keep',
+                     workers: Optional[int] = None, write: bool = True, dry_run: bool = False,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+    """
+    Normalize every text file and write the changed ones
+
+    Args:
+        root: Repository root
+        paths: Files or directories relative to root (default: see find_files)
+        nasals: 'keep', 'conjunct' or 'anusvara' (see devanagari.normalize)
+        workers: Worker processes (default: CPU count)
+        write: Rewrite changed files (False for --check)
+        dry_run: Print a unified diff instead of writing
+
+    Returns:
+        Report with 'files', 'changed' ({path: {rule: n}}), 'totals' and 'seconds'
+    """
+    started = time.perf_counter()
+    root_str = str(root)
+    files = find_files(root, paths)
+    jobs = [(root_str, files[i:i + CHUNK_SIZE], nasals) for i in range(0, len(files), CHUNK_SIZE)]
+
+    workers = workers or os.cpu_count() or 1
+    # With one CPU (or one chunk) worker processes only add start-up time
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_run_chunk, jobs))
+    else:
+        chunks = [_run_chunk(job) for job in jobs]
+
+    changed = {}
+    unreadable = []
+    totals = Counter()
+    updates = []
+    for results in chunks:
+        for path, counts, new in results:
+            if 'unreadable' in counts:
+                unreadable.append(path)
+            elif new is not None:
+                changed[path] = counts
+                totals.update(counts)
+                updates.append((path, new))
+
+    if updates and (write or dry_run):
+        with BatchWriter(journal=root / JOURNAL_NAME, batch_size=batch_size,
+                         dry_run=dry_run, root=root) as writer:
+            for path, new in updates:
+                writer.write(root / path, new)
+
+    return {
+        'files': len(files),
+        'changed': changed,
+        'unreadable': unreadable,
+        'totals': dict(totals),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Normalize Devanagari in OCR output and corpus text (NFC, joiners, dandas, spacing)'
+    )
+    parser.add_argument('paths', nargs='*',
+                       help='Files or directories relative to --root (default: Jayamangala Text, Data, *_ocr.json)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Repository root (default: this checkout)')
+    parser.add_argument('--nasals', choices=NASAL_MODES, default='keep',
+                       help='Anusvara before a stop: keep as is, write the nasal conjunct (सङ्कर) '
+                            'or the anusvara (संकर) (default: keep)')
+    parser.add_argument('--check', action='store_true',
+                       help='Write nothing; exit with 1 if any file would change')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Print a unified diff of the changes instead of writing')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Files per atomic batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--top', type=int, default=20, help='Changed files to list (default: 20)')
+
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    report = normalize_corpus(root, args.paths, args.nasals, args.workers,
+                              write=not args.check, dry_run=args.dry_run, batch_size=args.batch_size)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    # Keep the diff clean for piping into a file or patch
+    out = sys.stderr if args.dry_run else sys.stdout
+    changed = report['changed']
+    for path, counts in list(changed.items())[:args.top]:
+        print(f"  {path}: " + ", ".join(f"{n} {rule}" for rule, n in sorted(counts.items())), file=out)
+    if len(changed) > args.top:
+        print(f"  ... {len(changed) - args.top} more (see --output)", file=out)
+    for path in report['unreadable']:
+        print(f"  ⚠️  {path}: not UTF-8, skipped", file=out)
+
+    print(f"\n{'='*60}", file=out)
+    for rule, n in sorted(report['totals'].items(), key=lambda item: -item[1]):
+        print(f"{rule:<12} {n:>8} change(s)", file=out)
+    action = 'would change' if args.check or args.dry_run else 'changed'
+    print(f"Normalized {report['files']} files in {report['seconds']:.2f}s: "
+          f"{len(changed)} {action}", file=out)
+    if args.output:
+        print(f"Report saved: {args.output}", file=out)
+    print(f"{'='*60}", file=out)
+
+    if args.check and changed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Measure OCR accuracy from proofreading JSON files
+Diffs ocr_text against corrected_text at the Devanagari grapheme-cluster
+level, reports CER/WER per page and per book, and collects the most
+frequent confusion pairs so they can be fed back into post-processing
+"""
+
+import sys
+import json
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from devanagari import graphemes, words
+
+# Replace blocks larger than this (ref units x hyp units) are aligned
+# positionally instead of with a full Levenshtein table
+MAX_ALIGN_CELLS = 250_000
+
+
+def levenshtein_ops(ref: Sequence[str], hyp: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    Align two short sequences and return the edits as (hyp_unit, ref_unit)
+
+    An empty string on either side marks an insertion or deletion.
+    """
+    if len(ref) * len(hyp) > MAX_ALIGN_CELLS:
+        ops = list(zip(hyp, ref))
+        ops += [(h, '') for h in hyp[len(ref):]]
+        ops += [('', r) for r in ref[len(hyp):]]
+        return [(h, r) for h, r in ops if h != r]
+
+    rows, cols = len(ref) + 1, len(hyp) + 1
+    dist = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        dist[i][0] = i
+    for j in range(cols):
+        dist[0][j] = j
+
+    for i in range(1, rows):
+        row, prev = dist[i], dist[i - 1]
+        r = ref[i - 1]
+        for j in range(1, cols):
+            cost = 0 if r == hyp[j - 1] else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+
+    ops = []
+    i, j = rows - 1, cols - 1
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and dist[i][j] == dist[i - 1][j - 1] + (ref[i - 1] != hyp[j - 1]):
+            if ref[i - 1] != hyp[j - 1]:
+                ops.append((hyp[j - 1], ref[i - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and dist[i][j] == dist[i - 1][j] + 1:
+            ops.append(('', ref[i - 1]))
+            i -= 1
+        else:
+            ops.append((hyp[j - 1], ''))
+            j -= 1
+
+    ops.reverse()
+    return ops
+
+
+def edit_ops(ref: Sequence[str], hyp: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    Compute the edits that turn hyp into ref
+
+    Matching runs are found first with SequenceMatcher, so the quadratic
+    alignment only runs on the (small) differing blocks.
+
+    Returns:
+        List of (hyp_unit, ref_unit) pairs, one per edit
+    """
+    matcher = SequenceMatcher(None, ref, hyp, autojunk=False)
+    ops = []
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        if tag == 'delete':
+            ops.extend(('', r) for r in ref[i1:i2])
+        elif tag == 'insert':
+            ops.extend((h, '') for h in hyp[j1:j2])
+        else:
+            ops.extend(levenshtein_ops(ref[i1:i2], hyp[j1:j2]))
+
+    return ops
+
+
+def score_page(task: Tuple[str, int, str, str]) -> Dict:
+    """
+    Score a single page
+
+    Args:
+        task: (book, page_number, ocr_text, corrected_text)
+
+    Returns:
+        Dict with grapheme/word counts, error counts and confusion pairs
+    """
+    book, page_number, ocr_text, corrected_text = task
+
+    ref_chars, hyp_chars = graphemes(corrected_text), graphemes(ocr_text)
+    ref_words, hyp_words = words(corrected_text), words(ocr_text)
+
+    char_ops = edit_ops(ref_chars, hyp_chars)
+    word_errors = len(edit_ops(ref_words, hyp_words))
+
+    confusions = Counter(op for op in char_ops if not op[0].isspace() and not op[1].isspace())
+
+    return {
+        'book': book,
+        'page_number': page_number,
+        'graphemes': len(ref_chars),
+        'grapheme_errors': len(char_ops),
+        'cer': len(char_ops) / max(len(ref_chars), 1),
+        'words': len(ref_words),
+        'word_errors': word_errors,
+        'wer': word_errors / max(len(ref_words), 1),
+        'confusions': list(confusions.items())
+    }
+
+
+def iter_proofreading_files(paths: List[str]) -> Iterator[Path]:
+    """Expand files and directories into *_proofreading.json files"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.rglob('*_proofreading.json'))
+        else:
+            yield path
+
+
+def load_tasks(paths: List[str]) -> List[Tuple[str, int, str, str]]:
+    """
+    Collect pages that have been proofread
+
+    Pages with an empty corrected_text have not been reviewed yet and
+    are left out.
+    """
+    tasks = []
+
+    for json_file in iter_proofreading_files(paths):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        book = Path(data.get('source_file') or json_file.name).stem
+        for page in data.get('pages', []):
+            corrected = page.get('corrected_text', '')
+            if corrected.strip():
+                tasks.append((book, page['page_number'], page.get('ocr_text', ''), corrected))
+
+    return tasks
+
+
+def evaluate(paths: List[str], workers: Optional[int] = None, top: int = 50) -> Dict:
+    """
+    Score every proofread page under the given paths in parallel
+
+    Args:
+        paths: Proofreading JSON files or directories containing them
+        workers: Number of worker processes (default: CPU count)
+        top: Number of confusion pairs to keep in the report
+
+    Returns:
+        Dict with per-page scores, per-book totals and top confusions
+    """
+    tasks = load_tasks(paths)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pages = list(pool.map(score_page, tasks, chunksize=16))
+
+    books = {}
+    confusions = Counter()
+
+    for page in pages:
+        totals = books.setdefault(page['book'], {
+            'pages': 0, 'graphemes': 0, 'grapheme_errors': 0, 'words': 0, 'word_errors': 0
+        })
+        totals['pages'] += 1
+        for key in ('graphemes', 'grapheme_errors', 'words', 'word_errors'):
+            totals[key] += page[key]
+
+        confusions.update(dict(page.pop('confusions')))
+
+    for totals in books.values():
+        totals['cer'] = totals['grapheme_errors'] / max(totals['graphemes'], 1)
+        totals['wer'] = totals['word_errors'] / max(totals['words'], 1)
+
+    return {
+        'pages': pages,
+        'books': books,
+        'confusions': [
+            {'ocr': ocr, 'correct': correct, 'count': count}
+            for (ocr, correct), count in confusions.most_common(top)
+        ]
+    }
+
+
+def substitution_rules(report: Dict, min_count: int = 3) -> Dict[str, str]:
+    """
+    Turn recurring one-to-one confusions into OCR -> correct rules
+
+    Confusions are sorted by count, so an OCR unit with several corrections
+    gets its most frequent one.
+    """
+    rules = {}
+    for item in report['confusions']:
+        if item['count'] >= min_count and item['ocr'] and item['correct'] and item['ocr'] not in rules:
+            rules[item['ocr']] = item['correct']
+    return rules
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Grapheme-level CER/WER for proofreading JSON files'
+    )
+    parser.add_argument('paths', nargs='+',
+                       help='Proofreading JSON files or directories to scan')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes (default: CPU count)')
+    parser.add_argument('--top', type=int, default=50,
+                       help='Confusion pairs to report (default: 50)')
+    parser.add_argument('--output', help='Write the full report as JSON')
+    parser.add_argument('--rules-out',
+                       help='Write recurring confusions as substitution rules (JSON)')
+    parser.add_argument('--min-count', type=int, default=3,
+                       help='Minimum occurrences for a substitution rule (default: 3)')
+
+    args = parser.parse_args()
+
+    report = evaluate(args.paths, workers=args.workers, top=args.top)
+
+    if not report['pages']:
+        print("No proofread pages found (corrected_text is empty everywhere)")
+        sys.exit(1)
+
+    print(f"{'Book':<40} {'Pages':>6} {'CER':>8} {'WER':>8}")
+    print('=' * 64)
+    for book, totals in sorted(report['books'].items()):
+        print(f"{book:<40} {totals['pages']:>6} {totals['cer']:>8.2%} {totals['wer']:>8.2%}")
+
+    print()
+    print("Top confusions (ocr -> correct):")
+    for item in report['confusions'][:20]:
+        print(f"  {item['ocr'] or '∅'} -> {item['correct'] or '∅'}: {item['count']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nReport saved: {args.output}")
+
+    if args.rules_out:
+        rules = substitution_rules(report, args.min_count)
+        with open(args.rules_out, 'w', encoding='utf-8') as f:
+            json.dump(rules, f, ensure_ascii=False, indent=2)
+        print(f"{len(rules)} substitution rules saved: {args.rules_out}")
+
+
+if __name__ == '__main__':
+    main()
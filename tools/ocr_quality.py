@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Cheap quality score for OCR output
+Used to decide which pages are worth re-running with a stronger model.
+Combines the density of [?] markers, the share of non-Devanagari letters,
+the out-of-lexicon word rate and how well the OCR line count matches the
+text lines detected in the page image.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+from devanagari import words, is_devanagari
+
+UNCLEAR_MARK = '[?]'
+
+# Models offered as --strong-model: slower and better than the default
+# flash tier, so escalating a page is never a no-op
+STRONG_MODELS = ('gemini-2.5-pro', 'gemini-pro-latest')
+
+# Penalty weights, summing to 1
+WEIGHTS = {
+    'unclear': 0.35,
+    'foreign': 0.25,
+    'oov': 0.2,
+    'lines': 0.2
+}
+
+DEVANAGARI_WORD_RE = re.compile(r'^[\u0900-\u0963\u0966-\u097F\u200C\u200D]+$')
+EDGE_PUNCT = '\'"‘’“”()[]{},.;:-—?!'
+
+
+def load_lexicon(paths: Iterable[str]) -> Set[str]:
+    """
+    Build a word list from text/markdown files
+
+    Args:
+        paths: Word-list files (one word per line) or directories whose
+               .txt/.md files are tokenised into words
+
+    Returns:
+        Set of Devanagari words
+    """
+    lexicon = set()
+
+    for path in map(Path, paths):
+        files = sorted(path.rglob('*')) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix not in ('.txt', '.md') or not file.is_file():
+                continue
+            with open(file, 'r', encoding='utf-8') as f:
+                for word in words(f.read()):
+                    word = word.strip(EDGE_PUNCT)
+                    if DEVANAGARI_WORD_RE.match(word):
+                        lexicon.add(word)
+
+    return lexicon
+
+
+def count_text_lines(image_path: str, min_height: int = 4) -> int:
+    """
+    Count text lines in a page image with a horizontal projection profile
+
+    The page is squashed to a single column so each pixel holds the mean
+    brightness of its row; runs of dark rows are text lines.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        gray = image.convert('L')
+        height = max(gray.height // 2, 1)
+        profile = list(gray.resize((1, height), Image.BOX).getdata())
+
+    paper = max(profile)
+    threshold = paper - (paper - min(profile)) * 0.1
+
+    lines = 0
+    run = 0
+    for value in profile + [paper]:
+        if value < threshold:
+            run += 1
+        else:
+            if run >= min_height // 2:
+                lines += 1
+            run = 0
+
+    return lines
+
+
+def score_text(text: str, lexicon: Optional[Set[str]] = None,
+               image_path: Optional[str] = None) -> Dict:
+    """
+    Score OCR output between 0 (unusable) and 1 (clean)
+
+    Args:
+        text: OCR output
+        lexicon: Known words; the out-of-lexicon signal is skipped without it
+        image_path: Page image; the line-count signal is skipped without it
+
+    Returns:
+        Dict with the overall score and each signal
+    """
+    tokens = [w.strip(EDGE_PUNCT) for w in words(text)]
+    tokens = [w for w in tokens if w]
+
+    if not tokens:
+        return {'score': 0.0, 'unclear': 1.0, 'foreign': 1.0, 'oov': None, 'lines': None}
+
+    letters = [c for c in text if c.isalpha() or is_devanagari(c)]
+    foreign = sum(1 for c in letters if not is_devanagari(c)) / max(len(letters), 1)
+
+    unclear = min(1.0, text.count(UNCLEAR_MARK) * 10 / len(tokens))
+
+    signals = {'unclear': unclear, 'foreign': foreign, 'oov': None, 'lines': None}
+
+    if lexicon:
+        sanskrit = [w for w in tokens if DEVANAGARI_WORD_RE.match(w)]
+        if sanskrit:
+            signals['oov'] = sum(1 for w in sanskrit if w not in lexicon) / len(sanskrit)
+
+    if image_path:
+        detected = count_text_lines(image_path)
+        ocr_lines = sum(1 for line in text.splitlines() if line.strip())
+        if detected:
+            signals['lines'] = min(1.0, abs(ocr_lines - detected) / detected)
+
+    # Skipped signals give their weight to the ones that were measured
+    used = {k: v for k, v in signals.items() if v is not None}
+    total_weight = sum(WEIGHTS[k] for k in used)
+    penalty = sum(WEIGHTS[k] * v for k, v in used.items()) / total_weight
+
+    return dict(signals, score=round(1.0 - penalty, 4))
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Shared OCR job queue
+Lets any number of ocr_pages.py / gemini_ocr.py workers, on one machine or
+several hosts sharing a filesystem, split a book without calling the API
+twice for the same page. Pages live in a SQLite database with a state:
+
+  pending -> leased (by one worker, until the lease expires) -> done
+                                                             -> failed
+
+A worker leases a page, OCRs it and marks it done. If the worker dies, its
+lease expires and the page goes back to pending. Failed attempts (and
+expired leases) are retried up to max_attempts times. A queue holds one
+book, since jobs are keyed by page number; use one database per book.
+Each worker can be assigned its own API
+key (by environment variable name, never the key itself) and model.
+
+    python3 tools/ocr_queue.py queue.sqlite init --images-dir "Jayamangala Book" \\
+        --text-dir "Jayamangala Text"
+    python3 tools/ocr_queue.py queue.sqlite assign laptop --key-env GEMINI_KEY_1
+    python3 tools/ocr_queue.py queue.sqlite assign server --key-env GEMINI_KEY_2 \\
+        --model gemini-2.5-pro
+    python3 tools/ocr_queue.py queue.sqlite status
+
+SQLite's locking needs a filesystem with working POSIX locks (local disks,
+most NFSv4 setups); avoid network shares that don't provide them.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+STATES = ('pending', 'leased', 'done', 'failed')
+
+DEFAULT_LEASE = 600
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_WINDOW = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    page INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    output TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    model TEXT,
+    score REAL,
+    first_pass_score REAL,
+    error TEXT,
+    added REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, page);
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY,
+    key_env TEXT,
+    model TEXT,
+    host TEXT,
+    last_seen REAL
+);
+"""
+
+
+class OcrQueue:
+    """
+    Page jobs in a SQLite database shared by all workers
+
+    Args:
+        path: Database file (created if missing)
+        lease_seconds: How long a worker may hold a page before it is
+                       handed to someone else
+        max_attempts: Attempts before a page is marked failed
+    """
+
+    def __init__(self, path: Union[str, Path], lease_seconds: float = DEFAULT_LEASE,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit; writes take the lock up front with BEGIN IMMEDIATE
+        self.db = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction holding the database lock from the start"""
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def add(self, jobs: Iterable[Tuple[int, str, str]]) -> int:
+        """
+        Queue pages that aren't queued yet
+
+        Args:
+            jobs: (page, source, output) triples; source is a page image, or
+                  a PDF to render that page from; output is the text file
+
+        Returns:
+            Number of pages added
+
+        Raises:
+            ValueError: A page is already queued from another source or to
+                        another output (i.e. from another book)
+        """
+        now = time.time()
+        jobs = [(page, str(source), str(output)) for page, source, output in jobs]
+        with self.transaction() as db:
+            for page, source, output in jobs:
+                row = db.execute('SELECT source, output FROM jobs WHERE page = ?', (page,)).fetchone()
+                if row and (row['source'], row['output']) != (source, output):
+                    raise ValueError(f"Page {page} is already queued from {row['source']}; "
+                                     f"use another queue database for {source}")
+            before = db.total_changes
+            db.executemany(
+                'INSERT OR IGNORE INTO jobs (page, source, output, added) VALUES (?, ?, ?, ?)',
+                [(page, source, output, now) for page, source, output in jobs]
+            )
+            return db.total_changes - before
+
+    def assign(self, worker: str, key_env: Optional[str] = None, model: Optional[str] = None) -> None:
+        """Set the API key variable and/or model a worker should use"""
+        with self.transaction() as db:
+            db.execute('INSERT OR IGNORE INTO workers (name) VALUES (?)', (worker,))
+            if key_env is not None:
+                db.execute('UPDATE workers SET key_env = ? WHERE name = ?', (key_env, worker))
+            if model is not None:
+                db.execute('UPDATE workers SET model = ? WHERE name = ?', (model, worker))
+
+    def worker(self, name: str) -> Optional[Dict]:
+        """A worker's assignment ({'name', 'key_env', 'model', ...}), if any"""
+        row = self.db.execute('SELECT * FROM workers WHERE name = ?', (name,)).fetchone()
+        return dict(row) if row else None
+
+    def credentials(self, worker: str, api_key: Optional[str] = None,
+                    model: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        API key and model for a worker: its assignment, else the given defaults
+
+        Raises:
+            KeyError: The worker's assigned key variable isn't set
+        """
+        assigned = self.worker(worker) or {}
+        if assigned.get('key_env'):
+            try:
+                api_key = os.environ[assigned['key_env']]
+            except KeyError:
+                raise KeyError(f"Worker {worker} uses ${assigned['key_env']}, which is not set")
+        return api_key, assigned.get('model') or model
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def lease(self, worker: str, count: int = 1) -> List[Dict]:
+        """
+        Take the next pending pages (expired leases are reclaimed first)
+
+        Returns:
+            Job rows as dicts, lowest page first; empty when nothing is left
+        """
+        now = time.time()
+        with self.transaction() as db:
+            self._expire(db, now)
+            self._seen(db, worker, now)
+            rows = db.execute(
+                "SELECT page FROM jobs WHERE state = 'pending' ORDER BY page LIMIT ?", (count,)
+            ).fetchall()
+            pages = [row['page'] for row in rows]
+            db.executemany(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, started = ?, "
+                "attempts = attempts + 1 WHERE page = ?",
+                [(worker, now + self.lease_seconds, now, page) for page in pages]
+            )
+            return [dict(row) for row in db.execute(
+                f"SELECT * FROM jobs WHERE page IN ({','.join('?' * len(pages))}) ORDER BY page", pages
+            )] if pages else []
+
+    def renew(self, worker: str, page: int) -> bool:
+        """Extend a lease before starting a long step; False if it was lost"""
+        now = time.time()
+        with self.transaction() as db:
+            self._seen(db, worker, now)
+            return db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE page = ? AND worker = ? AND state = 'leased'",
+                (now + self.lease_seconds, page, worker)
+            ).rowcount == 1
+
+    def complete(self, worker: str, page: int, model: Optional[str] = None,
+                 score: Optional[float] = None, first_pass_score: Optional[float] = None) -> bool:
+        """
+        Mark a leased page done
+
+        Returns:
+            False if the lease had expired and the page was taken over
+            (the other worker's result will then overwrite this one)
+        """
+        now = time.time()
+        with self.transaction() as db:
+            self._seen(db, worker, now)
+            return db.execute(
+                "UPDATE jobs SET state = 'done', finished = ?, model = ?, score = ?, "
+                "first_pass_score = ?, error = NULL, lease_expires = NULL "
+                "WHERE page = ? AND worker = ? AND state = 'leased'",
+                (now, model, score, first_pass_score, page, worker)
+            ).rowcount == 1
+
+    def fail(self, worker: str, page: int, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt
+
+        The page goes back to pending while it has attempts left (and retry
+        is set); otherwise it is marked failed.
+
+        Returns:
+            The page's new state
+        """
+        now = time.time()
+        with self.transaction() as db:
+            self._seen(db, worker, now)
+            row = db.execute('SELECT attempts FROM jobs WHERE page = ? AND worker = ? AND state = ?',
+                             (page, worker, 'leased')).fetchone()
+            if not row:
+                return 'lost'
+            state = 'pending' if retry and row['attempts'] < self.max_attempts else 'failed'
+            db.execute(
+                "UPDATE jobs SET state = ?, error = ?, worker = CASE WHEN ? = 'failed' THEN worker END, "
+                "lease_expires = NULL, finished = CASE WHEN ? = 'failed' THEN ? END WHERE page = ?",
+                (state, error, state, state, now, page)
+            )
+            return state
+
+    def release(self, worker: str, page: Optional[int] = None) -> int:
+        """
+        Hand leased pages back without counting an attempt (e.g. on a rate
+        limit or Ctrl+C)
+
+        Returns:
+            Number of pages released
+        """
+        with self.transaction() as db:
+            query = ("UPDATE jobs SET state = 'pending', worker = NULL, lease_expires = NULL, "
+                     "attempts = MAX(attempts - 1, 0) WHERE worker = ? AND state = 'leased'")
+            params = [worker]
+            if page is not None:
+                query += ' AND page = ?'
+                params.append(page)
+            return db.execute(query, params).rowcount
+
+    def _expire(self, db, now: float) -> int:
+        # A page that keeps killing its worker would otherwise be leased
+        # again forever; it fails once it has used its attempts
+        db.execute(
+            "UPDATE jobs SET state = 'failed', lease_expires = NULL, finished = ?, "
+            "error = 'lease expired' WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts)
+        )
+        return db.execute(
+            "UPDATE jobs SET state = 'pending', worker = NULL, lease_expires = NULL, "
+            "error = 'lease expired' WHERE state = 'leased' AND lease_expires < ?", (now,)
+        ).rowcount
+
+    def _seen(self, db, worker: str, now: float) -> None:
+        db.execute('INSERT OR IGNORE INTO workers (name) VALUES (?)', (worker,))
+        db.execute('UPDATE workers SET host = ?, last_seen = ? WHERE name = ?',
+                   (socket.gethostname(), now, worker))
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def retry_failed(self) -> int:
+        """Put failed pages back in the queue with a fresh attempt count"""
+        with self.transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, worker = NULL, finished = NULL "
+                "WHERE state = 'failed'"
+            ).rowcount
+
+    def remaining(self) -> int:
+        """Pages not yet done or failed"""
+        return self.db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')"
+        ).fetchone()[0]
+
+    def jobs(self, state: Optional[str] = None) -> List[Dict]:
+        """All job rows (optionally in one state), by page"""
+        if state:
+            rows = self.db.execute('SELECT * FROM jobs WHERE state = ? ORDER BY page', (state,))
+        else:
+            rows = self.db.execute('SELECT * FROM jobs ORDER BY page')
+        return [dict(row) for row in rows]
+
+    def status(self, window: float = DEFAULT_WINDOW) -> Dict:
+        """
+        Queue counts and throughput
+
+        Args:
+            window: Minutes of recent completions used for the throughput
+
+        Returns:
+            {'states', 'total', 'pages_per_min', 'eta_min', 'workers': [...]}
+        """
+        now = time.time()
+        since = now - window * 60
+        self._expire(self.db, now)
+
+        states = {state: 0 for state in STATES}
+        for row in self.db.execute('SELECT state, COUNT(*) AS n FROM jobs GROUP BY state'):
+            states[row['state']] = row['n']
+
+        # Pages per minute over the window, or since the first of those
+        # pages was leased when the run is younger than the window
+        done, first = self.db.execute(
+            "SELECT COUNT(*), MIN(started) FROM jobs WHERE state = 'done' AND finished >= ?", (since,)
+        ).fetchone()
+        minutes = max(min(window * 60, now - (first or now)), 60) / 60
+        rate = done / minutes
+        left = states['pending'] + states['leased']
+
+        workers = []
+        for row in self.db.execute(
+            "SELECT w.name, w.key_env, w.model, w.host, w.last_seen, "
+            "SUM(j.state = 'done') AS done, SUM(j.state = 'failed') AS failed, "
+            "SUM(j.state = 'leased') AS leased, "
+            "SUM(j.state = 'done' AND j.finished >= ?) AS recent "
+            "FROM workers w LEFT JOIN jobs j ON j.worker = w.name "
+            "GROUP BY w.name ORDER BY w.name", (since,)
+        ):
+            entry = dict(row)
+            for key in ('done', 'failed', 'leased', 'recent'):
+                entry[key] = entry[key] or 0
+            entry['pages_per_min'] = round(entry.pop('recent') / minutes, 2)
+            workers.append(entry)
+
+        return {
+            'states': states,
+            'total': sum(states.values()),
+            'window_min': window,
+            'pages_per_min': round(rate, 2),
+            'eta_min': round(left / rate, 1) if rate and left else None,
+            'workers': workers,
+        }
+
+    def quality_log(self) -> Dict:
+        """Done pages' scores in the ocr_log.json 'quality' format"""
+        quality = {}
+        for job in self.jobs('done'):
+            if job['score'] is None:
+                continue
+            entry = {'score': job['score'], 'model': job['model']}
+            if job['first_pass_score'] is not None:
+                entry['first_pass_score'] = job['first_pass_score']
+            quality[str(job['page'])] = entry
+        return quality
+
+
+def page_jobs(images_dir: Union[str, Path], text_dir: Union[str, Path],
+              start_page: Optional[int] = None, end_page: Optional[int] = None) -> List[Tuple[int, str, str]]:
+    """
+    (page, image, text file) for page_NNN.png scans, as ocr_pages.py names them
+
+    start_page/end_page select by position in the sorted list, as
+    ocr_pages.py's --start-page/--end-page do.
+    """
+    images = sorted(Path(images_dir).resolve().glob('page_*.png'))
+    if start_page or end_page:
+        images = images[(start_page - 1 if start_page else 0):(end_page or len(images))]
+    text_dir = Path(text_dir).resolve()
+    jobs = []
+    for image in images:
+        page = int(image.stem.split('_')[1])
+        jobs.append((page, str(image), str(text_dir / f"{page}.txt")))
+    return jobs
+
+
+def pdf_jobs(pdf_path: Union[str, Path], output_dir: Union[str, Path],
+             start_page: int, end_page: int) -> List[Tuple[int, str, str]]:
+    """(page, PDF, text file) for pages of a PDF, as gemini_ocr.py names them"""
+    pdf_path = Path(pdf_path).resolve()
+    pages_dir = Path(output_dir).resolve() / 'pages'
+    return [(page, str(pdf_path), str(pages_dir / f"{pdf_path.stem}_page_{page:03d}.txt"))
+            for page in range(start_page, end_page + 1)]
+
+
+def _ago(timestamp: Optional[float]) -> str:
+    if not timestamp:
+        return '-'
+    seconds = time.time() - timestamp
+    if seconds < 120:
+        return f"{seconds:.0f}s ago"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f}m ago"
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def print_status(queue: OcrQueue, window: float) -> None:
+    status = queue.status(window)
+    states = status['states']
+
+    print(f"{'='*60}")
+    print(f"Queue: {queue.path}")
+    print(f"  Pages: {status['total']}  " + "  ".join(f"{state}: {states[state]}" for state in STATES))
+    eta = f", ETA {status['eta_min']:.0f} min" if status['eta_min'] else ''
+    print(f"  Throughput (last {window:g} min): {status['pages_per_min']:.1f} pages/min{eta}")
+    print(f"{'='*60}")
+
+    if status['workers']:
+        print(f"\n{'Worker':<14} {'Model':<18} {'Key':<16} {'Done':>5} {'Failed':>6} {'Leased':>6} "
+              f"{'Pages/min':>9}  Last seen")
+        for worker in status['workers']:
+            print(f"{worker['name']:<14} {worker['model'] or '(default)':<18} "
+                  f"{('$' + worker['key_env']) if worker['key_env'] else '(default)':<16} "
+                  f"{worker['done']:>5} {worker['failed']:>6} {worker['leased']:>6} "
+                  f"{worker['pages_per_min']:>9.1f}  {_ago(worker['last_seen'])}"
+                  f"{' on ' + worker['host'] if worker['host'] else ''}")
+
+    failed = queue.jobs('failed')
+    if failed:
+        print(f"\n❌ Failed pages (retry with: python3 tools/ocr_queue.py {queue.path} retry):")
+        for job in failed[:20]:
+            print(f"  • Page {job['page']} after {job['attempts']} attempt(s): {job['error']}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Shared job queue for running OCR workers in parallel',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Queue the scans of a book, then start workers anywhere the files are visible
+  python3 tools/ocr_queue.py ocr.sqlite init --images-dir "Jayamangala Book" --text-dir "Jayamangala Text"
+  python3 tools/ocr_queue.py ocr.sqlite assign laptop --key-env GEMINI_KEY_1
+  cd "Jayamangala Book" && python3 ocr_pages.py --queue ../ocr.sqlite --worker laptop
+
+  # Queue the pages of a PDF for gemini_ocr.py
+  python3 tools/ocr_queue.py ocr.sqlite init --pdf book.pdf --output-dir ocr_output --end-page 400
+
+  # Progress, throughput and per-worker counts
+  python3 tools/ocr_queue.py ocr.sqlite status
+        '''
+    )
+    parser.add_argument('queue', help='Queue database file')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    init = commands.add_parser('init', help='Create the queue and add pages')
+    init.add_argument('--images-dir', help='Directory with page_NNN.png scans (ocr_pages.py)')
+    init.add_argument('--text-dir', help='Where ocr_pages.py writes N.txt (default: ../Jayamangala Text '
+                                         'relative to --images-dir)')
+    init.add_argument('--pdf', help='PDF to OCR page by page (gemini_ocr.py)')
+    init.add_argument('--output-dir', default='ocr_output', help='gemini_ocr.py output directory')
+    init.add_argument('--start-page', type=int, help='First page')
+    init.add_argument('--end-page', type=int, help='Last page (required with --pdf)')
+
+    assign = commands.add_parser('assign', help="Set a worker's API key variable and model")
+    assign.add_argument('worker', help='Worker name (as passed to --worker)')
+    assign.add_argument('--key-env', help='Environment variable holding the API key on that worker')
+    assign.add_argument('--model', help='Model the worker should use')
+
+    status = commands.add_parser('status', help='Show progress and throughput')
+    status.add_argument('--window', type=float, default=DEFAULT_WINDOW,
+                        help=f'Minutes of recent work for the throughput (default: {DEFAULT_WINDOW})')
+    status.add_argument('--json', action='store_true', help='Print the status as JSON')
+
+    commands.add_parser('retry', help='Put failed pages back in the queue')
+
+    release = commands.add_parser('release', help="Hand a stopped worker's leased pages back now")
+    release.add_argument('worker', help='Worker name')
+
+    args = parser.parse_args()
+    queue = OcrQueue(args.queue)
+
+    if args.command == 'init':
+        if args.pdf:
+            if not args.end_page:
+                parser.error('--end-page is required with --pdf')
+            jobs = pdf_jobs(args.pdf, args.output_dir, args.start_page or 1, args.end_page)
+        elif args.images_dir:
+            text_dir = args.text_dir or str(Path(args.images_dir) / '..' / 'Jayamangala Text')
+            jobs = page_jobs(args.images_dir, text_dir, args.start_page, args.end_page)
+        else:
+            parser.error('init needs --images-dir or --pdf')
+        try:
+            added = queue.add(jobs)
+        except ValueError as error:
+            print(f"❌ {error}")
+            queue.close()
+            sys.exit(1)
+        print(f"Queued {added} new page(s) ({len(jobs) - added} already queued) in {args.queue}")
+
+    elif args.command == 'assign':
+        queue.assign(args.worker, args.key_env, args.model)
+        print(f"Worker {args.worker}: {queue.worker(args.worker)}")
+
+    elif args.command == 'status':
+        if args.json:
+            print(json.dumps(queue.status(args.window), indent=2))
+        else:
+            print_status(queue, args.window)
+
+    elif args.command == 'retry':
+        print(f"Requeued {queue.retry_failed()} failed page(s)")
+
+    elif args.command == 'release':
+        print(f"Released {queue.release(args.worker)} page(s) leased by {args.worker}")
+
+    queue.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Page-weight and request-waterfall analyzer for the generated site
+Statically parses every index.html and reports, per page:
+- HTML bytes, with the inline <style> and <script> share
+- external assets (stylesheets, scripts, images), local or remote
+- the data fetches its scripts make, and whether they are awaited
+  one after another (fetch chains) or issued in parallel
+- transfer size, request count and critical-path depth
+
+Budgets (--max-kb, --max-requests, --max-depth, --max-inline-kb) make the
+run exit with 1 when any page exceeds them.
+
+Fetch analysis is heuristic: calls to fetch() and to functions that
+(transitively) call fetch() are followed from the script's top level;
+awaited calls add to the chain, un-awaited ones and Promise.all() groups
+run in parallel. URLs are resolved against the page using simple
+constants in the script and the page's own number.
+"""
+
+import re
+import sys
+import json
+from html.parser import HTMLParser
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Dict, List, Optional, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Directories that are not part of the published site
+SKIP_DIRS = {'.git', 'ocr', 'ocr_test', 'tools', 'bench', 'test', 'Jayamangala Book',
+             'Jayamangala Text', 'node_modules'}
+
+DEFAULT_BUDGETS = {
+    'max_kb': 200,
+    'max_requests': 15,
+    'max_depth': 5,
+    'max_inline_kb': 60,
+}
+
+FUNCTION_RE = re.compile(r'(?:async\s+)?function\s+(\w+)\s*\([^)]*\)\s*\{')
+CALL_RE = re.compile(r'(\bawait\s+)?\b([A-Za-z_$][\w$]*)\s*\(')
+PROMISE_ALL_RE = re.compile(r'Promise\.(?:all|allSettled)\s*\(')
+URL_ARG_RE = re.compile(r"\s*(`[^`]*`|'[^']*'|\"[^\"]*\")")
+CONST_RE = re.compile(
+    r"\b(?:const|let|var)\s+(\w+)\s*=\s*(?:'([^']*)'|\"([^\"]*)\"|(\d+)\b|parseInt\(\s*['\"]?(\d+)['\"]?\s*\))"
+)
+TEMPLATE_EXPR_RE = re.compile(r'\$\{([^}]*)\}')
+PAD_RE = re.compile(r"^String\((\w+)\)\.padStart\((\d+),\s*['\"]0['\"]\)$")
+FORMAT_RE = re.compile(r'^formatNumber\((\w+)\)$')
+LOAD_HANDLER_RE = re.compile(
+    r"addEventListener\(\s*['\"](?:load|DOMContentLoaded)['\"]\s*,\s*([A-Za-z_$][\w$]*)\s*\)"
+)
+COMMENT_RE = re.compile(r'/\*.*?\*/|(?<![:\'"\\])//[^\n]*', re.DOTALL)
+
+JS_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'typeof', 'new'}
+
+
+# ============================================================================
+# HTML parsing
+# ============================================================================
+
+class PageParser(HTMLParser):
+    """Collect inline blocks and external references of one page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_head = True
+        self.current = None
+        self.buffer = []
+        self.inline_css = 0
+        self.inline_js = 0
+        # Inline script text, or {'src': url} for external scripts, in document order
+        self.scripts: List = []
+        self.assets: List[Dict] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'body':
+            self.in_head = False
+        if tag == 'style':
+            self.current, self.buffer = 'style', []
+        elif tag == 'script':
+            if attrs.get('src'):
+                blocking = self.in_head and 'async' not in attrs and 'defer' not in attrs \
+                    and attrs.get('type') != 'module'
+                self.assets.append({'url': attrs['src'], 'type': 'script', 'blocking': blocking})
+                self.scripts.append({'src': attrs['src']})
+            else:
+                self.current, self.buffer = 'script', []
+        elif tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'stylesheet' in rel and attrs.get('href'):
+                self.assets.append({'url': attrs['href'], 'type': 'stylesheet', 'blocking': self.in_head})
+            elif 'icon' in rel and attrs.get('href'):
+                self.assets.append({'url': attrs['href'], 'type': 'icon', 'blocking': False})
+        elif tag == 'img' and attrs.get('src') and not attrs['src'].startswith('data:'):
+            self.assets.append({'url': attrs['src'], 'type': 'image', 'blocking': False})
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+        if self.current and tag == self.current:
+            text = ''.join(self.buffer)
+            size = len(text.encode('utf-8'))
+            if tag == 'style':
+                self.inline_css += size
+            else:
+                self.inline_js += size
+                self.scripts.append(text)
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current:
+            self.buffer.append(data)
+
+
+# ============================================================================
+# Script analysis
+# ============================================================================
+
+def matching_brace(text: str, start: int, open_char: str = '{', close_char: str = '}') -> int:
+    """Index just past the bracket that closes the one at `start`"""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == open_char:
+            depth += 1
+        elif text[i] == close_char:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(text)
+
+
+def split_functions(script: str) -> Tuple[Dict[str, str], str]:
+    """
+    Separate named function declarations from the top-level code
+
+    Returns:
+        ({name: body}, top-level code with the declarations removed)
+    """
+    functions = {}
+    top = []
+    pos = 0
+    for match in FUNCTION_RE.finditer(script):
+        if match.start() < pos:
+            continue
+        end = matching_brace(script, match.end() - 1)
+        functions[match.group(1)] = script[match.end():end - 1]
+        top.append(script[pos:match.start()])
+        pos = end
+    top.append(script[pos:])
+    return functions, ''.join(top)
+
+
+def find_calls(body: str, fetchers: Set[str]) -> List[Dict]:
+    """
+    Calls to fetch-like functions in a body, in source order
+
+    Returns:
+        List of {'name', 'awaited', 'group', 'url'}; calls inside the same
+        Promise.all(...) share a group number
+    """
+    groups = []
+    for match in PROMISE_ALL_RE.finditer(body):
+        groups.append((match.end() - 1, matching_brace(body, match.end() - 1, '(', ')')))
+
+    calls = []
+    for match in CALL_RE.finditer(body):
+        name = match.group(2)
+        if name not in fetchers or name in JS_KEYWORDS:
+            continue
+        if match.start(2) > 0 and body[match.start(2) - 1] == '.':
+            continue
+        group = next((i for i, (start, end) in enumerate(groups) if start < match.start() < end), None)
+        url = URL_ARG_RE.match(body, match.end())
+        calls.append({
+            'name': name,
+            'awaited': bool(match.group(1)) or group is not None,
+            'group': group,
+            'url': url.group(1)[1:-1] if url else None,
+        })
+    return calls
+
+
+def chain(calls: List[Dict], depth_of) -> int:
+    """Longest sequence of dependent requests through a list of calls"""
+    running = 0
+    best = 0
+    group_depth: Dict[int, int] = {}
+    for call in calls:
+        depth = depth_of(call['name'])
+        if call['group'] is not None:
+            group_depth[call['group']] = max(group_depth.get(call['group'], 0), depth)
+            best = max(best, running + group_depth[call['group']])
+            continue
+        if group_depth:
+            running += max(group_depth.values())
+            group_depth = {}
+        if call['awaited']:
+            running += depth
+            best = max(best, running)
+        else:
+            best = max(best, running + depth)
+    if group_depth:
+        best = max(best, running + max(group_depth.values()))
+    return best
+
+
+def analyze_scripts(scripts: List[str]) -> Dict:
+    """
+    Work out the data requests a page's inline scripts make on load
+
+    Returns:
+        {'fetches': [{'url', 'via', 'awaited'}...], 'depth': longest fetch chain}
+    """
+    code = COMMENT_RE.sub('', '\n'.join(scripts))
+    functions, top = split_functions(code)
+
+    # Functions that end up calling fetch(), found by fixed-point iteration
+    fetchers = {'fetch'}
+    changed = True
+    while changed:
+        changed = False
+        for name, body in functions.items():
+            if name not in fetchers and find_calls(body, fetchers):
+                fetchers.add(name)
+                changed = True
+
+    calls_of = {name: find_calls(functions[name], fetchers) for name in fetchers if name in functions}
+
+    depths: Dict[str, int] = {}
+
+    def depth_of(name, stack=()):
+        if name == 'fetch':
+            return 1
+        if name in stack:
+            return 0
+        if name not in depths:
+            depths[name] = chain(calls_of.get(name, []), lambda n: depth_of(n, stack + (name,)))
+        return depths[name]
+
+    fetches: List[Dict] = []
+
+    def collect(name, url, awaited, stack=()):
+        if name == 'fetch':
+            fetches.append({'url': url, 'via': stack[-1] if stack else 'fetch', 'awaited': awaited})
+            return
+        if name in stack:
+            return
+        for call in calls_of.get(name, []):
+            # A wrapper's own fetch(url + ...) takes the URL passed to the wrapper
+            collect(call['name'], call['url'] or url, call['awaited'], stack + (name,))
+
+    top_calls = find_calls(top, fetchers)
+    # window.addEventListener('load', loadCommentary) passes the loader by reference
+    top_calls += [{'name': m.group(1), 'awaited': False, 'group': None, 'url': None}
+                  for m in LOAD_HANDLER_RE.finditer(top) if m.group(1) in fetchers]
+    for call in top_calls:
+        collect(call['name'], call['url'], call['awaited'])
+
+    return {'fetches': fetches, 'depth': chain(top_calls, depth_of)}
+
+
+# ============================================================================
+# URL resolution
+# ============================================================================
+
+def script_constants(scripts: List[str]) -> Dict[str, str]:
+    """Simple `const name = 'value' | 123` assignments"""
+    constants = {}
+    for match in CONST_RE.finditer('\n'.join(scripts)):
+        value = next(v for v in match.groups()[1:] if v is not None)
+        constants.setdefault(match.group(1), value)
+    return constants
+
+
+def expression_values(expression: str, constants: Dict[str, str], page_number: Optional[str]) -> List[str]:
+    """Candidate values of a ${...} expression in a fetch URL"""
+    expression = expression.strip()
+    if expression in constants:
+        return [constants[expression]]
+
+    pad = PAD_RE.match(expression)
+    if pad and pad.group(1) in constants and constants[pad.group(1)].isdigit():
+        return [constants[pad.group(1)].zfill(int(pad.group(2)))]
+
+    fmt = FORMAT_RE.match(expression)
+    if fmt and fmt.group(1) in constants and constants[fmt.group(1)].isdigit():
+        return [constants[fmt.group(1)].zfill(4)]
+
+    if expression == 'cacheBuster' or 'Date.now' in expression:
+        return ['']
+
+    if page_number:
+        return [page_number.zfill(4), page_number]
+    return []
+
+
+def resolve_url(url: Optional[str], page: Path, constants: Dict[str, str]) -> Optional[Path]:
+    """Local file a fetch URL points at, if it can be determined and exists"""
+    if not url or url.startswith(('http://', 'https://', '//')):
+        return None
+
+    page_number = page.parent.name if page.parent.name.isdigit() else None
+    parts = TEMPLATE_EXPR_RE.split(url)
+    literals, expressions = parts[0::2], parts[1::2]
+    options = [expression_values(e, constants, page_number) for e in expressions]
+    if any(not values for values in options):
+        return None
+
+    for values in product(*options):
+        candidate = literals[0] + ''.join(v + lit for v, lit in zip(values, literals[1:]))
+        candidate = candidate.split('?')[0].split('#')[0]
+        path = (page.parent / candidate).resolve()
+        if path.is_file():
+            return path
+    return None
+
+
+# ============================================================================
+# Page analysis
+# ============================================================================
+
+def analyze_page(args: Tuple[str, str]) -> Dict:
+    """
+    Worker: analyze one page
+
+    Args:
+        args: (page path, site root)
+
+    Returns:
+        Per-page report dict
+    """
+    path, root = Path(args[0]), Path(args[1])
+    raw = path.read_bytes()
+    parser = PageParser()
+    parser.feed(raw.decode('utf-8', errors='replace'))
+
+    assets = []
+    missing = []
+    for asset in parser.assets:
+        url = asset['url']
+        entry = dict(asset, size=None, local=not url.startswith(('http://', 'https://', '//')))
+        if entry['local']:
+            target = (path.parent / url.split('?')[0].split('#')[0]).resolve()
+            if target.is_file():
+                entry['size'] = target.stat().st_size
+            else:
+                missing.append(url)
+        assets.append(entry)
+
+    # Local scripts (e.g. assets/bundles/*.js) run in order with the inline ones
+    code = []
+    for script in parser.scripts:
+        if isinstance(script, str):
+            code.append(script)
+        elif not script['src'].startswith(('http://', 'https://', '//')):
+            target = (path.parent / script['src'].split('?')[0]).resolve()
+            if target.is_file():
+                code.append(target.read_text(encoding='utf-8', errors='replace'))
+
+    scripts = analyze_scripts(code)
+    constants = script_constants(code)
+    unresolved = 0
+    fetch_bytes = 0
+    for fetch in scripts['fetches']:
+        target = resolve_url(fetch['url'], path, constants)
+        fetch['size'] = target.stat().st_size if target else None
+        if target:
+            fetch_bytes += fetch['size']
+        else:
+            unresolved += 1
+
+    blocking = any(a['blocking'] for a in assets)
+    fonts = any('fonts.googleapis.com' in a['url'] for a in assets if a['type'] == 'stylesheet')
+    # HTML -> render-blocking assets -> inline script fetch chain;
+    # Google Fonts is a side chain: HTML -> CSS -> font files
+    depth = max(1 + int(blocking) + scripts['depth'], 3 if fonts else 1)
+
+    asset_bytes = sum(a['size'] or 0 for a in assets)
+    return {
+        'page': path.relative_to(root).as_posix(),
+        'html_bytes': len(raw),
+        'inline_css_bytes': parser.inline_css,
+        'inline_js_bytes': parser.inline_js,
+        'assets': assets,
+        'missing_assets': missing,
+        'fetches': scripts['fetches'],
+        'fetch_chain': scripts['depth'],
+        'unresolved_fetches': unresolved,
+        'requests': 1 + len(assets) + len(scripts['fetches']),
+        'transfer_bytes': len(raw) + asset_bytes + fetch_bytes,
+        'critical_path_depth': depth,
+    }
+
+
+def find_pages(root: Path) -> List[Path]:
+    """All published index.html pages under the site root"""
+    pages = []
+    for path in sorted(root.rglob('index.html')):
+        rel = path.relative_to(root).parts
+        if rel and rel[0] in SKIP_DIRS:
+            continue
+        pages.append(path)
+    return pages
+
+
+def check_budgets(report: Dict, budgets: Dict) -> List[str]:
+    """Budget violations of one page"""
+    problems = []
+    if report['transfer_bytes'] > budgets['max_kb'] * 1024:
+        problems.append(f"transfer {report['transfer_bytes'] / 1024:.0f} KB > {budgets['max_kb']} KB")
+    if report['requests'] > budgets['max_requests']:
+        problems.append(f"{report['requests']} requests > {budgets['max_requests']}")
+    if report['critical_path_depth'] > budgets['max_depth']:
+        problems.append(f"critical path {report['critical_path_depth']} > {budgets['max_depth']}")
+    inline = report['inline_css_bytes'] + report['inline_js_bytes']
+    if inline > budgets['max_inline_kb'] * 1024:
+        problems.append(f"inline {inline / 1024:.0f} KB > {budgets['max_inline_kb']} KB")
+    return problems
+
+
+def summarize(reports: List[Dict]) -> Dict:
+    """Totals and per-section aggregates"""
+    sections: Dict[str, Dict] = {}
+    for report in reports:
+        parts = report['page'].split('/')
+        section = parts[0] if len(parts) > 1 else '(root)'
+        entry = sections.setdefault(section, {'pages': 0, 'transfer_bytes': 0, 'requests': 0,
+                                              'max_depth': 0, 'inline_bytes': 0})
+        entry['pages'] += 1
+        entry['transfer_bytes'] += report['transfer_bytes']
+        entry['requests'] += report['requests']
+        entry['inline_bytes'] += report['inline_css_bytes'] + report['inline_js_bytes']
+        entry['max_depth'] = max(entry['max_depth'], report['critical_path_depth'])
+
+    for entry in sections.values():
+        entry['avg_transfer_kb'] = round(entry['transfer_bytes'] / entry['pages'] / 1024, 1)
+        entry['avg_requests'] = round(entry['requests'] / entry['pages'], 1)
+
+    missing = sorted({url for r in reports for url in r['missing_assets']})
+    return {
+        'pages': len(reports),
+        'html_bytes': sum(r['html_bytes'] for r in reports),
+        'inline_bytes': sum(r['inline_css_bytes'] + r['inline_js_bytes'] for r in reports),
+        'sections': sections,
+        'missing_assets': missing,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Report page weight, request count and fetch-chain depth for every site page'
+    )
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Site root (default: repository root)')
+    parser.add_argument('--pages', nargs='+', help='Only analyze these pages')
+    parser.add_argument('--output', help='Write the full per-page report as JSON')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--top', type=int, default=10, help='Heaviest pages to list (default: 10)')
+    parser.add_argument('--max-kb', type=float, default=DEFAULT_BUDGETS['max_kb'],
+                       help=f"Transfer budget per page in KB (default: {DEFAULT_BUDGETS['max_kb']})")
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_BUDGETS['max_requests'],
+                       help=f"Request budget per page (default: {DEFAULT_BUDGETS['max_requests']})")
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_BUDGETS['max_depth'],
+                       help=f"Critical-path depth budget (default: {DEFAULT_BUDGETS['max_depth']})")
+    parser.add_argument('--max-inline-kb', type=float, default=DEFAULT_BUDGETS['max_inline_kb'],
+                       help=f"Inline CSS+JS budget per page in KB (default: {DEFAULT_BUDGETS['max_inline_kb']})")
+
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    pages = [Path(p).resolve() for p in args.pages] if args.pages else find_pages(root)
+    if not pages:
+        print(f"No pages found under {root}")
+        sys.exit(1)
+
+    print(f"Analyzing {len(pages)} pages...")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        reports = list(pool.map(analyze_page, [(str(p), str(root)) for p in pages], chunksize=64))
+
+    budgets = {
+        'max_kb': args.max_kb,
+        'max_requests': args.max_requests,
+        'max_depth': args.max_depth,
+        'max_inline_kb': args.max_inline_kb,
+    }
+    violations = {}
+    for report in reports:
+        problems = check_budgets(report, budgets)
+        if problems:
+            violations[report['page']] = problems
+
+    summary = summarize(reports)
+
+    print(f"\n{'Section':<22} {'Pages':>6} {'Avg KB':>8} {'Avg req':>8} {'Max depth':>10}")
+    for section, entry in sorted(summary['sections'].items()):
+        print(f"{section:<22} {entry['pages']:>6} {entry['avg_transfer_kb']:>8} "
+              f"{entry['avg_requests']:>8} {entry['max_depth']:>10}")
+
+    print(f"\nHeaviest pages:")
+    for report in sorted(reports, key=lambda r: -r['transfer_bytes'])[:args.top]:
+        print(f"  {report['transfer_bytes'] / 1024:>7.1f} KB  {report['requests']:>3} req  "
+              f"depth {report['critical_path_depth']}  {report['page']}")
+
+    print(f"\nLongest critical paths:")
+    for report in sorted(reports, key=lambda r: -r['critical_path_depth'])[:args.top]:
+        print(f"  depth {report['critical_path_depth']}  {report['page']}"
+              f"  ({report['fetch_chain']} sequential fetches)")
+
+    if summary['missing_assets']:
+        print(f"\nMissing local assets (404 on every page that references them):")
+        for url in summary['missing_assets']:
+            print(f"  {url}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'budgets': budgets, 'violations': violations,
+                       'pages': reports}, f, ensure_ascii=False, indent=2)
+        print(f"\nReport saved: {args.output}")
+
+    print(f"\n{'='*60}")
+    print(f"Pages: {summary['pages']}")
+    print(f"HTML: {summary['html_bytes'] / 1e6:.1f} MB ({summary['inline_bytes'] / 1e6:.1f} MB inline CSS/JS)")
+    print(f"Over budget: {len(violations)} page(s)")
+    print(f"{'='*60}")
+
+    if violations:
+        for page, problems in list(violations.items())[:args.top]:
+            print(f"  ⚠️  {page}: {'; '.join(problems)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
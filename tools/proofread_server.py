@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Local proofreading viewer for OCRed books
+Serves page scans as deep-zoom tiles (built by tools/tile_pages.py) next to
+the OCR text of the same page, and saves corrections back into the
+*_proofreading.json that gemini_ocr.py writes.
+
+For the Jayamangala Book workflow (page_NNN.png -> Jayamangala Text/N.txt),
+--from-text creates the proofreading JSON first.
+"""
+
+import os
+import sys
+import json
+import threading
+from datetime import datetime
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+VIEWER_HTML = Path(__file__).resolve().parent / 'proofread_viewer.html'
+
+STATUSES = ('pending', 'in_review', 'corrected', 'verified')
+EDITABLE_FIELDS = ('corrected_text', 'status', 'notes', 'needs_review')
+QUALITY_THRESHOLD = 0.8
+
+
+def proofreading_from_text(text_dir: Path, images_dir: Path) -> Dict:
+    """
+    Build a proofreading document from ocr_pages.py output
+
+    Args:
+        text_dir: Directory with N.txt files (and optionally ocr_log.json)
+        images_dir: Directory with page_NNN.png scans
+
+    Returns:
+        Dict in the same shape as gemini_ocr.py's *_proofreading.json
+    """
+    quality = {}
+    log_file = text_dir / 'ocr_log.json'
+    if log_file.exists():
+        with open(log_file, 'r', encoding='utf-8') as f:
+            log = json.load(f)
+        quality = log.get('quality') or {}
+
+    pages = []
+    for image_path in sorted(images_dir.glob('page_*.png')):
+        page_num = int(image_path.stem.split('_')[1])
+        txt_file = text_dir / f"{page_num}.txt"
+        if not txt_file.exists():
+            continue
+        score = quality.get(str(page_num), {}).get('score')
+        pages.append({
+            'page_number': page_num,
+            'image_file': image_path.name,
+            'ocr_text': txt_file.read_text(encoding='utf-8'),
+            'corrected_text': '',
+            'needs_review': score is not None and score < QUALITY_THRESHOLD,
+            'notes': '',
+            'status': 'pending'
+        })
+
+    return {
+        'project': 'Lalita Sahasranama Commentaries',
+        'source_file': str(images_dir),
+        'ocr_method': 'ocr_pages.py',
+        'date': datetime.now().isoformat(),
+        'pages': pages
+    }
+
+
+class ProofreadingStore:
+    """The proofreading JSON, with atomic saves"""
+
+    def __init__(self, json_path: Path):
+        self.path = json_path
+        self.lock = threading.Lock()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+
+    @property
+    def pages(self) -> List[Dict]:
+        return self.data.get('pages', [])
+
+    def update(self, index: int, changes: Dict) -> Dict:
+        """
+        Apply edits to one page and write the file
+
+        Raises:
+            IndexError: No such page
+            ValueError: Not a JSON object, unknown field or status
+        """
+        if not isinstance(changes, dict):
+            raise ValueError('Expected a JSON object of field changes')
+        if index < 0:
+            raise IndexError(index)
+        unknown = set(changes) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields not editable: {', '.join(sorted(unknown))}")
+        if 'status' in changes and changes['status'] not in STATUSES:
+            raise ValueError(f"Unknown status: {changes['status']}")
+
+        with self.lock:
+            page = self.pages[index]
+            page.update(changes)
+            self.save()
+            return page
+
+    def save(self):
+        """Write to a temp file and rename, so an interrupted save never truncates the JSON"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def make_handler(store: ProofreadingStore, images_dir: Path, tiles_dir: Path):
+    """Request handler bound to one proofreading document"""
+
+    class Handler(SimpleHTTPRequestHandler):
+
+        def log_message(self, format, *args):
+            # Tile requests are far too chatty to log
+            pass
+
+        def send_json(self, payload, status=HTTPStatus.OK):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_file(self, base: Path, relative: str, cache: bool):
+            path = (base / relative).resolve()
+            if base.resolve() not in path.parents or not path.is_file():
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            body = path.read_bytes()
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', self.guess_type(str(path)))
+            self.send_header('Content-Length', str(len(body)))
+            if cache:
+                self.send_header('Cache-Control', 'max-age=86400')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def page_summary(self, index: int, page: Dict) -> Dict:
+            stem = Path(page.get('image_file', '')).stem
+            has_tiles = (tiles_dir / f"{stem}.dzi").exists()
+            return {
+                **page,
+                'index': index,
+                'tiles': f"/tiles/{stem}.dzi" if has_tiles else None,
+                'image': f"/images/{page.get('image_file', '')}"
+            }
+
+        def do_GET(self):
+            path = unquote(urlparse(self.path).path)
+            if path in ('/', '/index.html'):
+                self.send_file(VIEWER_HTML.parent, VIEWER_HTML.name, cache=False)
+            elif path == '/api/pages':
+                self.send_json({
+                    'project': store.data.get('project', ''),
+                    'source_file': store.data.get('source_file', ''),
+                    'statuses': STATUSES,
+                    'pages': [self.page_summary(i, p) for i, p in enumerate(store.pages)]
+                })
+            elif path.startswith('/tiles/'):
+                self.send_file(tiles_dir, path[len('/tiles/'):], cache=True)
+            elif path.startswith('/images/'):
+                self.send_file(images_dir, path[len('/images/'):], cache=True)
+            else:
+                self.send_error(HTTPStatus.NOT_FOUND)
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            if not path.startswith('/api/pages/'):
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            try:
+                index = int(path.rsplit('/', 1)[1])
+                length = int(self.headers.get('Content-Length', 0))
+                changes = json.loads(self.rfile.read(length) or b'{}')
+                page = store.update(index, changes)
+            except IndexError:
+                self.send_json({'error': 'No such page'}, HTTPStatus.NOT_FOUND)
+                return
+            except (ValueError, json.JSONDecodeError) as e:
+                self.send_json({'error': str(e)}, HTTPStatus.BAD_REQUEST)
+                return
+            self.send_json(self.page_summary(index, page))
+
+    return Handler
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Serve a side-by-side scan/OCR proofreading viewer'
+    )
+    parser.add_argument('proofreading_json', nargs='?',
+                       default=str(REPO_ROOT / 'ocr_test' / 'JayaMangala_proofreading.json'),
+                       help='Proofreading JSON (default: ocr_test/JayaMangala_proofreading.json)')
+    parser.add_argument('--images-dir', help='Page images (default: images/ next to the JSON)')
+    parser.add_argument('--tiles-dir', help='Tile pyramids (default: <images-dir>/tiles)')
+    parser.add_argument('--from-text', metavar='TEXT_DIR',
+                       help='Create the JSON from ocr_pages.py output (N.txt files) if it does not exist')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+
+    args = parser.parse_args()
+
+    json_path = Path(args.proofreading_json)
+    images_dir = Path(args.images_dir) if args.images_dir else json_path.parent / 'images'
+    tiles_dir = Path(args.tiles_dir) if args.tiles_dir else images_dir / 'tiles'
+
+    if args.from_text and not json_path.exists():
+        data = proofreading_from_text(Path(args.from_text), images_dir)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"Created {json_path} with {len(data['pages'])} page(s)")
+
+    if not json_path.exists():
+        print(f"Proofreading file not found: {json_path}")
+        sys.exit(1)
+
+    store = ProofreadingStore(json_path)
+    tiled = sum(1 for p in store.pages
+                if (tiles_dir / f"{Path(p.get('image_file', '')).stem}.dzi").exists())
+
+    print(f"Proofreading: {json_path} ({len(store.pages)} pages)")
+    print(f"Images: {images_dir}")
+    print(f"Tiles: {tiles_dir} ({tiled}/{len(store.pages)} pages tiled)")
+    if tiled < len(store.pages):
+        print(f"⚠️  Untiled pages load the full image; run: python3 tools/tile_pages.py \"{images_dir}\"")
+    print(f"\nOpen http://localhost:{args.port}/  (Ctrl+C to stop)")
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(store, images_dir, tiles_dir))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Find related names for the name pages
+Each of the 1000 names becomes a vector: TF-IDF over its Soubhagya
+Bhaskara, Balatapa and Datta text, plus its Data/tags categories (none yet:
+every tags file is still the commented-out template). All-pairs
+cosine similarity is one matrix product, and the top-k neighbours of every
+name are picked from it in one batched argpartition.
+
+Writes Data/naamani-related.json for naamani/naamani.html. Also usable
+from Python:
+
+    from related_names import RelatedNames
+    related = RelatedNames.build()
+    related.neighbours(1, k=5)        # [(number, score), ...]
+    related.query('त्रिपुरसुन्दरी')     # names closest to free text
+"""
+
+import re
+import sys
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("\nPlease install:")
+    print("  pip3 install numpy")
+    sys.exit(1)
+
+from corpus import Corpus
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RELATED_FILE = REPO_ROOT / 'Data' / 'naamani-related.json'
+
+TEXT_SOURCES = ('soubhagyabhaskara', 'balatapa', 'datta')
+DEFAULT_K = 8
+DEFAULT_TAG_WEIGHT = 0.5
+
+# Devanagari words (without dandas) and Latin words from the English Datta meanings
+TOKEN_RE = re.compile(r'[ऀ-ॣ०-ॿ]+|[A-Za-z]+')
+# An uncommented YAML key: indentation, key
+TAG_KEY_RE = re.compile(r'^(\s*)([^#\s:][^:#]*):')
+
+
+def tokenize(text: str) -> List[str]:
+    """Words of a commentary, Latin words lowercased"""
+    return [token.lower() if token.isascii() else token for token in TOKEN_RE.findall(text)]
+
+
+def parse_tags(text: str) -> Set[str]:
+    """
+    Tags set in a Data/tags YAML file
+
+    The files are templates where unused categories are commented out, so a
+    tag is an uncommented subcategory ("रूप/मुख"); its category ("रूप") is
+    added with it. Numbered entries under a subcategory are ignored.
+
+    Returns:
+        Set of 'category' and 'category/subcategory' strings
+    """
+    tags = set()
+    category = None
+    for line in text.splitlines():
+        match = TAG_KEY_RE.match(line)
+        if not match:
+            continue
+        indent, key = match.group(1), match.group(2).strip()
+        if not indent:
+            category = key
+        elif category and not key.isdigit():
+            tags.add(category)
+            tags.add(f"{category}/{key}")
+    return tags
+
+
+def record_text(record) -> str:
+    """Commentary text used to describe one name"""
+    parts = []
+    for kind in TEXT_SOURCES:
+        text = record.commentary(kind)
+        if not text:
+            continue
+        if kind == 'datta':
+            data = json.loads(text)
+            text = f"{data.get('meaning', '')} {data.get('commentary', '')}"
+        parts.append(text)
+    return '\n'.join(parts)
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (all-zero rows stay zero)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class RelatedNames:
+    """
+    Name vectors and nearest-neighbour queries
+
+    Args:
+        numbers: Name numbers, one per row
+        vectors: Unit-length row vectors (text features, then tag features)
+        vocabulary: Term -> text feature column
+        idf: IDF weight of each text feature column
+        tag_features: Number of tag feature columns (0: text-only neighbours)
+    """
+
+    def __init__(self, numbers: List[int], vectors: np.ndarray,
+                 vocabulary: Dict[str, int], idf: np.ndarray, tag_features: int = 0):
+        self.numbers = np.asarray(numbers)
+        self.vectors = vectors
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.tag_features = tag_features
+        self._rows = {number: row for row, number in enumerate(numbers)}
+
+    @classmethod
+    def build(cls, corpus: Optional[Corpus] = None, tag_weight: float = DEFAULT_TAG_WEIGHT,
+              min_df: int = 2, max_df: float = 0.5) -> 'RelatedNames':
+        """
+        Vectorize every name in the corpus
+
+        Args:
+            corpus: Corpus to read (default: this checkout)
+            tag_weight: Weight of the tag features relative to the text features
+            min_df: Ignore terms found in fewer names than this
+            max_df: Ignore terms found in more than this fraction of names
+
+        Returns:
+            RelatedNames over all names
+        """
+        corpus = corpus or Corpus(cache_size=0)
+        numbers, documents, tag_sets = [], [], []
+        for record in corpus.records('naamani'):
+            numbers.append(record.number)
+            documents.append(Counter(tokenize(record_text(record))))
+            tags = record.commentary('tags')
+            tag_sets.append(parse_tags(tags) if tags else set())
+
+        text, vocabulary, idf = cls._tfidf(documents, min_df, max_df)
+        tags, _, _ = cls._tfidf([Counter(tags) for tags in tag_sets], 1, 1.0)
+
+        if not tags.shape[1]:
+            print("⚠️  No tags set in Data/tags (the files are still the commented-out template); "
+                  "related names use the commentary text only", file=sys.stderr)
+
+        vectors = np.hstack([l2_normalize(text), tag_weight * l2_normalize(tags)])
+        return cls(numbers, l2_normalize(vectors).astype(np.float32), vocabulary, idf, tags.shape[1])
+
+    @staticmethod
+    def _tfidf(documents: List[Counter], min_df: int,
+               max_df: float) -> Tuple[np.ndarray, Dict[str, int], np.ndarray]:
+        """Dense sublinear-TF x smoothed-IDF matrix over the kept vocabulary"""
+        n = len(documents)
+        df = Counter(term for document in documents for term in document)
+        terms = sorted(term for term, count in df.items() if count >= min_df and count <= max_df * n)
+        vocabulary = {term: column for column, term in enumerate(terms)}
+
+        rows, columns, counts = [], [], []
+        for row, document in enumerate(documents):
+            for term, count in document.items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    counts.append(count)
+
+        matrix = np.zeros((n, len(terms)), dtype=np.float32)
+        matrix[rows, columns] = 1 + np.log(np.asarray(counts, dtype=np.float32))
+        idf = np.log((1 + n) / (1 + np.array([df[term] for term in terms], dtype=np.float32))) + 1
+        return matrix * idf, vocabulary, idf
+
+    def top_k(self, k: int = DEFAULT_K) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest neighbours of every name at once
+
+        Returns:
+            (rows, scores): (names x k) arrays of neighbour row indices and
+            cosine similarities, best first
+        """
+        k = min(k, len(self.numbers) - 1)
+        similarity = self.vectors @ self.vectors.T
+        np.fill_diagonal(similarity, -np.inf)
+
+        rows = np.argpartition(-similarity, k, axis=1)[:, :k]
+        scores = np.take_along_axis(similarity, rows, axis=1)
+        order = np.argsort(-scores, axis=1)
+        return np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+    def _nearest(self, vector: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        scores = self.vectors @ vector
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        k = min(k, len(scores) - (exclude is not None))
+        rows = np.argpartition(-scores, k - 1)[:k]
+        rows = rows[np.argsort(-scores[rows])]
+        return [(int(self.numbers[row]), float(scores[row])) for row in rows if scores[row] > 0]
+
+    def neighbours(self, number: int, k: int = DEFAULT_K) -> List[Tuple[int, float]]:
+        """
+        Names most similar to one name
+
+        Returns:
+            List of (number, cosine similarity), best first
+        """
+        try:
+            row = self._rows[number]
+        except KeyError:
+            raise KeyError(f"No name number {number}")
+        return self._nearest(self.vectors[row], k, exclude=row)
+
+    def query(self, text: str, k: int = DEFAULT_K) -> List[Tuple[int, float]]:
+        """
+        Names whose commentaries best match free text
+
+        Returns:
+            List of (number, cosine similarity), best first
+        """
+        vector = np.zeros(self.vectors.shape[1], dtype=np.float32)
+        for term, count in Counter(tokenize(text)).items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = (1 + math.log(count)) * self.idf[column]
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return []
+        return self._nearest(vector / norm, k)
+
+    def to_json(self, k: int = DEFAULT_K) -> Dict:
+        """Compact neighbours file: rows follow `numbers`, scores in hundredths"""
+        rows, scores = self.top_k(k)
+        related, percents = [], []
+        for row_neighbours, row_scores in zip(rows, scores):
+            keep = row_scores > 0
+            related.append([int(n) for n in self.numbers[row_neighbours[keep]]])
+            percents.append([int(round(s * 100)) for s in row_scores[keep]])
+        return {
+            'k': k,
+            'numbers': [int(n) for n in self.numbers],
+            'related': related,
+            'scores': percents
+        }
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description='Compute related names from commentary text and tags'
+    )
+    parser.add_argument('-k', type=int, default=DEFAULT_K, help=f'Neighbours per name (default: {DEFAULT_K})')
+    parser.add_argument('--tag-weight', type=float, default=DEFAULT_TAG_WEIGHT,
+                       help=f'Weight of Data/tags categories vs text (default: {DEFAULT_TAG_WEIGHT})')
+    parser.add_argument('--output', default=str(RELATED_FILE),
+                       help='Neighbours file (default: Data/naamani-related.json)')
+    parser.add_argument('--show', type=int, metavar='NUMBER', help='Print the neighbours of one name and exit')
+    parser.add_argument('--query', help='Print the names closest to this text and exit')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    related = RelatedNames.build(tag_weight=args.tag_weight)
+    built = time.perf_counter() - start
+
+    if args.show or args.query:
+        corpus = Corpus()
+        matches = related.neighbours(args.show, args.k) if args.show else related.query(args.query, args.k)
+        for number, score in matches:
+            print(f"  {number:4d}  {score:.2f}  {corpus.get('naamani', number).text.strip()}")
+        return
+
+    start = time.perf_counter()
+    data = related.to_json(args.k)
+    ranked = time.perf_counter() - start
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+    names, features = related.vectors.shape
+    print(f"Vectorized {names} names ({len(related.vocabulary)} terms, {related.tag_features} tags, "
+          f"{features} features) in {built:.2f}s")
+    print(f"Top {args.k} neighbours for all names in {ranked:.2f}s")
+    print(f"Neighbours saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
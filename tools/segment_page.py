@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Split page scans into ordered blocks and lines
+Uses NumPy projection profiles (XY-cut) to find text blocks, columns and
+lines with bounding boxes, so blocks can be OCRed, cached and re-OCRed
+individually. Writes one <page>_layout.json per image.
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("\nPlease install:")
+    print("  pip3 install numpy pillow")
+    sys.exit(1)
+
+# Rows/columns with less ink than this fraction of a typical (95th
+# percentile) row/column are blank: speckle, page edges, rule shadows
+NOISE_FRACTION = 0.1
+
+
+def load_ink(image_path: str, scale: float = 0.5) -> np.ndarray:
+    """
+    Load a page as a boolean ink mask (True = dark pixel)
+
+    The page is downscaled by `scale` and binarised with Otsu's threshold.
+    """
+    with Image.open(image_path) as image:
+        gray = image.convert('L')
+        if scale != 1.0:
+            gray = gray.resize((max(1, int(gray.width * scale)), max(1, int(gray.height * scale))),
+                               Image.BILINEAR)
+        pixels = np.asarray(gray, dtype=np.uint8)
+
+    hist = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_bg = np.cumsum(hist)
+    weight_fg = weight_bg[-1] - weight_bg
+    mean_bg = np.cumsum(hist * levels) / np.maximum(weight_bg, 1)
+    mean_fg = ((hist * levels).sum() - np.cumsum(hist * levels)) / np.maximum(weight_fg, 1)
+    threshold = np.argmax(weight_bg * weight_fg * (mean_bg - mean_fg) ** 2)
+
+    return pixels <= threshold
+
+
+def runs(mask: np.ndarray, min_gap: int = 1, min_length: int = 1) -> List[Tuple[int, int]]:
+    """
+    Find runs of True values in a 1-D mask
+
+    Args:
+        mask: Boolean profile
+        min_gap: Runs separated by fewer blank entries than this are merged
+        min_length: Shorter runs are dropped
+
+    Returns:
+        List of (start, end) half-open ranges
+    """
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[::2], edges[1::2]
+
+    if len(starts) > 1 and min_gap > 1:
+        keep = np.concatenate(([True], starts[1:] - ends[:-1] >= min_gap))
+        first = np.flatnonzero(keep)
+        last = np.append(first[1:] - 1, len(ends) - 1)
+        starts, ends = starts[first], ends[last]
+
+    lengths = ends - starts
+    selected = lengths >= min_length
+    return list(zip(starts[selected].tolist(), ends[selected].tolist()))
+
+
+def profile(ink: np.ndarray, axis: int) -> np.ndarray:
+    """Boolean projection profile: rows (axis=1) or columns (axis=0) with ink"""
+    counts = ink.sum(axis=axis)
+    if not counts.any():
+        return counts > 0
+    return counts > max(1, np.percentile(counts, 95) * NOISE_FRACTION)
+
+
+def clear_borders(ink: np.ndarray, fraction: float = 0.5) -> np.ndarray:
+    """
+    Blank out rows and columns that are mostly dark
+
+    Scans of bound books have black margins and a shaded gutter; text rows
+    and columns never come close to half ink.
+    """
+    ink = ink.copy()
+    ink[:, ink.mean(axis=0) > fraction] = False
+    ink[ink.mean(axis=1) > fraction, :] = False
+    return ink
+
+
+def estimate_line_metrics(ink: np.ndarray, strips: int = 8) -> Tuple[int, int]:
+    """
+    Median text line height and median gap between lines
+
+    Measured in narrow vertical strips so lines of side-by-side columns or
+    facing pages don't blur into one another.
+    """
+    heights, gaps = [], []
+    for strip in np.array_split(ink, strips, axis=1):
+        lines = runs(profile(strip, axis=1), min_length=2)
+        heights.extend(end - start for start, end in lines)
+        gaps.extend(b[0] - a[1] for a, b in zip(lines, lines[1:]))
+
+    if not heights:
+        return 0, 0
+    return int(np.median(heights)), int(np.median(gaps)) if gaps else 0
+
+
+def xy_cut(ink: np.ndarray, x: int, y: int, line_height: int,
+           min_block_gap: int, min_column_gap: int, blocks: List[Dict]) -> None:
+    """
+    Recursively split a region at wide blank columns, then wide blank rows
+
+    Leaves are appended to `blocks` in reading order (columns left to
+    right, bands top to bottom).
+    """
+    columns = runs(profile(ink, axis=0), min_gap=min_column_gap, min_length=2)
+    if len(columns) > 1:
+        for x0, x1 in columns:
+            xy_cut(ink[:, x0:x1], x + x0, y, line_height, min_block_gap, min_column_gap, blocks)
+        return
+
+    bands = runs(profile(ink, axis=1), min_gap=min_block_gap, min_length=2)
+    if len(bands) > 1:
+        for y0, y1 in bands:
+            xy_cut(ink[y0:y1], x, y + y0, line_height, min_block_gap, min_column_gap, blocks)
+        return
+
+    lines = []
+    for ly0, ly1 in runs(profile(ink, axis=1), min_gap=max(1, line_height // 4), min_length=2):
+        xs = runs(profile(ink[ly0:ly1], axis=0))
+        if xs:
+            lines.append([x + xs[0][0], y + ly0, x + xs[-1][1], y + ly1])
+
+    if not lines:
+        return
+
+    width = max(l[2] for l in lines) - min(l[0] for l in lines)
+    height = lines[-1][3] - lines[0][1]
+    # Specks, and tall slivers left over from page edges
+    if min(width, height) < line_height / 2 or (width < 2 * line_height and height > 3 * line_height):
+        return
+
+    blocks.append({
+        'bbox': [min(l[0] for l in lines), lines[0][1], max(l[2] for l in lines), lines[-1][3]],
+        'line_height': float(np.median([l[3] - l[1] for l in lines])),
+        'lines': lines
+    })
+
+
+def segment(ink: np.ndarray, block_gap: float = 1.6, column_gap: float = 2.0) -> Dict:
+    """
+    Segment an ink mask into ordered blocks and lines
+
+    Args:
+        ink: Boolean ink mask
+        block_gap: Vertical gap, in multiples of the usual line gap, that
+                   separates blocks
+        column_gap: Horizontal gap, in line heights, that separates columns
+
+    Returns:
+        Dict with 'line_height' and a list of blocks (in mask coordinates)
+    """
+    ink = clear_borders(ink)
+    line_height, line_gap = estimate_line_metrics(ink)
+    if not line_height:
+        return {'line_height': 0, 'blocks': []}
+
+    min_block_gap = max(2, int(max(line_gap * block_gap, line_height / 2)))
+    min_column_gap = max(2, int(line_height * column_gap))
+
+    blocks = []
+    xy_cut(ink, 0, 0, line_height, min_block_gap, min_column_gap, blocks)
+    return {'line_height': line_height, 'blocks': blocks}
+
+
+def assign_roles(blocks: List[Dict], page_height: int) -> None:
+    """
+    Guess the role of each block from its position and type size
+
+    Single lines in the top/bottom tenth of the page are running headers
+    and footers. Text blocks are compared only with blocks stacked above or
+    below them (facing pages of a spread are often scanned at different
+    sizes): those in clearly larger type are mula text, a trailing block in
+    the smallest type is a footnote and everything else is commentary.
+    """
+    text_blocks = []
+    for block in blocks:
+        block['role'] = 'commentary'
+        if len(block['lines']) == 1 and block['bbox'][3] < page_height * 0.1:
+            block['role'] = 'header'
+        elif len(block['lines']) == 1 and block['bbox'][1] > page_height * 0.9:
+            block['role'] = 'footer'
+        else:
+            text_blocks.append(block)
+
+    def stacked(a, b):
+        overlap = min(a['bbox'][2], b['bbox'][2]) - max(a['bbox'][0], b['bbox'][0])
+        narrower = min(a['bbox'][2] - a['bbox'][0], b['bbox'][2] - b['bbox'][0])
+        return overlap > narrower / 2
+
+    for block in text_blocks:
+        peers = [b for b in text_blocks if stacked(block, b)]
+        heights = [b['line_height'] for b in peers]
+        largest, smallest = max(heights), min(heights)
+        if largest <= smallest * 1.15:
+            continue
+
+        if block['line_height'] >= largest * 0.9:
+            block['role'] = 'mula'
+        elif block is peers[-1] and block['line_height'] <= smallest * 1.05:
+            block['role'] = 'footnote'
+
+
+def analyze_page(task: Tuple[str, str, Optional[str], float]) -> Dict:
+    """
+    Segment one page image and write its layout JSON
+
+    Args:
+        task: (image_path, layout_path, crops_dir, scale)
+
+    Returns:
+        The layout dict
+    """
+    image_path, layout_path, crops_dir, scale = task
+
+    ink = load_ink(image_path, scale)
+    result = segment(ink)
+    blocks = result['blocks']
+    assign_roles(blocks, ink.shape[0])
+
+    def upscale(box):
+        return [int(round(v / scale)) for v in box]
+
+    with Image.open(image_path) as image:
+        width, height = image.size
+
+        for n, block in enumerate(blocks, start=1):
+            block['id'] = n
+            block['bbox'] = upscale(block['bbox'])
+            block['lines'] = [upscale(l) for l in block['lines']]
+            block['line_height'] = round(block['line_height'] / scale, 1)
+
+            if crops_dir:
+                crop = image.crop(tuple(block['bbox']))
+                crop_file = Path(crops_dir) / f"{Path(image_path).stem}_block_{n:02d}.png"
+                crop.save(crop_file, 'PNG')
+                block['image_file'] = crop_file.name
+                # Lets block-level OCR caches detect unchanged crops
+                block['sha1'] = hashlib.sha1(crop.tobytes()).hexdigest()
+
+    layout = {
+        'image_file': Path(image_path).name,
+        'width': width,
+        'height': height,
+        'line_height': round(result['line_height'] / scale, 1),
+        'blocks': blocks
+    }
+
+    with open(layout_path, 'w', encoding='utf-8') as f:
+        json.dump(layout, f, ensure_ascii=False, indent=2)
+
+    return layout
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Segment page scans into ordered blocks and lines (layout JSON)'
+    )
+    parser.add_argument('images', nargs='+', help='Page images or directories of PNGs')
+    parser.add_argument('--output-dir', help='Directory for layout JSON (default: next to each image)')
+    parser.add_argument('--crops-dir', help='Also save each block as a PNG here, for block-level OCR')
+    parser.add_argument('--scale', type=float, default=0.5,
+                       help='Downscale factor used for analysis (default: 0.5)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+
+    image_files = []
+    for path in map(Path, args.images):
+        image_files.extend(sorted(path.glob('*.png')) if path.is_dir() else [path])
+
+    if args.output_dir:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    if args.crops_dir:
+        Path(args.crops_dir).mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    for image_file in image_files:
+        out_dir = Path(args.output_dir) if args.output_dir else image_file.parent
+        tasks.append((str(image_file), str(out_dir / f"{image_file.stem}_layout.json"),
+                      args.crops_dir, args.scale))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for task, layout in zip(tasks, pool.map(analyze_page, tasks)):
+            roles = [b['role'] for b in layout['blocks']]
+            lines = sum(len(b['lines']) for b in layout['blocks'])
+            print(f"{layout['image_file']}: {len(roles)} blocks ({', '.join(roles)}), {lines} lines")
+
+    print(f"\nLayouts written for {len(tasks)} page(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Convert page scans into deep-zoom image pyramids of WebP tiles
+For every page_NNN.png, writes page_NNN.dzi and page_NNN_files/<level>/<col>_<row>.webp
+(the Deep Zoom layout OpenSeadragon reads), so a viewer only downloads the
+tiles that are on screen at the current zoom instead of the full 300-DPI
+image.
+
+Pages are tiled in parallel; pages whose .dzi is newer than the scan are
+skipped.
+"""
+
+import sys
+import math
+import shutil
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+try:
+    from PIL import Image
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("\nInstall with:")
+    print("  pip install pillow")
+    sys.exit(1)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TILE_SIZE = 254
+OVERLAP = 1
+DEFAULT_QUALITY = 80
+
+DZI_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="webp" Overlap="{overlap}" TileSize="{tile_size}">
+  <Size Width="{width}" Height="{height}"/>
+</Image>
+"""
+
+# Scans are huge; this is a trusted local input
+Image.MAX_IMAGE_PIXELS = None
+
+
+def level_count(width: int, height: int) -> int:
+    """Levels from 1x1 (level 0) up to full resolution"""
+    return int(math.ceil(math.log2(max(width, height)))) + 1
+
+
+def tile_level(image: Image.Image, directory: Path, tile_size: int, overlap: int, quality: int) -> int:
+    """
+    Cut one pyramid level into tiles
+
+    Returns:
+        Number of tiles written
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    width, height = image.size
+    count = 0
+    for row in range(int(math.ceil(height / tile_size))):
+        for col in range(int(math.ceil(width / tile_size))):
+            left = col * tile_size - (overlap if col else 0)
+            top = row * tile_size - (overlap if row else 0)
+            right = min((col + 1) * tile_size + overlap, width)
+            bottom = min((row + 1) * tile_size + overlap, height)
+            tile = image.crop((left, top, right, bottom))
+            tile.save(directory / f"{col}_{row}.webp", 'WEBP', quality=quality, method=4)
+            count += 1
+    return count
+
+
+def tile_page(image_path: str, output_dir: str, tile_size: int = TILE_SIZE,
+              overlap: int = OVERLAP, quality: int = DEFAULT_QUALITY) -> Dict:
+    """
+    Worker: build the pyramid for one page
+
+    Returns:
+        {'page', 'width', 'height', 'levels', 'tiles'}
+    """
+    image_path, output_dir = Path(image_path), Path(output_dir)
+    files_dir = output_dir / f"{image_path.stem}_files"
+    if files_dir.exists():
+        shutil.rmtree(files_dir)
+
+    image = Image.open(image_path)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    width, height = image.size
+    levels = level_count(width, height)
+
+    tiles = 0
+    level_image = image
+    for level in range(levels - 1, -1, -1):
+        tiles += tile_level(level_image, files_dir / str(level), tile_size, overlap, quality)
+        if level:
+            # Each level is half the size of the next, rounded up
+            size = (max(1, math.ceil(level_image.width / 2)), max(1, math.ceil(level_image.height / 2)))
+            level_image = level_image.resize(size, Image.BOX)
+
+    # Written last: an existing .dzi means the pyramid is complete
+    (output_dir / f"{image_path.stem}.dzi").write_text(
+        DZI_TEMPLATE.format(overlap=overlap, tile_size=tile_size, width=width, height=height),
+        encoding='utf-8'
+    )
+    return {'page': image_path.name, 'width': width, 'height': height, 'levels': levels, 'tiles': tiles}
+
+
+def pages_to_tile(images_dir: Path, output_dir: Path, pattern: str, force: bool) -> List[Path]:
+    """Scans without an up-to-date pyramid"""
+    pages = []
+    for image_path in sorted(images_dir.glob(pattern)):
+        dzi = output_dir / f"{image_path.stem}.dzi"
+        if not force and dzi.exists() and dzi.stat().st_mtime >= image_path.stat().st_mtime:
+            continue
+        pages.append(image_path)
+    return pages
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Build deep-zoom WebP tile pyramids from page scans'
+    )
+    parser.add_argument('images_dir', nargs='?', default=str(REPO_ROOT / 'Jayamangala Book'),
+                       help='Directory with page images (default: Jayamangala Book/)')
+    parser.add_argument('--output-dir', help='Where to write tiles (default: <images_dir>/tiles)')
+    parser.add_argument('--pattern', default='*.png', help='Image glob (default: *.png)')
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY,
+                       help=f'WebP quality (default: {DEFAULT_QUALITY})')
+    parser.add_argument('--tile-size', type=int, default=TILE_SIZE, help=f'Tile size (default: {TILE_SIZE})')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild pyramids that are up to date')
+
+    args = parser.parse_args()
+
+    images_dir = Path(args.images_dir)
+    if not images_dir.is_dir():
+        print(f"Directory not found: {images_dir}")
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir) if args.output_dir else images_dir / 'tiles'
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    pages = pages_to_tile(images_dir, output_dir, args.pattern, args.force)
+    if not pages:
+        print("All pyramids are up to date")
+        return
+
+    print(f"Tiling {len(pages)} page(s) into {output_dir}...")
+    total_tiles = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(tile_page, str(page), str(output_dir), args.tile_size, OVERLAP, args.quality): page
+            for page in pages
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  ❌ {futures[future].name}: {e}")
+                continue
+            total_tiles += result['tiles']
+            print(f"  ✓ {result['page']}: {result['width']}x{result['height']}, "
+                  f"{result['levels']} levels, {result['tiles']} tiles")
+
+    size = sum(f.stat().st_size for f in output_dir.rglob('*.webp'))
+    print(f"\n{'='*60}")
+    print(f"Pages tiled: {len(pages)}")
+    print(f"Tiles written: {total_tiles}")
+    print(f"Tiles on disk: {size / 1e6:.1f} MB")
+    print(f"Output: {output_dir}")
+    print(f"{'='*60}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Whole-corpus consistency check
+Scans every collection in one pass with a worker pool and checks:
+- naamani-files: every name 1..1000 has its Naamavali, Mantra, Balatapa,
+  SoubhagyaBhaskara, DattaCommentary and tags files (non-empty, Datta JSON
+  parses)
+- naamani-names: Data/naamani.json names match the Naamavali text
+- pages: every collection, section and record has its index.html, and the
+  hardcoded totalSlokas/totalNames constants match the files on disk
+- slokas: sloka files are well-formed UTF-8 with closing dandas
+
+Errors (missing or unreadable files, wrong counts) make the run exit with
+1; format warnings only do with --strict. Usable as a pre-commit hook:
+
+    python3 tools/validate_corpus.py --output validation.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from corpus import Corpus, COLLECTIONS, REPO_ROOT
+
+CHECKS = ('naamani-files', 'naamani-names', 'pages', 'slokas')
+
+NAME_COUNT = 1000
+# Files every name must have: directory -> extension
+NAME_FILES = {
+    'Naamavali': '.txt',
+    'Mantra': '.txt',
+    'Balatapa': '.txt',
+    'SoubhagyaBhaskara': '.md',
+    'DattaCommentary': '.json',
+    'tags': '.yaml',
+}
+# Chapters/sections each sectioned collection is known to have
+EXPECTED_SECTIONS = {
+    'lalitopaakhyaanam': 41,
+    'umasahasranama': 40,
+    'mookapanchasati': 5,
+}
+
+CHUNK_SIZE = 400
+
+# No leading \b: a literal prefix lets re skip ahead (10x faster on the pages)
+TOTAL_RE = re.compile(rb'(totalSlokas|totalNames)\s*=\s*(\d+)')
+# Closing double danda, optionally with a verse number (॥ ४२ ॥, ॥ १.२५॥)
+CLOSING_RE = re.compile(r'॥(?:\s*[०-९\d.]+\s*॥)?$')
+
+
+def issue(check: str, severity: str, path: str, message: str) -> Dict:
+    return {'check': check, 'severity': severity, 'path': path, 'message': message}
+
+
+# ============================================================================
+# Checks (run in the worker processes)
+# ============================================================================
+
+def check_slokas(root: str, collection: str, paths: List[str]) -> List[Dict]:
+    """Well-formedness of sloka (or name) text files"""
+    issues = []
+    for rel in paths:
+        try:
+            with open(os.path.join(root, rel), 'rb') as f:
+                data = f.read()
+            text = data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            issues.append(issue('slokas', 'error', rel, f"not UTF-8 ({e.reason} at byte {e.start})"))
+            continue
+
+        stripped = text.strip()
+        if not stripped:
+            issues.append(issue('slokas', 'error', rel, 'empty file'))
+            continue
+        if text.startswith('﻿'):
+            issues.append(issue('slokas', 'error', rel, 'byte order mark'))
+        if '\r' in text:
+            issues.append(issue('slokas', 'error', rel, 'CRLF line endings'))
+        if '�' in text:
+            issues.append(issue('slokas', 'error', rel, 'replacement character (U+FFFD)'))
+
+        lines = stripped.count('\n') + 1
+        if collection == 'naamani':
+            if lines > 1:
+                issues.append(issue('slokas', 'warning', rel, f"name spans {lines} lines"))
+            if '।' in stripped or '॥' in stripped:
+                issues.append(issue('slokas', 'warning', rel, 'danda in a name'))
+            continue
+
+        if not CLOSING_RE.search(stripped):
+            last = stripped.rfind('॥')
+            if last >= 0 and stripped[last + 1:].strip():
+                issues.append(issue('slokas', 'warning', rel,
+                                    f"text after closing ॥: {stripped[last + 1:].strip()[:20]!r}"))
+            else:
+                issues.append(issue('slokas', 'warning', rel, 'no closing ॥'))
+        if lines > 2:
+            issues.append(issue('slokas', 'warning', rel, f"{lines} lines (expected 1 or 2)"))
+    return issues
+
+
+def check_pages(root: str, pages: List[Tuple[str, Optional[int]]]) -> List[Dict]:
+    """totalSlokas/totalNames constants of pages against the expected counts"""
+    issues = []
+    for rel, expected in pages:
+        # Bytes: the constants are ASCII, so the page needn't be decoded
+        with open(os.path.join(root, rel), 'rb') as f:
+            content = f.read()
+        for match in TOTAL_RE.finditer(content):
+            name, value = match.group(1).decode(), int(match.group(2))
+            if expected is None:
+                issues.append(issue('pages', 'warning', rel,
+                                    f"{name} = {value} but no known count for this page"))
+            elif value != expected:
+                issues.append(issue('pages', 'error', rel,
+                                    f"{name} = {value} but {expected} files on disk"))
+    return issues
+
+
+def check_names(root: str, numbers: List[int]) -> List[Dict]:
+    """Datta JSON parses; naamani.json names match the Naamavali text"""
+    issues = []
+    with open(os.path.join(root, 'Data', 'naamani.json'), 'r', encoding='utf-8') as f:
+        names = {entry.get('number'): entry.get('name') for entry in json.load(f).get('names', [])}
+
+    for number in numbers:
+        datta = os.path.join('Data', 'DattaCommentary', f"{number:04d}.json")
+        try:
+            with open(os.path.join(root, datta), 'r', encoding='utf-8') as f:
+                json.load(f)
+        except FileNotFoundError:
+            pass  # reported by naamani-files
+        except (ValueError, UnicodeDecodeError) as e:
+            issues.append(issue('naamani-files', 'error', datta, f"invalid JSON: {e}"))
+
+        naamavali = os.path.join('Data', 'Naamavali', f"{number:04d}.txt")
+        try:
+            with open(os.path.join(root, naamavali), 'r', encoding='utf-8') as f:
+                text = f.read().strip()
+        except (FileNotFoundError, UnicodeDecodeError):
+            continue  # reported by naamani-files / slokas
+        if number not in names:
+            issues.append(issue('naamani-names', 'error', 'Data/naamani.json', f"no entry for name {number}"))
+        elif names[number] != text:
+            issues.append(issue('naamani-names', 'error', 'Data/naamani.json',
+                                f"name {number} is {names[number]!r} but {naamavali} has {text!r}"))
+    return issues
+
+
+def run_job(job: Tuple) -> Tuple[str, int, List[Dict]]:
+    """Run one chunk of a check; returns (check, files checked, issues)"""
+    check, root, payload = job[0], job[1], job[2:]
+    if check == 'slokas':
+        collection, paths = payload
+        return check, len(paths), check_slokas(root, collection, paths)
+    if check == 'pages':
+        pages, = payload
+        return check, len(pages), check_pages(root, pages)
+    numbers, = payload
+    return check, len(numbers), check_names(root, numbers)
+
+
+# ============================================================================
+# Planning (main process: directory listings only)
+# ============================================================================
+
+def check_name_files(root: Path) -> Tuple[int, List[Dict]]:
+    """Every name has all of its files; empty ones (not yet written) are warnings"""
+    issues = []
+    checked = 0
+    for directory, extension in NAME_FILES.items():
+        sizes = {}
+        try:
+            with os.scandir(root / 'Data' / directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(extension):
+                        sizes[entry.name] = entry.stat().st_size
+        except FileNotFoundError:
+            issues.append(issue('naamani-files', 'error', f"Data/{directory}", 'directory missing'))
+            continue
+        checked += len(sizes)
+
+        missing = [n for n in range(1, NAME_COUNT + 1) if f"{n:04d}{extension}" not in sizes]
+        if missing:
+            issues.append(issue('naamani-files', 'error', f"Data/{directory}",
+                                f"{len(missing)} name(s) missing: {shorten(missing)}"))
+        empty = sorted(int(name[:4]) for name, size in sizes.items() if size == 0 and name[:4].isdigit())
+        if empty:
+            issues.append(issue('naamani-files', 'warning', f"Data/{directory}",
+                                f"{len(empty)} empty file(s): {shorten(empty)}"))
+    return checked, issues
+
+
+def shorten(items: List, limit: int = 10) -> str:
+    return ', '.join(str(item) for item in items[:limit]) + (' ...' if len(items) > limit else '')
+
+
+def list_records(corpus: Corpus, collection: str) -> Dict[Optional[str], List[int]]:
+    """Record numbers per section, from one directory listing each"""
+    layout = corpus.collection(collection)
+    return {section: layout.numbers(section) for section in layout.sections()}
+
+
+def text_paths(corpus: Corpus, collection: str, records: Dict[Optional[str], List[int]]) -> List[str]:
+    """Root-relative NNNN.txt paths (string-built: pathlib is the bottleneck at this scale)"""
+    text_dir = corpus.collection(collection).text_dir
+    paths = []
+    for section, numbers in records.items():
+        prefix = f"{text_dir}/{section}/" if section else f"{text_dir}/"
+        paths += [f"{prefix}{number:04d}.txt" for number in numbers]
+    return paths
+
+
+def plan_pages(corpus: Corpus, collection: str,
+               records: Dict[Optional[str], List[int]]) -> Tuple[List[Tuple[str, Optional[int]]], List[Dict]]:
+    """
+    Pages of a collection with the count their constants should show, plus
+    structural issues (missing or dangling index.html)
+
+    A page's count is its section's (for the section index and its record
+    pages) or the whole collection's (for pages at the collection root).
+    """
+    root = str(corpus.root)
+    counts = {section: len(numbers) for section, numbers in records.items()}
+    total = sum(counts.values())
+
+    pages, issues, found = [], [], set()
+    pending = [collection]
+    while pending:
+        rel_dir = pending.pop()
+        parts = rel_dir.split('/')[1:]
+        if parts and parts[-1].isdigit():
+            parts = parts[:-1]
+        section = '/'.join(parts) or None
+        expected = total if section is None else counts.get(section)
+
+        # scandir: file type and symlink checks come with the listing
+        with os.scandir(os.path.join(root, rel_dir)) as entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(rel)
+                elif entry.name.endswith(('.html', '.js')):
+                    found.add(rel)
+                    if not entry.is_symlink():
+                        pages.append((rel, expected))
+                    elif not os.path.exists(entry.path):
+                        issues.append(issue('pages', 'error', rel,
+                                            f"dangling symlink to {os.readlink(entry.path)}"))
+
+    for section in [None] + [s for s in counts if s]:
+        rel = f"{collection}/{section}/index.html" if section else f"{collection}/index.html"
+        if rel not in found:
+            issues.append(issue('pages', 'error', rel, 'missing'))
+
+    missing = []
+    for section, numbers in records.items():
+        prefix = f"{collection}/{section}/" if section else f"{collection}/"
+        missing += [f"{prefix}{number}" for number in numbers if f"{prefix}{number}/index.html" not in found]
+    if missing:
+        issues.append(issue('pages', 'error', collection,
+                            f"{len(missing)} record page(s) missing: {shorten(missing, 5)}"))
+
+    expected_sections = EXPECTED_SECTIONS.get(collection)
+    if expected_sections and len(records) != expected_sections:
+        issues.append(issue('pages', 'error', corpus.collection(collection).text_dir,
+                            f"{len(records)} sections, expected {expected_sections}"))
+    return pages, issues
+
+
+def chunks(items: List, size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def validate(root: Path = REPO_ROOT, collections: Optional[List[str]] = None,
+             checks: Optional[List[str]] = None, workers: Optional[int] = None) -> Dict:
+    """
+    Run the checks and collect a report
+
+    Args:
+        root: Repository root
+        collections: Collections to check (default: all)
+        checks: Checks to run (default: all of CHECKS)
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        {'ok', 'errors', 'warnings', 'seconds', 'checked': {check: files}, 'issues': [...]}
+    """
+    start = time.perf_counter()
+    corpus = Corpus(root, cache_size=0)
+    collections = collections or COLLECTIONS
+    checks = checks or list(CHECKS)
+    root_str = str(corpus.root)
+
+    issues: List[Dict] = []
+    checked = {check: 0 for check in checks}
+    jobs = []
+
+    if 'naamani' in collections and 'naamani-files' in checks:
+        files, found = check_name_files(corpus.root)
+        checked['naamani-files'] += files
+        issues += found
+    if 'naamani' in collections and ('naamani-names' in checks or 'naamani-files' in checks):
+        numbers = list(range(1, NAME_COUNT + 1))
+        jobs += [('names', root_str, chunk) for chunk in chunks(numbers)]
+
+    for collection in collections:
+        records = list_records(corpus, collection)
+
+        if 'slokas' in checks:
+            paths = text_paths(corpus, collection, records)
+            jobs += [('slokas', root_str, collection, chunk) for chunk in chunks(paths)]
+
+        if 'pages' in checks:
+            pages, found = plan_pages(corpus, collection, records)
+            issues += found
+            jobs += [('pages', root_str, chunk) for chunk in chunks(pages)]
+
+    # With one CPU (or one chunk) worker processes only add start-up time
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_job, jobs))
+    else:
+        results = [run_job(job) for job in jobs]
+
+    for check, files, found in results:
+        if check == 'names':
+            if 'naamani-names' in checks:
+                checked['naamani-names'] += files
+            found = [i for i in found if i['check'] in checks]
+        else:
+            checked[check] += files
+        issues += found
+
+    errors = sum(1 for i in issues if i['severity'] == 'error')
+    return {
+        'ok': errors == 0,
+        'errors': errors,
+        'warnings': len(issues) - errors,
+        'seconds': round(time.perf_counter() - start, 3),
+        'checked': checked,
+        'issues': sorted(issues, key=lambda i: (i['severity'] != 'error', i['check'], i['path'])),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Check names, slokas and page counts across every collection'
+    )
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Repository root (default: this checkout)')
+    parser.add_argument('--collections', nargs='+', choices=COLLECTIONS,
+                       help='Only check these collections (default: all)')
+    parser.add_argument('--checks', nargs='+', choices=CHECKS, help='Only run these checks (default: all)')
+    parser.add_argument('--output', help='Write the JSON report to this file ("-" for stdout)')
+    parser.add_argument('--strict', action='store_true', help='Fail on warnings too')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--top', type=int, default=20, help='Issues to list (default: 20)')
+
+    args = parser.parse_args()
+
+    report = validate(Path(args.root).resolve(), args.collections, args.checks, args.workers)
+    failed = report['errors'] or (args.strict and report['warnings'])
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        sys.exit(1 if failed else 0)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for entry in report['issues'][:args.top]:
+        marker = '✗' if entry['severity'] == 'error' else '⚠️ '
+        print(f"  {marker} [{entry['check']}] {entry['path']}: {entry['message']}")
+    if len(report['issues']) > args.top:
+        print(f"  ... {len(report['issues']) - args.top} more (see --output)")
+
+    print(f"\n{'='*60}")
+    for check, files in report['checked'].items():
+        found = [i for i in report['issues'] if i['check'] == check]
+        if not files and not found:
+            continue
+        errors = sum(1 for i in found if i['severity'] == 'error')
+        print(f"{check:<16} {files:>6} files  {errors:>4} error(s)  {len(found) - errors:>4} warning(s)")
+    print(f"Checked in {report['seconds']:.2f}s: {report['errors']} error(s), {report['warnings']} warning(s)")
+    if args.output:
+        print(f"Report saved: {args.output}")
+    print(f"{'='*60}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()